@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-# Register your models here.
+from taskhive.media import CloudinaryModelAdmin
 from .models import TestUpload
 
-admin.site.register(TestUpload)
\ No newline at end of file
+admin.site.register(TestUpload, CloudinaryModelAdmin)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from . import authentication  # noqa: F401  Connects the token cache invalidation handlers
+        from . import dashboard  # noqa: F401  Connects the dashboard cache invalidation handlers
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def token_cache_key(key):
+    return f'auth:token:{key}'
+
+
+def user_token_cache_key(user_id):
+    return f'auth:user-token:{user_id}'
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps token -> user lookups in Django's cache
+    for AUTH_TOKEN_CACHE_TIMEOUT seconds instead of joining Token and User
+    on every request.
+
+    Cached entries are dropped when the token is deleted and whenever the
+    user is saved, which covers password changes and deactivation.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = cache.get(token_cache_key(key))
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        timeout = settings.AUTH_TOKEN_CACHE_TIMEOUT
+        cache.set_many({
+            token_cache_key(key): (user, token),
+            user_token_cache_key(user.pk): key,
+        }, timeout)
+        return user, token
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    cache.delete_many([token_cache_key(instance.key), user_token_cache_key(instance.user_id)])
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, created, **kwargs):
+    if created:
+        return
+    key = cache.get(user_token_cache_key(instance.pk))
+    if key is not None:
+        cache.delete_many([token_cache_key(key), user_token_cache_key(instance.pk)])
@@ -0,0 +1,55 @@
+"""
+Cached payload for DashboardView.
+
+The serialized dashboard is cached per user and per day; the day is part
+of the key so the tasks' overdue flags are right after midnight. Saving
+or deleting one of the user's tasks or notes (or the user) invalidates
+it. Like and comment counts on the notes can lag by up to
+DASHBOARD_CACHE_TIMEOUT seconds.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from notes.models import Note
+from notes.serializers import NoteSerializer
+from taskhive.cache import UserPayloadCache
+from taskhive.concurrency import run_concurrently
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+
+dashboard_cache = UserPayloadCache('dashboard', settings.DASHBOARD_CACHE_TIMEOUT)
+
+
+def build_dashboard(user):
+    # Get the 5 most recent tasks and notes
+    tasks = Task.objects.filter(owner=user).order_by('-created_at')[:5]
+    notes = Note.objects.filter(owner=user).for_listing().order_by('-created_at')[:5]
+
+    # Independent, so with CONCURRENT_QUERIES the notes and their tags load
+    # while the tasks do.
+    task_data, note_data = run_concurrently(
+        lambda: list(TaskSerializer(tasks, many=True).data),
+        lambda: list(NoteSerializer(notes, many=True).data),
+    )
+
+    return {
+        "message": f"Welcome to your dashboard, {user.first_name}!",
+        "recent_tasks": task_data if task_data else "No tasks yet. Start by adding one!",
+        "recent_notes": note_data if note_data else "No notes yet. Start capturing ideas!"
+    }
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def invalidate_owner_dashboard(sender, instance, **kwargs):
+    dashboard_cache.invalidate_on_commit(instance.owner_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_dashboard(sender, instance, created, **kwargs):
+    if not created:
+        dashboard_cache.invalidate_on_commit(instance.pk)
@@ -0,0 +1,103 @@
+"""
+Streaming export of everything a user wrote, for ExportView.
+
+Rows are read with QuerySet.iterator(chunk_size=EXPORT_CHUNK_SIZE) and
+written out as they arrive, so memory use does not grow with the size of
+the account and the response starts before the last row is read. Each
+kind of record has a fixed list of columns; notes add their tag names,
+prefetched one chunk at a time.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import renderers
+
+from comments.models import Comment
+from notes.models import Note
+from tasks.models import Task
+
+# kind: (rows owned by the user, columns)
+KINDS = {
+    'tasks': (
+        lambda user: Task.objects.filter(owner=user).order_by('-created_at', '-id'),
+        ('id', 'title', 'description', 'status', 'priority', 'due_date', 'is_public',
+         'created_at', 'updated_at'),
+    ),
+    'notes': (
+        lambda user: Note.objects.filter(owner=user).prefetch_related('tags').order_by('-created_at', '-id'),
+        ('id', 'title', 'content', 'is_public', 'tags', 'created_at', 'updated_at'),
+    ),
+    'comments': (
+        lambda user: Comment.objects.filter(commenter=user).order_by('id'),
+        ('id', 'note_id', 'content', 'created_at'),
+    ),
+}
+
+
+def iter_records(user, kind):
+    """Yield one {column: value} dict per row of `kind`."""
+    queryset, columns = KINDS[kind]
+    for obj in queryset(user).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        record = {}
+        for column in columns:
+            if column == 'tags':
+                record[column] = [tag.name for tag in obj.tags.all()]
+            else:
+                record[column] = getattr(obj, column)
+        yield record
+
+
+def ndjson_lines(user, kinds):
+    """One JSON object per line, with a "type" key naming its kind."""
+    for kind in kinds:
+        for record in iter_records(user, kind):
+            yield json.dumps({'type': kind[:-1], **record}, cls=DjangoJSONEncoder) + '\n'
+
+
+class _Echo:
+    """File-like object whose write() hands back the line csv.writer built."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(user, kind):
+    """A header row, then one row per record; tags are joined with ';'."""
+    columns = KINDS[kind][1]
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for record in iter_records(user, kind):
+        if 'tags' in record:
+            record['tags'] = ';'.join(record['tags'])
+        yield writer.writerow(
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in record.values()
+        )
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """
+    Selects ?format=ndjson in content negotiation. The export itself is
+    streamed by the view; this only renders error responses.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder) + '\n'
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    """Selects ?format=csv; renders error responses as a single-row table."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        writer = csv.writer(_Echo())
+        return writer.writerow(data.keys()) + writer.writerow(data.values())
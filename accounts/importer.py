@@ -0,0 +1,222 @@
+"""
+Streaming import of tasks and notes, for ImportView and `manage.py
+import_tasks`.
+
+Files are read a line at a time, in the formats /api/accounts/export/
+writes: NDJSON with a "type" per record, or CSV holding one kind. Rows
+are validated and inserted in batches of IMPORT_BATCH_SIZE, one
+transaction per batch:
+
+- tasks and notes are validated with their serializers and written with
+  bulk_create;
+- tag names for the batch's notes are looked up in one query and the
+  missing ones created with one bulk_create;
+- the search index and feeds, which bulk_create does not trigger, are
+  updated for the new rows.
+
+Invalid rows are skipped and reported with their line number; the rest
+of the file is still imported. Only the first IMPORT_MAX_REPORTED_ERRORS
+errors are kept, so a broken file cannot grow the report without bound.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from notes.feed import fan_out_notes
+from notes.models import Note
+from notes.serializers import NoteImportSerializer
+from search.index import INDEXES
+from tags.models import Tag
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+from tasks.stats import task_stats_cache
+from .dashboard import dashboard_cache
+
+FORMATS = ('ndjson', 'csv')
+
+KINDS = {'task': 'tasks', 'tasks': 'tasks', 'note': 'notes', 'notes': 'notes'}
+
+
+def read_ndjson(lines, kind=None):
+    """
+    Yield (line number, kind, data) per record. Records name their kind
+    with "type", defaulting to `kind`. Unreadable records come back with a
+    kind of None and their errors as the data.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, {'non_field_errors': ['Not a JSON object.']}
+            continue
+        if not isinstance(record, dict):
+            yield number, None, {'non_field_errors': ['Not a JSON object.']}
+            continue
+        record_kind = record.pop('type', kind)
+        # Lists and objects are unhashable; they are no kind either.
+        record_kind = KINDS.get(record_kind) if isinstance(record_kind, str) else None
+        if record_kind is None:
+            yield number, None, {'type': [f"Must be one of: {', '.join(KINDS)}."]}
+            continue
+        yield number, record_kind, record
+
+
+def read_csv(lines, kind):
+    """
+    Yield (line number, kind, data) per row of a CSV file with a header
+    row. Empty cells count as missing; tags are separated by ';'.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        data = {key: value for key, value in row.items() if key and value not in ('', None)}
+        if 'tags' in data:
+            data['tags'] = [name.strip() for name in data['tags'].split(';') if name.strip()]
+        yield reader.line_num, kind, data
+
+
+def read(lines, file_format, kind=None):
+    if file_format == 'csv':
+        return read_csv(lines, KINDS[kind])
+    return read_ndjson(lines, kind)
+
+
+def guess_format(filename):
+    if filename and filename.lower().endswith('.csv'):
+        return 'csv'
+    return 'ndjson'
+
+
+class Importer:
+    """
+    Import records from read() for one user. on_batch(importer, errors),
+    if given, is called after every batch with that batch's errors.
+    """
+
+    def __init__(self, user, batch_size=None, on_batch=None):
+        self.user = user
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.on_batch = on_batch
+        self.rows = 0
+        self.created = {'tasks': 0, 'notes': 0}
+        self.tags_created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def run(self, records):
+        batch = []
+        try:
+            for record in records:
+                batch.append(record)
+                if len(batch) == self.batch_size:
+                    self.import_batch(batch)
+                    batch = []
+        except UnicodeDecodeError:
+            self.add_errors([{'line': None, 'errors': {'file': ['The file is not UTF-8 text.']}}])
+        if batch:
+            self.import_batch(batch)
+        if any(self.created.values()):
+            dashboard_cache.invalidate(self.user.pk)
+        if self.created['tasks']:
+            task_stats_cache.invalidate(self.user.pk)
+        return self.report()
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'tags_created': self.tags_created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+    def add_errors(self, errors):
+        self.error_count += len(errors)
+        room = settings.IMPORT_MAX_REPORTED_ERRORS - len(self.errors)
+        self.errors.extend(errors[:max(room, 0)])
+
+    def import_batch(self, batch):
+        self.rows += len(batch)
+        valid = {'tasks': [], 'notes': []}
+        errors = []
+        for line, kind, data in batch:
+            if kind is None:
+                errors.append({'line': line, 'errors': data})
+                continue
+            serializer_class = TaskSerializer if kind == 'tasks' else NoteImportSerializer
+            serializer = serializer_class(data=data)
+            if serializer.is_valid():
+                valid[kind].append((line, serializer.validated_data))
+            else:
+                errors.append({'line': line, 'errors': serializer.errors})
+
+        with transaction.atomic():
+            if valid['tasks']:
+                self.create_tasks([attrs for _, attrs in valid['tasks']])
+            if valid['notes']:
+                self.create_notes(valid['notes'], errors)
+
+        errors.sort(key=lambda error: error['line'] or 0)
+        self.add_errors(errors)
+        if self.on_batch:
+            self.on_batch(self, errors)
+
+    def create_tasks(self, rows):
+        tasks = [Task(owner=self.user, **attrs) for attrs in rows]
+        for task in tasks:
+            task.track_completion()
+        Task.objects.bulk_create(tasks, batch_size=500)
+        INDEXES['task'].update_many(tasks)
+        self.created['tasks'] += len(tasks)
+
+    def create_notes(self, rows, errors):
+        tags = self.resolve_tags({name for _, attrs in rows for name in attrs['tags']})
+        accepted = []
+        for line, attrs in rows:
+            taken = [name for name in attrs['tags'] if name not in tags]
+            if taken:
+                errors.append({'line': line, 'errors': {
+                    'tags': [f"The tag name '{name}' is already used by someone else." for name in taken],
+                }})
+            else:
+                accepted.append(attrs)
+        if not accepted:
+            return
+
+        notes = Note.objects.bulk_create([
+            Note(owner=self.user, **{field: value for field, value in attrs.items() if field != 'tags'})
+            for attrs in accepted
+        ], batch_size=500)
+        NoteTag = Note.tags.through
+        NoteTag.objects.bulk_create([
+            NoteTag(note_id=note.pk, tag_id=tags[name].pk)
+            for note, attrs in zip(notes, accepted)
+            for name in dict.fromkeys(attrs['tags'])
+        ], batch_size=500)
+        INDEXES['note'].update_many(notes)
+        public = [note for note in notes if note.is_public]
+        if public:
+            fan_out_notes(self.user.pk, public)
+        self.created['notes'] += len(notes)
+
+    def resolve_tags(self, names):
+        """
+        {name: Tag} of the user's tags with these names, creating the
+        missing ones. Names that belong to another user (tag names are
+        unique across users) are left out.
+        """
+        if not names:
+            return {}
+        tags = {tag.name: tag for tag in Tag.objects.filter(owner=self.user, name__in=names)}
+        missing = names - tags.keys()
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(owner=self.user, name=name) for name in missing], ignore_conflicts=True
+            )
+            created = list(Tag.objects.filter(owner=self.user, name__in=missing))
+            tags.update((tag.name, tag) for tag in created)
+            self.tags_created += len(created)
+        return tags
@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+from jobs.queue import job
+
+
+@job('accounts.create_tokens', batch=True)
+def create_tokens(payloads):
+    """API tokens for newly registered users, a whole batch in one INSERT."""
+    users = User.objects.filter(
+        pk__in={payload['user_id'] for payload in payloads}, auth_token__isnull=True,
+    ).values_list('pk', flat=True)
+    # Logging in creates a missing token too; ignore_conflicts covers that race.
+    Token.objects.bulk_create(
+        [Token(user_id=user_id, key=Token.generate_key()) for user_id in users], ignore_conflicts=True,
+    )
@@ -0,0 +1,289 @@
+import asyncio
+import datetime
+import json
+import re
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+from rest_framework.authtoken.models import Token
+
+from comments.models import Comment
+from likes.models import Like
+from notes.models import Note
+
+API_PREFIXES = ('api/', 'dj-rest-auth/')
+PARAM_RE = re.compile(r'<(?:\w+:)?(\w+)>')
+
+
+def iter_routes(patterns, prefix=''):
+    """Yield (route, pattern) for every URL pattern, flattening includes."""
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, route)
+        else:
+            yield route, pattern
+
+
+def percentile(cuts, p):
+    return round(cuts[p - 1] * 1000, 2)
+
+
+def read_body(response):
+    """
+    Read the whole body, as a real client would. Streamed responses (e.g.
+    the export) only run their queries while streaming_content is read.
+    """
+    if response.streaming:
+        b''.join(response.streaming_content)
+
+
+async def aread_body(response):
+    if not response.streaming:
+        return
+    if response.is_async:
+        async for _ in response.streaming_content:
+            pass
+    else:
+        await sync_to_async(read_body)(response)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every GET-able API route in taskhive/urls.py as one user, in-process "
+        "through Django's WSGI or ASGI handler (--interface) or over HTTP against a "
+        "running server (--base-url). Reports p50/p95/p99 latency, queries per "
+        "request and throughput, and can write the results as JSON to compare runs. "
+        "Throttling is off for in-process runs; a server's 429s are counted as "
+        "throttled and left out of the timings. Run seed_perf first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default='perf-0',
+                            help="Username to request as (default: the most followed seeded user).")
+        parser.add_argument('--requests', type=int, default=200, help="Timed requests per route.")
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--match', default='', help="Only routes matching this regex.")
+        parser.add_argument('--base-url', help="e.g. http://127.0.0.1:8000 to benchmark a local gunicorn.")
+        parser.add_argument('--interface', choices=['wsgi', 'asgi'], default='wsgi',
+                            help="Handler for in-process runs; ignored with --base-url.")
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help="Parallel clients; used with --base-url or --interface asgi.")
+        parser.add_argument('--label', default='', help="Free-form name stored in the JSON output.")
+        parser.add_argument('--output', help="Write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError("--requests must be at least 2.")
+        try:
+            self.user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist; run seed_perf first.")
+        self.token = Token.objects.get_or_create(user=self.user)[0].key
+        self.options = options
+        self.headers = {'Authorization': f'Token {self.token}'}
+        self.client = Client(headers=self.headers, SERVER_NAME='localhost')
+        self.async_client = AsyncClient()
+        self.mode = 'http' if options['base_url'] else options['interface']
+
+        # AsyncClient always sends Host: testserver. One user sending
+        # hundreds of requests would otherwise be throttled.
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], THROTTLE_RATES={}):
+            results, skipped = self.run_routes()
+
+        self.report(results, skipped)
+        self.write_output(results, skipped)
+
+    def run_routes(self):
+        results, skipped = [], []
+        samples = self.sample_kwargs()
+        match = re.compile(self.options['match'])
+        for route, pattern in iter_routes(get_resolver().url_patterns):
+            if not route.startswith(API_PREFIXES) or not match.search(route):
+                continue
+            path, reason = self.build_path(route, pattern, samples)
+            if path is None:
+                skipped.append({'route': route, 'reason': reason})
+                continue
+            status = self.request(path)[0]
+            if status == 405:
+                skipped.append({'route': route, 'reason': 'GET not allowed'})
+            elif status >= 400:
+                skipped.append({'route': route, 'reason': f'GET returned {status}'})
+            else:
+                results.append(self.measure(route, pattern.name, path))
+        return results, skipped
+
+    def write_output(self, results, skipped):
+        options = self.options
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({
+                    'label': options['label'],
+                    'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    'mode': self.mode,
+                    'base_url': options['base_url'],
+                    'database': connection.vendor,
+                    'user': self.user.username,
+                    'requests': options['requests'],
+                    'concurrency': self.concurrency(),
+                    'results': results,
+                    'skipped': skipped,
+                }, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    def sample_kwargs(self):
+        """
+        URL kwargs by parameter name, with per-route overrides for `pk`,
+        which means something different on every detail route.
+        """
+        user = self.user
+        note = (
+            Note.objects.visible_to(user)
+            .annotate(comments_total=Count('comments'))
+            .order_by('-comments_total')
+            .first()
+        )
+        own = {
+            'task-detail': user.tasks.first(),
+            'note-detail': user.notes.first(),
+            'tag-detail': user.tags.first(),
+            'comment-detail': Comment.objects.filter(note=note).first(),
+            'like-detail': Like.objects.filter(note=note).first(),
+        }
+        return {
+            'username': {'*': user.username},
+            'id': {'*': user.profile.id},
+            'note_id': {'*': note.pk if note else None},
+            'pk': {name: obj.pk if obj else None for name, obj in own.items()},
+        }
+
+    def build_path(self, route, pattern, samples):
+        if not isinstance(pattern.pattern, RoutePattern):
+            return None, 'regex route'
+        kwargs = {}
+        for param in PARAM_RE.findall(route):
+            by_route = samples.get(param, {})
+            value = by_route.get(pattern.name, by_route.get('*'))
+            if value is None:
+                return None, f'no sample value for <{param}>'
+            kwargs[param] = value
+        path = PARAM_RE.sub(lambda m: str(kwargs[m.group(1)]), route)
+        return '/' + path, None
+
+    def concurrency(self):
+        return 1 if self.mode == 'wsgi' else self.options['concurrency']
+
+    def request(self, path):
+        """Issue one GET; return (status, seconds, X-DB-Queries header or None)."""
+        if self.mode == 'asgi':
+            return asyncio.run(self.arequest(path))
+        if self.mode == 'http':
+            request = urllib.request.Request(
+                self.options['base_url'].rstrip('/') + path,
+                headers=self.headers,
+            )
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    status, queries = response.status, response.headers.get('X-DB-Queries')
+            except urllib.error.HTTPError as exc:
+                status, queries = exc.code, None
+            return status, time.perf_counter() - started, queries
+        started = time.perf_counter()
+        response = self.client.get(path)
+        read_body(response)
+        return response.status_code, time.perf_counter() - started, None
+
+    async def arequest(self, path):
+        started = time.perf_counter()
+        response = await self.async_client.get(path, headers=self.headers)
+        await aread_body(response)
+        return response.status_code, time.perf_counter() - started, None
+
+    async def arequest_all(self, path, total, workers):
+        """`total` ASGI requests with at most `workers` in flight, on one event loop."""
+        limit = asyncio.Semaphore(workers)
+
+        async def one():
+            async with limit:
+                return await self.arequest(path)
+        return await asyncio.gather(*(one() for _ in range(total)))
+
+    def measure(self, route, name, path):
+        for _ in range(self.options['warmup']):
+            self.request(path)
+
+        if self.mode == 'http':
+            # Only reported when the server measures this request, i.e. with
+            # DEBUG or a QUERY_INSTRUMENTATION_SAMPLE_RATE of 1.
+            queries = self.request(path)[2]
+            queries = None if queries is None else int(queries)
+        else:
+            # Counted through the WSGI client: ASGI runs the view on another
+            # thread, and the queries are the same either way.
+            with CaptureQueriesContext(connection) as ctx:
+                read_body(self.client.get(path))
+            queries = len(ctx.captured_queries)
+
+        total = self.options['requests']
+        workers = self.concurrency()
+        started = time.perf_counter()
+        if self.mode == 'asgi':
+            timings = asyncio.run(self.arequest_all(path, total, workers))
+        elif workers > 1:
+            with ThreadPoolExecutor(workers) as pool:
+                timings = list(pool.map(lambda _: self.request(path), range(total)))
+        else:
+            timings = [self.request(path) for _ in range(total)]
+        elapsed = time.perf_counter() - started
+
+        # Throttled responses return before the view runs; timing them
+        # would flatter the route.
+        latencies = [seconds for status, seconds, _ in timings if status != 429]
+        served = len(latencies) >= 2
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive') if served else None
+        return {
+            'route': route,
+            'name': name,
+            'path': path,
+            'errors': sum(1 for status, _, _ in timings if status >= 400 and status != 429),
+            'throttled': total - len(latencies),
+            'p50_ms': percentile(cuts, 50) if served else None,
+            'p95_ms': percentile(cuts, 95) if served else None,
+            'p99_ms': percentile(cuts, 99) if served else None,
+            'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if served else None,
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'queries': queries,
+        }
+
+    def report(self, results, skipped):
+        self.stdout.write(
+            f"{'route':<48} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'queries':>8}"
+        )
+        for row in results:
+            p50, p95, p99, queries = ('-' if row[key] is None else row[key]
+                                      for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries'))
+            self.stdout.write(
+                f"{row['route']:<48} {p50:>8} {p95:>8} {p99:>8} "
+                f"{row['throughput_rps']:>8} {queries:>8}"
+            )
+        for row in results:
+            if row['throttled']:
+                self.stdout.write(f"throttled {row['route']}: {row['throttled']} of {self.options['requests']} requests")
+        for row in skipped:
+            self.stdout.write(f"skipped {row['route']}: {row['reason']}")
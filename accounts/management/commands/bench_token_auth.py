@@ -0,0 +1,56 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from accounts.authentication import CachedTokenAuthentication, token_cache_key, user_token_cache_key
+from accounts.views import CurrentUserView
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second on /api/accounts/me/ with TokenAuthentication "
+        "and CachedTokenAuthentication. Uses a throwaway user that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        with transaction.atomic():
+            user = User.objects.create_user(username=f'bench-{uuid.uuid4().hex[:12]}')
+            token = Token.objects.create(user=user)
+            header = f'Token {token.key}'
+
+            cache_keys = [token_cache_key(token.key), user_token_cache_key(user.pk)]
+
+            for authentication in (TokenAuthentication, CachedTokenAuthentication):
+                cache.delete_many(cache_keys)
+                view = CurrentUserView.as_view(authentication_classes=[authentication])
+                request = RequestFactory().get('/api/accounts/me/', HTTP_AUTHORIZATION=header)
+                view(request).render()  # Warm up (and fill the cache)
+
+                with CaptureQueriesContext(connection) as ctx:
+                    view(RequestFactory().get('/api/accounts/me/', HTTP_AUTHORIZATION=header)).render()
+
+                started = time.perf_counter()
+                for _ in range(total):
+                    request = RequestFactory().get('/api/accounts/me/', HTTP_AUTHORIZATION=header)
+                    response = view(request).render()
+                    assert response.status_code == 200, response.content
+                elapsed = time.perf_counter() - started
+
+                self.stdout.write(
+                    f"{authentication.__name__:<28} {total / elapsed:>9.0f} req/s  "
+                    f"{len(ctx.captured_queries)} queries/request"
+                )
+            cache.delete_many(cache_keys)
+            transaction.set_rollback(True)
@@ -0,0 +1,59 @@
+import io
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasks and notes for a user from an NDJSON or CSV file (the formats "
+        "/api/accounts/export/ writes), streaming it in batches. Invalid rows are "
+        "reported on stderr and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for stdin.")
+        parser.add_argument('--user', required=True, help="Username that will own the imported rows.")
+        parser.add_argument('--format', choices=importer.FORMATS,
+                            help="Default: csv for *.csv files, ndjson otherwise.")
+        parser.add_argument('--type', choices=sorted(importer.KINDS),
+                            help="Kind of every CSV row; the default for NDJSON records without one.")
+        parser.add_argument('--batch-size', type=int, help="Rows per transaction (default: IMPORT_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+        path = options['path']
+        file_format = options['format'] or importer.guess_format(path)
+        if file_format == 'csv' and not options['type']:
+            raise CommandError("CSV files hold one kind; pass --type.")
+
+        if path == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+        else:
+            try:
+                stream = open(path, encoding='utf-8-sig', newline='')
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        run = importer.Importer(user, batch_size=options['batch_size'], on_batch=self.progress)
+        with stream:
+            report = run.run(importer.read(stream, file_format, options['type']))
+        self.stdout.write(
+            f"Imported {report['created']['tasks']} tasks and {report['created']['notes']} notes "
+            f"({report['tags_created']} new tags) from {report['rows']} rows; "
+            f"{report['error_count']} rows rejected."
+        )
+
+    def progress(self, run, errors):
+        for error in errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            f"{run.rows:>9} rows  {run.created['tasks']:>9} tasks  {run.created['notes']:>9} notes  "
+            f"{run.error_count:>7} errors"
+        )
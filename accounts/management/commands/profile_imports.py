@@ -0,0 +1,76 @@
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+# What a web worker does before serving its first request: set up Django
+# and load the URLconf, which imports every view. Prints the elapsed time.
+BOOT = """
+import time
+started = time.perf_counter()
+import django
+django.setup()
+{urls}
+print(time.perf_counter() - started)
+"""
+LOAD_URLS = "from django.urls import get_resolver; get_resolver().url_patterns"
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def parse_importtime(lines):
+    """
+    (module, self µs, cumulative µs, depth) per line of `python -X
+    importtime` output; depth 0 are the modules imported directly by the
+    profiled code, the rest are imported by the module below them.
+    """
+    for line in lines:
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            yield match[4], int(match[1]), int(match[2]), len(match[3]) // 2
+
+
+class Command(BaseCommand):
+    help = (
+        "Report where boot time goes: runs django.setup() and loads the URLconf in a "
+        "fresh interpreter with -X importtime, under the current settings and "
+        "environment (e.g. SETTINGS_PROFILE=api), and lists the slowest packages by "
+        "their own import time and the slowest top-level imports including what they "
+        "pulled in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help="Rows per table (default: 15).")
+        parser.add_argument('--no-urls', action='store_true',
+                            help="Stop after django.setup(), as management commands do.")
+
+    def handle(self, *args, **options):
+        code = BOOT.format(urls='' if options['no_urls'] else LOAD_URLS)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if result.returncode:
+            raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+
+        imports = list(parse_importtime(result.stderr.splitlines()))
+        packages = Counter()
+        for module, self_us, _, _ in imports:
+            packages[module.split('.')[0]] += self_us
+        top_level = sorted((row for row in imports if row[3] == 0), key=lambda row: -row[2])
+
+        boot = float(result.stdout.strip().splitlines()[-1])
+        self.stdout.write(
+            f"Boot: {boot * 1000:.0f} ms, {len(imports)} modules imported "
+            f"({os.environ.get('DJANGO_SETTINGS_MODULE')}, "
+            f"SETTINGS_PROFILE={os.environ.get('SETTINGS_PROFILE', 'full')})"
+        )
+        self.stdout.write("\nPackages by own import time:")
+        for package, self_us in packages.most_common(options['top']):
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {package}")
+        self.stdout.write("\nTop-level imports by total time:")
+        for module, _, cumulative_us, _ in top_level[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {module}")
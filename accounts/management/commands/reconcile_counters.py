@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from comments.models import Comment
+from follows.models import Follow
+from likes.models import Like
+from notes.models import Note
+from profiles.models import Profile
+from taskhive.counters import recount
+
+# (label, model, counter column, recount expression)
+COUNTERS = [
+    ('note.like_count', Note, 'like_count', lambda: recount(Like, 'note')),
+    ('note.comment_count', Note, 'comment_count', lambda: recount(Comment, 'note')),
+    ('profile.followers_count', Profile, 'followers_count',
+     lambda: recount(Follow, 'following', outer_ref='user')),
+    ('profile.following_count', Profile, 'following_count',
+     lambda: recount(Follow, 'follower', outer_ref='user')),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the denormalized like, comment and follow counters and fix the "
+        "rows that drifted, e.g. after bulk_create or raw SQL. Each counter is "
+        "fixed with one UPDATE that only touches rows whose stored value is wrong."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report the drifted rows; exits with an error if there are any.")
+        parser.add_argument('--counter', action='append', choices=[label for label, *_ in COUNTERS],
+                            help="Only this counter; repeat for several. Default: all.")
+
+    def handle(self, *args, **options):
+        wanted = options['counter']
+        total = 0
+        for label, model, field, expression in COUNTERS:
+            if wanted and label not in wanted:
+                continue
+            started = time.perf_counter()
+            drifted = model.objects.alias(actual=expression()).exclude(**{field: F('actual')})
+            if options['dry_run']:
+                count = drifted.count()
+            else:
+                count = drifted.update(**{field: expression()})
+            total += count
+            self.stdout.write(f"{label:<28} {count:>9} rows  {time.perf_counter() - started:6.2f}s")
+        verb = 'drifted' if options['dry_run'] else 'fixed'
+        self.stdout.write(f"{total} rows {verb}")
+        if options['dry_run'] and total:
+            raise CommandError("Counters have drifted; run without --dry-run to fix them.")
@@ -0,0 +1,194 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from comments.models import Comment
+from follows.models import Follow
+from likes.models import Like
+from notes import feed
+from notes.models import FeedItem, Note
+from profiles.models import Profile
+from search.index import INDEXES
+from tags.models import Tag
+from tasks.models import Task
+
+WORDS = (
+    'exam revision lecture chapter summary project deadline draft essay lab report '
+    'reading group meeting thesis outline notes quiz homework review algebra biology '
+    'history chemistry physics literature statistics economics design research'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate benchmark data: users with profiles and tokens, a power-law "
+        "follow graph, tasks, tagged notes, likes and comments. Usernames are "
+        "'<prefix>-<n>'; user 0 is the most followed. All seeded users share the "
+        "password 'perf'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--tasks-per-user', type=int, default=20)
+        parser.add_argument('--notes-per-user', type=int, default=10)
+        parser.add_argument('--tags-per-user', type=int, default=5)
+        parser.add_argument('--follows-per-user', type=int, default=15,
+                            help="Average follows per user; the actual counts follow a power law.")
+        parser.add_argument('--likes-per-note', type=int, default=5)
+        parser.add_argument('--comments-per-note', type=int, default=3)
+        parser.add_argument('--public-ratio', type=float, default=0.6)
+        parser.add_argument('--prefix', default='perf')
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for repeatable data sets.")
+        parser.add_argument('--clear', action='store_true',
+                            help="Delete users from a previous run with the same prefix first.")
+
+    def handle(self, *args, **options):
+        if options['users'] < 2:
+            raise CommandError("--users must be at least 2.")
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        prefix = options['prefix']
+
+        existing = User.objects.filter(username__startswith=f'{prefix}-')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f"Users named '{prefix}-*' already exist; pass --clear to replace them.")
+            self.step('Removed previous users', lambda: existing.delete()[0])
+
+        with transaction.atomic():
+            users = self.step('Users, profiles and tokens', self.create_users)
+            self.step('Follows', lambda: self.create_follows(users))
+            tags = self.step('Tags', lambda: self.create_tags(users))
+            self.step('Tasks', lambda: self.create_tasks(users))
+            notes = self.step('Notes', lambda: self.create_notes(users, tags))
+            self.step('Likes', lambda: self.create_likes(users, notes))
+            self.step('Comments', lambda: self.create_comments(users, notes))
+
+        # bulk_create skips the signals that maintain these, so rebuild them.
+        self.step('Search index', lambda: sum(index.rebuild() for index in INDEXES.values()))
+        self.step('Feeds', self.rebuild_feeds)
+        self.stdout.write('Counters:')
+        call_command('reconcile_counters', stdout=self.stdout)
+
+    def step(self, label, func):
+        started = time.perf_counter()
+        result = func()
+        count = len(result) if isinstance(result, list) else result
+        self.stdout.write(f"{label:<28} {count:>9} rows  {time.perf_counter() - started:6.2f}s")
+        return result
+
+    def sentence(self, low, high):
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(low, high))).capitalize()
+
+    def rebuild_feeds(self):
+        feed.rebuild_all()
+        return FeedItem.objects.count()
+
+    def create_users(self):
+        prefix = self.options['prefix']
+        password = make_password('perf')  # Hashing once keeps this fast
+        User.objects.bulk_create(
+            User(username=f'{prefix}-{i}', email=f'{prefix}-{i}@example.com', password=password)
+            for i in range(self.options['users'])
+        )
+        users = list(User.objects.filter(username__startswith=f'{prefix}-').order_by('id'))
+        Profile.objects.bulk_create(Profile(user=user, bio=self.sentence(3, 12)) for user in users)
+        Token.objects.bulk_create(Token(user=user, key=Token.generate_key()) for user in users)
+        return users
+
+    def create_follows(self, users):
+        """
+        Pick targets with Zipf weights so a few users collect most followers,
+        and draw each user's follow count from a Pareto distribution so a few
+        users follow many people.
+        """
+        weights = [1 / (rank + 1) for rank in range(len(users))]
+        average = self.options['follows_per_user']
+        follows = []
+        for user in users:
+            wanted = min(len(users) - 1, int(self.rng.paretovariate(1.5) * average / 3))
+            targets = set()
+            for target in self.rng.choices(users, weights=weights, k=wanted * 2):
+                if len(targets) == wanted:
+                    break
+                if target != user:
+                    targets.add(target)
+            follows.extend(Follow(follower=user, following=target) for target in targets)
+        return Follow.objects.bulk_create(follows, batch_size=1000)
+
+    def create_tags(self, users):
+        # Tag names are globally unique, so they carry the owner's username.
+        return Tag.objects.bulk_create(
+            Tag(owner=user, name=f'{user.username}-{word}')
+            for user in users
+            for word in self.rng.sample(WORDS, min(self.options['tags_per_user'], len(WORDS)))
+        )
+
+    def create_tasks(self, users):
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+        now = timezone.now()
+
+        def task(user):
+            status = self.rng.choice(statuses)
+            return Task(
+                owner=user,
+                title=self.sentence(2, 6),
+                description=self.sentence(5, 30),
+                status=status,
+                priority=self.rng.choice(priorities),
+                # Completions spread over the last 60 days, for /api/tasks/stats/
+                completed_at=now - datetime.timedelta(minutes=self.rng.randrange(60 * 24 * 60))
+                if status == 'done' else None,
+            )
+
+        return Task.objects.bulk_create((
+            task(user)
+            for user in users
+            for _ in range(self.options['tasks_per_user'])
+        ), batch_size=1000)
+
+    def create_notes(self, users, tags):
+        notes = Note.objects.bulk_create((
+            Note(
+                owner=user,
+                title=self.sentence(2, 8),
+                content=self.sentence(20, 120),
+                is_public=self.rng.random() < self.options['public_ratio'],
+            )
+            for user in users
+            for _ in range(self.options['notes_per_user'])
+        ), batch_size=1000)
+        tags_by_owner = {}
+        for tag in tags:
+            tags_by_owner.setdefault(tag.owner_id, []).append(tag)
+        NoteTag = Note.tags.through
+        links = []
+        for note in notes:
+            owner_tags = tags_by_owner.get(note.owner_id, [])
+            picked = self.rng.sample(owner_tags, self.rng.randint(0, min(3, len(owner_tags))))
+            links.extend(NoteTag(note_id=note.pk, tag_id=tag.pk) for tag in picked)
+        NoteTag.objects.bulk_create(links, batch_size=1000)
+        return notes
+
+    def create_likes(self, users, notes):
+        likes = []
+        for note in notes:
+            wanted = min(len(users), int(self.rng.expovariate(1 / self.options['likes_per_note'])))
+            likes.extend(Like(note=note, user=user) for user in self.rng.sample(users, wanted))
+        return Like.objects.bulk_create(likes, batch_size=1000)
+
+    def create_comments(self, users, notes):
+        return Comment.objects.bulk_create((
+            Comment(note=note, commenter=self.rng.choice(users), content=self.sentence(3, 25))
+            for note in notes
+            for _ in range(int(self.rng.expovariate(1 / self.options['comments_per_note'])))
+        ), batch_size=1000)
@@ -7,4 +7,16 @@ class TestUpload(models.Model):
     image = CloudinaryField('image')
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+class ThrottleBucket(models.Model):
+    """
+    A rate-limit bucket of taskhive.throttling.DatabaseBucketStore, kept as
+    the time (in epoch seconds) at which it will be full again.
+    """
+    key = models.CharField(max_length=200, primary_key=True)
+    full_at = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return self.key
@@ -1,3 +1,520 @@
-from django.test import TestCase
+import csv
+import datetime
+import json
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from comments.models import Comment
+from follows.models import Follow
+from notes.models import FeedItem, Note
+from tags.models import Tag
+from taskhive.concurrency import run_concurrently
+from taskhive.middleware import QueryRecorder, fingerprint
+from taskhive.throttling import DatabaseBucketStore, LocalBucketStore, TokenBucketThrottle, get_store, parse_rate
+from tasks.models import Task
+from .models import ThrottleBucket
+
+
+class CachedTokenAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='member', password='old-pass-123')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeat_requests_skip_the_token_lookup(self):
+        self.assertEqual(self.client.get('/api/accounts/me/').status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get('/api/accounts/me/').status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get('/api/accounts/me/')
+        self.token.delete()
+        self.assertEqual(self.client.get('/api/accounts/me/').status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/accounts/me/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/accounts/me/').status_code, 401)
+
+    def test_password_change_drops_cached_user(self):
+        self.client.get('/api/accounts/me/')
+        response = self.client.put(
+            '/api/accounts/change-password/',
+            {'old_password': 'old-pass-123', 'new_password': 'new-pass-456'},
+        )
+        self.assertEqual(response.status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/accounts/me/')
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+
+class DashboardCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='member', first_name='Sam')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self):
+        response = self.client.get('/api/accounts/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_load_is_served_from_cache(self):
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.get()['X-Cache'], 'HIT')
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_task_and_note_writes_invalidate(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(owner=self.user, title='Write report')
+            # Not before the write commits, or a read could re-cache old data.
+            self.assertEqual(self.get()['X-Cache'], 'HIT')
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['recent_tasks'][0]['title'], 'Write report')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(owner=self.user, title='Idea', content='...')
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(self.get().data['recent_tasks'], "No tasks yet. Start by adding one!")
+
+    def test_bulk_task_writes_invalidate(self):
+        self.get()
+        self.client.post('/api/tasks/bulk/', {'create': [{'title': 'Imported'}]}, format='json')
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+    def test_other_users_writes_do_not_invalidate(self):
+        self.get()
+        other = User.objects.create_user(username='other')
+        Task.objects.create(owner=other, title='Theirs')
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+
+    def test_new_day_rebuilds_overdue_flags(self):
+        today = timezone.localdate()
+        Task.objects.create(owner=self.user, title='Due today', due_date=today)
+        self.assertFalse(self.get().data['recent_tasks'][0]['is_overdue'])
+        tomorrow = timezone.now() + datetime.timedelta(days=1)
+        with mock.patch('django.utils.timezone.now', return_value=tomorrow):
+            response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertTrue(response.data['recent_tasks'][0]['is_overdue'])
+
+    def test_stats_are_staff_only(self):
+        self.get()
+        self.get()
+        self.assertEqual(self.client.get('/api/accounts/dashboard/cache-stats/').status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get('/api/accounts/dashboard/cache-stats/').data
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        other = User.objects.create_user(username='other')
+        Task.objects.create(owner=self.user, title='Mine', due_date=datetime.date(2025, 1, 31))
+        Task.objects.create(owner=other, title='Theirs')
+        self.note = Note.objects.create(owner=self.user, title='Note', content='x')
+        self.note.tags.add(Tag.objects.create(owner=self.user, name='study'))
+        Comment.objects.create(note=self.note, commenter=self.user, content='Mine')
+        Comment.objects.create(note=self.note, commenter=other, content='Theirs')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, query=''):
+        response = self.client.get(f'/api/accounts/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_contains_only_own_records(self):
+        records = [json.loads(line) for line in self.get().splitlines()]
+        self.assertEqual(
+            [(record['type'], record.get('title', record.get('content'))) for record in records],
+            [('task', 'Mine'), ('note', 'Note'), ('comment', 'Mine')],
+        )
+        self.assertEqual(records[0]['due_date'], '2025-01-31')
+        self.assertEqual(records[1]['tags'], ['study'])
+
+    def test_csv_of_one_kind(self):
+        rows = list(csv.reader(StringIO(self.get('?format=csv&type=notes'))))
+        self.assertEqual(rows[0], ['id', 'title', 'content', 'is_public', 'tags', 'created_at', 'updated_at'])
+        self.assertEqual(rows[1][1:5], ['Note', 'x', 'False', 'study'])
+        self.assertEqual(len(rows), 2)
+
+    def test_bad_requests(self):
+        for query in ('?format=csv', '?type=likes'):
+            response = self.client.get(f'/api/accounts/export/{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_notes_are_read_in_chunks(self):
+        for i in range(4):
+            Note.objects.create(owner=self.user, title=f'Note {i}', content='x')
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(len(self.get('?type=notes').splitlines()), 5)
+        tag_queries = [q for q in ctx.captured_queries if 'tags_tag' in q['sql']]
+        self.assertEqual(len(tag_queries), 3)
+
+
+class ImportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post('/api/accounts/import/', {'file': upload, **data}, format='multipart')
+
+    def test_export_round_trip(self):
+        source = User.objects.create_user(username='source')
+        Task.objects.create(owner=source, title='Revise', status='done', due_date=datetime.date(2025, 5, 1))
+        note = Note.objects.create(owner=source, title='Summary', content='x', is_public=True)
+        note.tags.add(Tag.objects.create(owner=source, name='source-exam'))
+        Comment.objects.create(note=note, commenter=source, content='Skipped')
+        exporter = APIClient()
+        exporter.force_authenticate(source)
+        export = b''.join(exporter.get('/api/accounts/export/').streaming_content).decode()
+
+        Tag.objects.create(owner=self.user, name='reused')
+        export = export.replace('source-exam', 'reused')
+        response = self.upload('export.ndjson', export)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], {'tasks': 1, 'notes': 1})
+        self.assertEqual(response.data['tags_created'], 0)
+        self.assertEqual([error['line'] for error in response.data['errors']], [3])
+
+        task = Task.objects.get(owner=self.user)
+        self.assertEqual((task.title, task.status, task.due_date), ('Revise', 'done', datetime.date(2025, 5, 1)))
+        imported = Note.objects.get(owner=self.user)
+        self.assertEqual([tag.name for tag in imported.tags.all()], ['reused'])
+        self.assertEqual(self.client.get('/api/tasks/?q=revise').data['results'][0]['id'], task.pk)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)  # Read back from a temporary file
+    def test_csv_rows_are_validated_one_by_one(self):
+        content = (
+            'title,status,due_date\n'
+            'Good,todo,2025-02-01\n'
+            ',todo,\n'
+            'Bad status,someday,\n'
+            'Also good,,\n'
+        )
+        response = self.upload('tasks.csv', content, type='tasks')
+        self.assertEqual(response.data['created'], {'tasks': 2, 'notes': 0})
+        self.assertEqual(response.data['error_count'], 2)
+        errors = {error['line']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(set(errors), {3, 4})
+        self.assertIn('title', errors[3])
+        self.assertIn('status', errors[4])
+
+    def test_note_tags_are_created_in_bulk(self):
+        Tag.objects.create(owner=User.objects.create_user(username='other'), name='taken')
+        content = '\n'.join(json.dumps(record) for record in [
+            {'type': 'note', 'title': 'One', 'content': 'x', 'tags': ['a', 'b']},
+            {'type': 'note', 'title': 'Two', 'content': 'x', 'tags': ['b', 'c']},
+            {'type': 'note', 'title': 'Three', 'content': 'x', 'tags': ['taken']},
+            'not an object',
+        ]) + '\nnot json\n'
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.upload('notes.ndjson', content)
+        self.assertEqual(response.data['created'], {'tasks': 0, 'notes': 2})
+        self.assertEqual(response.data['tags_created'], 3)
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4, 5])
+        self.assertLess(len(ctx.captured_queries), 15)
+        self.assertEqual(
+            sorted(Tag.objects.filter(owner=self.user).values_list('name', flat=True)), ['a', 'b', 'c']
+        )
+
+    def test_types_that_are_not_strings_are_row_errors(self):
+        content = '\n'.join(json.dumps(record) for record in [
+            {'type': ['task'], 'title': 'List'},
+            {'type': {'kind': 'task'}, 'title': 'Object'},
+            {'type': 'task', 'title': 'Fine'},
+        ])
+        response = self.upload('tasks.ndjson', content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], {'tasks': 1, 'notes': 0})
+        self.assertEqual([(error['line'], list(error['errors'])) for error in response.data['errors']],
+                         [(1, ['type']), (2, ['type'])])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.post('/api/accounts/import/', {}, format='multipart').status_code, 400)
+        self.assertEqual(self.upload('tasks.csv', 'title\nA\n').status_code, 400)
+        self.assertEqual(self.upload('tasks.csv', 'title\nA\n', type='likes').status_code, 400)
+
+    @override_settings(IMPORT_BATCH_SIZE=2)
+    def test_command_reports_progress_per_batch(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as source:
+            for i in range(5):
+                source.write(json.dumps({'title': f'Task {i}'}) + '\n')
+            source.flush()
+            out, err = StringIO(), StringIO()
+            call_command('import_tasks', source.name, user='importer', type='tasks', stdout=out, stderr=err)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 5)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn('Imported 5 tasks and 0 notes', lines[-1])
+
+
+class PerfCommandTests(TestCase):
+
+    def test_seed_then_benchmark(self):
+        call_command('seed_perf', users=6, tasks_per_user=2, notes_per_user=2, stdout=StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='perf-').count(), 6)
+        self.assertEqual(Token.objects.count(), 6)
+        self.assertTrue(Follow.objects.exists())
+        self.assertTrue(FeedItem.objects.exists())
+
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('bench_api', requests=2, warmup=0, match='^api/tasks/', output=output.name, stdout=StringIO())
+            results = json.load(output)
+        routes = {row['route']: row for row in results['results']}
+        self.assertEqual(set(routes), {'api/tasks/', 'api/tasks/stats/', 'api/tasks/<int:pk>/'})
+        self.assertEqual(routes['api/tasks/']['errors'], 0)
+        self.assertGreater(routes['api/tasks/']['queries'], 0)
+        self.assertIn({'route': 'api/tasks/bulk/', 'reason': 'GET not allowed'}, results['skipped'])
+
+    def test_profile_imports(self):
+        out = StringIO()
+        with mock.patch.dict('os.environ', SETTINGS_PROFILE='api'):
+            call_command('profile_imports', top=500, stdout=out)
+        report = out.getvalue()
+        self.assertRegex(report, r'^Boot: \d+ ms, \d+ modules imported .*SETTINGS_PROFILE=api\)')
+        self.assertRegex(report, r'\n +[\d.]+ ms  rest_framework\n')
+        self.assertNotIn('allauth', report)
+        self.assertNotIn(' PIL\n', report)
+
+    def test_streamed_responses_are_read_to_the_end(self):
+        call_command('seed_perf', users=3, tasks_per_user=2, notes_per_user=2, stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('bench_api', requests=2, warmup=0, match='^api/accounts/export/$',
+                         output=output.name, stdout=StringIO())
+            export, = json.load(output)['results']
+        self.assertEqual(export['errors'], 0)
+        # Tasks, notes, their tags and comments are read while streaming.
+        self.assertGreaterEqual(export['queries'], 4)
+
+    @override_settings(THROTTLE_RATES={'feed': {'user': '1/hour'}})
+    def test_benchmarks_are_not_throttled(self):
+        self.addCleanup(lambda: get_store().clear())
+        call_command('seed_perf', users=3, tasks_per_user=1, notes_per_user=2, stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('bench_api', requests=3, warmup=0, match='^api/notes/feed/$', output=output.name,
+                         stdout=StringIO())
+            feed, = json.load(output)['results']
+        self.assertEqual((feed['errors'], feed['throttled']), (0, 0))
+
+    def test_seeded_counters_are_reconciled(self):
+        call_command('seed_perf', users=6, tasks_per_user=1, notes_per_user=2, stdout=StringIO())
+        call_command('reconcile_counters', dry_run=True, stdout=StringIO())
+
+    def test_reconcile_counters_fixes_drift(self):
+        user = User.objects.create_user(username='author')
+        note = Note.objects.create(owner=user, title='Note', content='x')
+        Comment.objects.create(note=note, commenter=user, content='First')
+        Note.objects.filter(pk=note.pk).update(comment_count=5, like_count=2)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('reconcile_counters', dry_run=True, stdout=out)
+        self.assertIn('2 rows drifted', out.getvalue())
+
+        call_command('reconcile_counters', stdout=StringIO())
+        note.refresh_from_db()
+        self.assertEqual((note.like_count, note.comment_count), (0, 1))
+
+
+@override_settings(CONCURRENT_QUERIES=True)
+class ConcurrentQueryTests(TransactionTestCase):
+    """Committed data, so the pool threads' own connections can see it."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', first_name='Ada')
+        Task.objects.create(owner=self.user, title='Task')
+        Note.objects.create(owner=self.user, title='Note', content='x')
+
+    def test_results_come_back_in_order_from_other_threads(self):
+        results = run_concurrently(
+            lambda: (threading.get_ident(), Task.objects.get().title),
+            lambda: (threading.get_ident(), Note.objects.get().title),
+        )
+        self.assertEqual([title for _, title in results], ['Task', 'Note'])
+        self.assertNotEqual(results[0][0], results[1][0])
+
+    def test_instrumentation_sees_pooled_queries(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            run_concurrently(lambda: Task.objects.count(), lambda: Note.objects.count())
+        self.assertEqual(len(recorder.statements), 2)
+
+    def test_runs_inline_inside_transactions(self):
+        with transaction.atomic():
+            Task.objects.create(owner=self.user, title='Uncommitted')
+            counts = run_concurrently(lambda: Task.objects.count(), lambda: Task.objects.count())
+        self.assertEqual(counts, [2, 2])
+
+    def test_dashboard(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        data = client.get('/api/accounts/dashboard/').data
+        self.assertEqual(data['recent_tasks'][0]['title'], 'Task')
+        self.assertEqual(data['recent_notes'][0]['title'], 'Note')
+
+    def test_asgi_benchmark(self):
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('bench_api', user='owner', requests=4, warmup=0, interface='asgi', concurrency=2,
+                         match='^api/accounts/dashboard/$', output=output.name, stdout=StringIO())
+            results = json.load(output)
+        self.assertEqual(results['mode'], 'asgi')
+        self.assertEqual(results['results'][0]['errors'], 0)
+
+
+class QueryInstrumentationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Task.objects.create(owner=self.user, title='Task')
+
+    @override_settings(DEBUG=True)
+    def test_headers_in_debug(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['X-DB-Queries'], '1')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 queries", app;dur=[\d.]+$')
+        self.assertNotIn('X-DB-Duplicate-Queries', response)
+
+    @override_settings(DEBUG=False, QUERY_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        response = self.client.get('/api/tasks/')
+        self.assertNotIn('X-DB-Queries', response)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(DEBUG=False, QUERY_INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_repeated_statements_are_reported(self):
+        note = Note.objects.create(owner=self.user, title='Note', content='...', is_public=True)
+        for i in range(3):
+            fan = User.objects.create_user(username=f'fan{i}')
+            Comment.objects.create(note=note, commenter=fan, content='Nice')
+        # Without its select_related the thread looks up each commenter.
+        unjoined = lambda view: Comment.objects.filter(note_id=view.kwargs['note_id'])
+        with mock.patch('comments.views.CommentListCreateView.get_queryset', unjoined), \
+                self.assertLogs('taskhive.queries', 'DEBUG') as logs:
+            response = self.client.get(f'/api/notes/{note.pk}/comments/')
+        self.assertRegex(response['X-DB-Duplicate-Queries'], r'^[0-9a-f]{8}x3')
+        self.assertIn('ran 3 times', logs.output[0])
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT *  FROM t\n WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    @override_settings(DEBUG=True)
+    def test_over_budget_requests_are_logged(self):
+        with mock.patch('tasks.views.TaskListCreateView.query_budget', {'GET': 0}):
+            with self.assertLogs('taskhive.queries', 'WARNING') as logs:
+                self.client.get('/api/tasks/')
+        self.assertIn('over its budget of 0', logs.output[0])
+
+
+class ThrottlingTests(TestCase):
+
+    def setUp(self):
+        self.addCleanup(lambda: get_store().clear())
+        get_store().clear()
+
+    def login(self, client=None):
+        return (client or APIClient()).post('/api/accounts/login/', {'username': 'nobody', 'password': 'x'})
+
+    def test_login_is_limited_per_ip(self):
+        # The clock stands still: a slow run would otherwise refill a token.
+        with mock.patch('taskhive.throttling.time.time', return_value=1000.0):
+            self.assertEqual([self.login().status_code for _ in range(10)], [400] * 10)
+            response = self.login()
+        self.assertEqual(response.status_code, 429)
+        # A token every 6 seconds.
+        self.assertEqual(response['Retry-After'], '6')
+
+        elsewhere = APIClient(REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(self.login(elsewhere).status_code, 400)
+        self.assertEqual(APIClient().get('/api/accounts/login/').status_code, 200)
+
+    @override_settings(THROTTLE_RATES={'feed': {'user': '2/min'}})
+    def test_feed_is_limited_per_user(self):
+        ann, bob = APIClient(), APIClient()
+        ann.force_authenticate(User.objects.create_user(username='ann'))
+        bob.force_authenticate(User.objects.create_user(username='bob'))
+        self.assertEqual([ann.get('/api/notes/feed/').status_code for _ in range(2)], [200, 200])
+        with self.assertNumQueries(0):
+            self.assertEqual(ann.get('/api/notes/feed/').status_code, 429)
+        self.assertEqual(bob.get('/api/notes/feed/').status_code, 200)
+
+    def test_the_base_throttle_limits_no_one(self):
+        view = mock.Mock(throttle_scope='login', throttle_methods=None)
+        self.assertTrue(TokenBucketThrottle().allow_request(mock.Mock(method='POST'), view))
+
+    def test_buckets_refill_at_the_rate(self):
+        store, rate = LocalBucketStore(), parse_rate('3/min')
+        self.assertEqual([store.take('k', rate, 1000.0) for _ in range(3)], [0, 0, 0])
+        self.assertEqual(store.take('k', rate, 1000.0), 20)
+        self.assertEqual(store.take('k', rate, 1015.0), 5)
+        self.assertEqual(store.take('k', rate, 1020.0), 0)
+        self.assertEqual(store.take('k', rate, 1020.0), 20)
+
+        store.prune(1079.0)
+        self.assertEqual(store.full_at, {'k': 1080.0})
+        store.prune(1080.0)
+        self.assertEqual(store.full_at, {})
+
+    def test_database_store(self):
+        store, rate = DatabaseBucketStore(), parse_rate('2/min')
+        self.assertEqual([store.take('k', rate, 1000.0) for _ in range(2)], [0, 0])
+        self.assertEqual(ThrottleBucket.objects.get().full_at, 1060.0)
+        self.assertEqual(store.take('k', rate, 1000.0), 30)
+        # The rejection is remembered, so retries cost nothing until it ends.
+        with self.assertNumQueries(0):
+            self.assertEqual(store.take('k', rate, 1010.0), 20)
+        self.assertEqual(store.take('k', rate, 1030.0), 0)
+
+        # Another node sharing the table sees the same bucket.
+        self.assertEqual(DatabaseBucketStore().take('k', rate, 1030.0), 30)
+        self.assertEqual(store.prune(1080.0), 0)
+        self.assertEqual(store.prune(1091.0), 1)
+
+    @override_settings(THROTTLE_STORE='taskhive.throttling.DatabaseBucketStore',
+                       THROTTLE_RATES={'login': {'ip': '1/hour'}})
+    def test_views_with_the_database_store(self):
+        self.addCleanup(lambda: get_store().clear())
+        self.assertEqual(self.login().status_code, 400)
+        self.assertEqual(self.login().status_code, 429)
+        self.assertEqual(ThrottleBucket.objects.get().key, 'login:ip:127.0.0.1')
@@ -2,6 +2,9 @@ from django.urls import path
 from .views import (
     HomePageView,
     DashboardView,
+    DashboardCacheStatsView,
+    ExportView,
+    ImportView,
     CurrentUserView,
     CustomRegisterView,
     CustomLoginView,
@@ -11,6 +14,9 @@ from .views import (
 urlpatterns = [
     path('home/', HomePageView.as_view(), name='home'),
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('dashboard/cache-stats/', DashboardCacheStatsView.as_view(), name='dashboard-cache-stats'),
+    path('export/', ExportView.as_view(), name='export'),
+    path('import/', ImportView.as_view(), name='import'),
     path('me/', CurrentUserView.as_view(), name='current-user'),
     path('register/', CustomRegisterView.as_view(), name='custom-register'),
     path('login/', CustomLoginView.as_view(), name='custom-login'),
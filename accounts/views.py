@@ -1,17 +1,23 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status, permissions
-from rest_framework.permissions import IsAuthenticated
-from django.contrib.auth.models import User
+import io
+
 from django.contrib.auth import authenticate
-from rest_framework.authtoken.models import Token
 from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Import task/note models and serializers
-from tasks.models import Task
-from notes.models import Note
-from tasks.serializers import TaskSerializer
-from notes.serializers import NoteSerializer
+from jobs.queue import enqueue
+from . import importer
+from .dashboard import build_dashboard, dashboard_cache
+from .export import KINDS, CSVRenderer, NDJSONRenderer, csv_lines, ndjson_lines
 
 
 class HomePageView(APIView):
@@ -20,23 +26,90 @@ class HomePageView(APIView):
 
 
 class DashboardView(APIView):
+    """
+    The user's landing page. The payload is cached per user and day
+    (see accounts/dashboard.py); X-Cache says whether it was a hit.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = request.user
+        payload, hit = dashboard_cache.get_or_build(
+            user.pk, timezone.localdate().isoformat(), lambda: build_dashboard(user)
+        )
+        response = Response(payload)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
 
-        # Get the 5 most recent tasks and notes
-        tasks = Task.objects.filter(owner=user).order_by('-created_at')[:5]
-        notes = Note.objects.filter(owner=user).order_by('-created_at')[:5]
 
-        task_data = TaskSerializer(tasks, many=True).data
-        note_data = NoteSerializer(notes, many=True).data
+class DashboardCacheStatsView(APIView):
+    """Hit/miss counters for the dashboard cache. Staff only."""
+    permission_classes = [IsAdminUser]
 
-        return Response({
-            "message": f"Welcome to your dashboard, {user.first_name}!",
-            "recent_tasks": task_data if task_data else "No tasks yet. Start by adding one!",
-            "recent_notes": note_data if note_data else "No notes yet. Start capturing ideas!"
-        })
+    def get(self, request):
+        return Response(dashboard_cache.stats())
+
+
+class ExportView(APIView):
+    """
+    Download everything you wrote, streamed as it is read.
+    GET (?format=ndjson): tasks, notes and comments, one JSON object per line.
+    GET ?format=csv&type=tasks|notes|comments: one kind as a CSV table.
+    ?type= also narrows the NDJSON export to one kind.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        kind = request.query_params.get('type')
+        if kind is not None and kind not in KINDS:
+            raise ValidationError({'type': f"Must be one of: {', '.join(KINDS)}."})
+
+        renderer = request.accepted_renderer
+        if renderer.format == 'csv':
+            if kind is None:
+                raise ValidationError({'type': "CSV exports one kind at a time; pass ?type=."})
+            lines = csv_lines(request.user, kind)
+        else:
+            lines = ndjson_lines(request.user, [kind] if kind else list(KINDS))
+
+        response = StreamingHttpResponse(lines, content_type=f'{renderer.media_type}; charset=utf-8')
+        filename = f'taskhive-{request.user.username}-{kind or "all"}.{renderer.format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ImportView(APIView):
+    """
+    Import tasks and notes from an uploaded file, e.g. an export.
+    POST multipart with:
+    - file: NDJSON (records name their kind with "type") or CSV of one kind
+    - format: "ndjson" or "csv"; guessed from the file name if left out
+    - type: "tasks" or "notes"; required for CSV, the NDJSON default
+    Valid rows are imported even when others fail. Returns the counts of
+    created rows and the errors of the rejected ones by line number.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': "No file was submitted."})
+        file_format = request.data.get('format') or importer.guess_format(upload.name)
+        kind = request.data.get('type') or None
+        if file_format not in importer.FORMATS:
+            raise ValidationError({'format': f"Must be one of: {', '.join(importer.FORMATS)}."})
+        if kind is not None and kind not in importer.KINDS:
+            raise ValidationError({'type': f"Must be one of: {', '.join(importer.KINDS)}."})
+        if file_format == 'csv' and kind is None:
+            raise ValidationError({'type': "CSV files hold one kind; pass type."})
+
+        # Uploads over FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk by
+        # Django and read back here a line at a time.
+        lines = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+        report = importer.Importer(request.user).run(importer.read(lines, file_format, kind))
+        return Response(report)
 
 
 class CurrentUserView(APIView):
@@ -59,6 +132,9 @@ class CustomRegisterView(APIView):
     - username, email, password, first_name, last_name
     Returns success message and token on registration.
     """
+    throttle_scope = 'register'
+    throttle_methods = ('POST',)
+
     def get(self, request):
         return Response({
             "message": "Send a POST request with username, email, password, first_name, and last_name to register."
@@ -74,14 +150,16 @@ class CustomRegisterView(APIView):
         if User.objects.filter(username=data['username']).exists():
             return Response({"error": "Username already taken."}, status=status.HTTP_400_BAD_REQUEST)
 
-        user = User.objects.create(
-            username=data['username'],
-            email=data['email'],
-            first_name=data['first_name'],
-            last_name=data['last_name'],
-            password=make_password(data['password'])
-        )
-        Token.objects.create(user=user)
+        with transaction.atomic():
+            user = User.objects.create(
+                username=data['username'],
+                email=data['email'],
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                password=make_password(data['password'])
+            )
+            # Made by the job worker; logging in makes one if it has not yet.
+            enqueue('accounts.create_tokens', {'user_id': user.pk}, dedupe_key=str(user.pk))
         return Response({"message": "Successfully registered! Please log in."}, status=status.HTTP_201_CREATED)
 
 
@@ -91,6 +169,8 @@ class CustomLoginView(APIView):
     - GET: Informs user to send POST request
     - POST: Authenticates user and returns token
     """
+    throttle_scope = 'login'
+    throttle_methods = ('POST',)
 
     def get(self, request):
         return Response({
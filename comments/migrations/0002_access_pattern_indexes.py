@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+        ('notes', '0004_feeditem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['note', 'created_at', 'id'], name='comment_note_created_idx'),
+        ),
+    ]
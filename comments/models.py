@@ -1,6 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from notes.models import Note
+from taskhive import counters
 
 class Comment(models.Model):
     """Model representing a comment made by a user on a note."""
@@ -9,5 +12,25 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Comment threads, oldest first
+            models.Index(fields=['note', 'created_at', 'id'], name='comment_note_created_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.commenter.username} - {self.content[:30]}"
\ No newline at end of file
+        return f"{self.commenter.username} - {self.content[:30]}"
+
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                counters.adjust(Note.objects.filter(pk=self.note_id), comment_count=1)
+
+
+# Deletes run in a transaction that also covers their post_delete signals.
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    counters.adjust(Note.objects.filter(pk=instance.note_id), comment_count=-1)
+
@@ -1,10 +1,17 @@
 from rest_framework import serializers
+from profiles.serializers import image_url
 from .models import Comment
 
 class CommentSerializer(serializers.ModelSerializer):
     commenter = serializers.ReadOnlyField(source='commenter.username')
+    commenter_image = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
         fields = '__all__'
         read_only_fields = ['commenter', 'created_at', 'note']  # ✅ Ensure 'note' is read-only
+
+    def get_commenter_image(self, obj):
+        # Small avatar; the views select_related the commenter's profile.
+        profile = getattr(obj.commenter, 'profile', None)
+        return image_url(profile, 'small', self.context.get('request')) if profile else None
@@ -1,3 +1,70 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from notes.models import Note
+from profiles.models import Profile
+from taskhive.testing import QueryBudgetAssertions, QueryPlanAssertions
+from .models import Comment
+
+
+class CommentQueryPlanTests(QueryPlanAssertions, TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='reader')
+        self.note = Note.objects.create(owner=user, title='Note', content='x', is_public=True)
+        Comment.objects.bulk_create(
+            Comment(note=self.note, commenter=user, content=f'Comment {i}') for i in range(3)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_thread(self):
+        self.assertNoFullScans(f'/api/notes/{self.note.pk}/comments/')
+
+    def test_later_page(self):
+        first = self.client.get(f'/api/notes/{self.note.pk}/comments/?page_size=1').data
+        self.assertNoFullScans(first['next'])
+
+
+class CommentThreadTests(QueryBudgetAssertions, TestCase):
+
+    def setUp(self):
+        self.reader = User.objects.create_user(username='reader')
+        self.note = Note.objects.create(owner=self.reader, title='Note', content='x', is_public=True)
+        self.url = f'/api/notes/{self.note.pk}/comments/'
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def add_comments(self, count):
+        for i in range(count):
+            commenter = User.objects.create_user(username=f'commenter{Comment.objects.count()}')
+            Profile.objects.filter(user=commenter).update(
+                image_variants={'original': f'/media/{i}.png', 'small': f'/media/{i}-small.jpg'},
+            )
+            Comment.objects.create(note=self.note, commenter=commenter, content=f'Comment {i}')
+
+    def test_commenters_are_joined(self):
+        self.add_comments(2)
+        response = self.assertWithinQueryBudget(self.url)
+        self.add_comments(8)
+        self.assertWithinQueryBudget(self.url)
+
+        first = response.data['results'][0]
+        self.assertEqual(first['commenter'], 'commenter0')
+        self.assertEqual(first['commenter_image'], 'http://testserver/media/0-small.jpg')
+
+    def test_oldest_first_across_pages(self):
+        self.add_comments(5)
+        contents, url = [], f'{self.url}?page_size=2'
+        while url:
+            page = self.client.get(url).data
+            contents += [comment['content'] for comment in page['results']]
+            url = page['next']
+        self.assertEqual(contents, [f'Comment {i}' for i in range(5)])
+
+    def test_detail_includes_the_avatar(self):
+        self.add_comments(1)
+        comment = Comment.objects.get()
+        response = self.client.get(f'/api/comments/{comment.pk}/')
+        self.assertEqual(response.data['commenter_image'], 'http://testserver/media/0-small.jpg')
@@ -2,6 +2,7 @@ from rest_framework import generics, permissions
 from .models import Comment
 from .serializers import CommentSerializer
 from .permissions import IsCommentOwnerOrReadOnly
+from taskhive.pagination import OldestFirstPagination
 
 
 class CommentListCreateView(generics.ListCreateAPIView):
@@ -9,14 +10,19 @@ class CommentListCreateView(generics.ListCreateAPIView):
     List all comments for a note or create a new comment.
     - Endpoint: /api/notes/<note_id>/comments/
     - Authenticated users can post comments.
-    - Comments are sorted by creation date (oldest first).
+    - Comments are sorted by creation date (oldest first) and cursor-paginated,
+      seeking into comment_note_created_idx, so a page of a long thread
+      costs the same as a page of a short one.
+    - Each commenter's username and avatar are joined into the same query.
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OldestFirstPagination
+    query_budget = {'GET': 2}  # auth, comments with commenters
 
     def get_queryset(self):
         note_id = self.kwargs['note_id']
-        return Comment.objects.filter(note__id=note_id).order_by('created_at')
+        return Comment.objects.filter(note_id=note_id).select_related('commenter__profile')
 
     def perform_create(self, serializer):
         serializer.save(
@@ -32,6 +38,6 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
     - No update/edit functionality to keep discussions consistent.
     - Endpoint: /api/comments/<pk>/
     """
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('commenter__profile')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsCommentOwnerOrReadOnly]
@@ -1,5 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from taskhive import counters
+
+
+def _adjust_profiles(follow, delta):
+    from profiles.models import Profile  # profiles.models imports this module
+
+    counters.adjust(Profile.objects.filter(user_id=follow.follower_id), following_count=delta)
+    if follow.following_id is not None:
+        counters.adjust(Profile.objects.filter(user_id=follow.following_id), followers_count=delta)
 
 
 class Follow(models.Model):
@@ -10,6 +21,25 @@ class Follow(models.Model):
     class Meta:
         unique_together = ('follower', 'following')
         ordering = ['-created_at']
+        indexes = [
+            # Follower lists and "does X follow me" lookups; unique_together
+            # already covers the (follower, following) direction.
+            models.Index(fields=['following', 'follower'], name='follow_following_follower_idx'),
+        ]
 
     def __str__(self):
         return f"{self.follower.username} follows {self.following.username}"
+
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                _adjust_profiles(self, 1)
+
+
+# Deletes run in a transaction that also covers their post_delete signals.
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    _adjust_profiles(instance, -1)
+
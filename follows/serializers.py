@@ -1,16 +1,25 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from profiles.models import Profile  # Adjust import if necessary
+from profiles.serializers import image_url
 
 class FollowUserSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField(source='profile.image', read_only=True)
+    image = serializers.SerializerMethodField()
     followed_back = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = ['id', 'username', 'image', 'followed_back']  # username is native, don't use source='user.username'
 
+    def get_image(self, obj):
+        # Lists show small avatars; the profile comes from select_related.
+        profile = getattr(obj, 'profile', None)
+        return image_url(profile, 'small', self.context.get('request')) if profile else None
+
     def get_followed_back(self, obj):
+        # Annotated by the follower/following list views.
+        if hasattr(obj, 'followed_back'):
+            return obj.followed_back
         request_user = self.context.get('request').user
         if request_user and request_user.is_authenticated:
             return obj.followers.filter(follower=request_user).exists()
@@ -1,3 +1,73 @@
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from taskhive.testing import QueryBudgetAssertions, QueryPlanAssertions
+
+from .models import Follow
+
+
+class FollowListQueryCountTests(QueryBudgetAssertions, TestCase):
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer')
+        self.star = User.objects.create_user(username='star')
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def add_followers(self, count, followed_back=False):
+        for _ in range(count):
+            fan = User.objects.create_user(username=f'fan{User.objects.count()}')
+            Follow.objects.create(follower=fan, following=self.star)
+            if followed_back:
+                Follow.objects.create(follower=self.viewer, following=fan)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_follower_list_query_count_is_constant(self):
+        self.add_followers(2)
+        few, _ = self.count_queries('/api/follows/star/followers/')
+        self.add_followers(8, followed_back=True)
+        many, response = self.count_queries('/api/follows/star/followers/')
+        self.assertEqual(few, many)
+        flags = [row['followed_back'] for row in response.data['results']]
+        self.assertEqual(flags, [True] * 8 + [False] * 2)
+
+    def test_following_list_query_count_is_constant(self):
+        self.add_followers(2)
+        few, _ = self.count_queries('/api/follows/fan2/following/')
+        self.add_followers(8)
+        many, _ = self.count_queries('/api/follows/fan2/following/')
+        self.assertEqual(few, many)
+
+    def test_lists_stay_within_budget(self):
+        self.add_followers(5, followed_back=True)
+        self.assertWithinQueryBudget('/api/follows/star/followers/')
+        self.assertWithinQueryBudget('/api/follows/viewer/following/')
+
+    def test_unknown_user(self):
+        response = self.client.get('/api/follows/nobody/followers/')
+        self.assertEqual(response.status_code, 404)
+
+
+class FollowQueryPlanTests(QueryPlanAssertions, TestCase):
+
+    def setUp(self):
+        viewer = User.objects.create_user(username='viewer')
+        star = User.objects.create_user(username='star')
+        Follow.objects.create(follower=viewer, following=star)
+        Follow.objects.create(follower=star, following=viewer)
+        self.client = APIClient()
+        self.client.force_authenticate(viewer)
+
+    def test_followers(self):
+        self.assertNoFullScans('/api/follows/star/followers/')
+
+    def test_following(self):
+        self.assertNoFullScans('/api/follows/star/following/')
@@ -2,9 +2,11 @@ from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth.models import User
+from django.db.models import Exists, F, OuterRef
 from django.shortcuts import get_object_or_404
 from .models import Follow
 from .serializers import FollowUserSerializer
+from taskhive.pagination import KeysetPagination
 
 
 class FollowUserView(APIView):
@@ -38,14 +40,33 @@ class FollowUserView(APIView):
 
 # views.py
 
+class FollowPagination(KeysetPagination):
+    """Most recent follows first."""
+    ordering = ('-followed_at', '-id')
+
+
+def with_follow_state(users, request_user):
+    """
+    Join each listed user's profile and flag whether the requesting user
+    follows them, so FollowUserSerializer needs no per-row queries.
+    """
+    return users.select_related('profile').annotate(
+        followed_back=Exists(Follow.objects.filter(follower=request_user, following=OuterRef('pk')))
+    )
+
+
 class FollowerListView(generics.ListAPIView):
     serializer_class = FollowUserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FollowPagination
+    query_budget = {'GET': 3}  # auth, user, users with follow state
 
     def get_queryset(self):
-        username = self.kwargs['username']
-        user = User.objects.get(username=username)
-        return User.objects.filter(following__following=user)
+        user = get_object_or_404(User, username=self.kwargs['username'])
+        followers = User.objects.filter(following__following=user).annotate(
+            followed_at=F('following__created_at')
+        )
+        return with_follow_state(followers, self.request.user)
 
     def get_serializer_context(self):
         return {'request': self.request}
@@ -54,11 +75,15 @@ class FollowerListView(generics.ListAPIView):
 class FollowingListView(generics.ListAPIView):
     serializer_class = FollowUserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FollowPagination
+    query_budget = {'GET': 3}  # auth, user, users with follow state
 
     def get_queryset(self):
-        username = self.kwargs['username']
-        user = User.objects.get(username=username)
-        return User.objects.filter(followers__follower=user)
+        user = get_object_or_404(User, username=self.kwargs['username'])
+        following = User.objects.filter(followers__follower=user).annotate(
+            followed_at=F('followers__created_at')
+        )
+        return with_follow_state(following, self.request.user)
 
     def get_serializer_context(self):
         return {'request': self.request}
@@ -7,3 +7,19 @@ export const axiosInstance = axios.create({
     'Content-Type': 'application/json',
   },
 });
+
+
+// List endpoints are cursor-paginated. Follow the `next` links and return
+// every page's results as one axios-style response.
+export const getAllPages = async (url, config = {}) => {
+  const results = [];
+  let response = await axiosInstance.get(url, config);
+  while (Array.isArray(response.data?.results)) {
+    results.push(...response.data.results);
+    if (!response.data.next) {
+      return { ...response, data: results };
+    }
+    response = await axiosInstance.get(response.data.next, { headers: config.headers });
+  }
+  return response;
+};
@@ -1,7 +1,7 @@
 
 import React, { useState, useEffect } from 'react';
-import { Modal, Form, Button } from 'react-bootstrap';
-import { axiosInstance } from '../api/axiosDefaults';
+import { Modal, Form, Button, Image } from 'react-bootstrap';
+import { axiosInstance, getAllPages } from '../api/axiosDefaults';
 
 const CommentsModal = ({ note, show, onHide }) => {
   const [comments, setComments] = useState([]);
@@ -16,7 +16,7 @@ const CommentsModal = ({ note, show, onHide }) => {
       try {
         const token = localStorage.getItem('authToken');
         const headers = { Authorization: `Token ${token}` };
-        const res = await axiosInstance.get(`/api/notes/${note.id}/comments/`, { headers });
+        const res = await getAllPages(`/api/notes/${note.id}/comments/`, { headers });
         setComments(res.data);
       } catch (err) {
         console.error('Error fetching comments:', err);
@@ -32,7 +32,7 @@ const CommentsModal = ({ note, show, onHide }) => {
       const headers = { Authorization: `Token ${token}` };
       await axiosInstance.post(`/api/notes/${note.id}/comments/`, { content: newComment }, { headers });
       setNewComment('');
-      const res = await axiosInstance.get(`/api/notes/${note.id}/comments/`, { headers });
+      const res = await getAllPages(`/api/notes/${note.id}/comments/`, { headers });
       setComments(res.data);
     } catch (err) {
       console.error('Error adding comment:', err);
@@ -49,7 +49,7 @@ const CommentsModal = ({ note, show, onHide }) => {
       const token = localStorage.getItem('authToken');
       const headers = { Authorization: `Token ${token}` };
       await axiosInstance.put(`/api/comments/${editingCommentId}/`, { content: editedCommentContent }, { headers });
-      const res = await axiosInstance.get(`/api/notes/${note.id}/comments/`, { headers });
+      const res = await getAllPages(`/api/notes/${note.id}/comments/`, { headers });
       setComments(res.data);
       setEditingCommentId(null);
       setEditedCommentContent('');
@@ -63,7 +63,7 @@ const CommentsModal = ({ note, show, onHide }) => {
       const token = localStorage.getItem('authToken');
       const headers = { Authorization: `Token ${token}` };
       await axiosInstance.delete(`/api/comments/${commentId}/`, { headers });
-      const res = await axiosInstance.get(`/api/notes/${note.id}/comments/`, { headers });
+      const res = await getAllPages(`/api/notes/${note.id}/comments/`, { headers });
       setComments(res.data);
     } catch (err) {
       console.error('Error deleting comment:', err);
@@ -85,6 +85,14 @@ const CommentsModal = ({ note, show, onHide }) => {
         <hr />
         {comments.map((comment) => (
           <div key={comment.id} className="mb-2">
+            <Image
+              src={comment.commenter_image || 'https://ui-avatars.com/api/?name=User'}
+              alt={comment.commenter}
+              roundedCircle
+              width={24}
+              height={24}
+              className="me-2"
+            />
             <strong>{comment.commenter}</strong>{' '}
             <small className="text-muted">({new Date(comment.created_at).toLocaleString()})</small>
             {editingCommentId === comment.id ? (
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Modal, ListGroup, Button, Spinner, Image, Alert } from 'react-bootstrap';
 import { Link } from 'react-router-dom';
-import { axiosInstance } from '../api/axiosDefaults';
+import { axiosInstance, getAllPages } from '../api/axiosDefaults';
 import { useAuth } from '../contexts/AuthContext';
 
 const FollowersListModal = ({ username, show, onHide, onFollowBack }) => {
@@ -17,7 +17,7 @@ const FollowersListModal = ({ username, show, onHide, onFollowBack }) => {
       setLoading(true);
       const token = localStorage.getItem('authToken');
 
-      axiosInstance.get(`/api/follows/${username}/followers/`, {
+      getAllPages(`/api/follows/${username}/followers/`, {
         headers: { Authorization: `Token ${token}` },
       })
         .then(res => {
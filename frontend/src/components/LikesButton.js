@@ -9,15 +9,18 @@ const LikesButton = ({ noteId, initialLikesCount = 0, onLikeChange }) => {
   const [likesCount, setLikesCount] = useState(initialLikesCount);
   const { user } = useAuth();
 
+  const authHeaders = () => ({ Authorization: `Token ${localStorage.getItem('authToken')}` });
+
+  // Every /me/ call answers with the current { like_count, liked }.
+  const applyState = ({ data }) => {
+    setLiked(data.liked);
+    setLikesCount(data.like_count);
+  };
+
   useEffect(() => {
     const fetchUserLike = async () => {
       try {
-        const token = localStorage.getItem('authToken');
-        const headers = { Authorization: `Token ${token}` };
-
-        const res = await axiosInstance.get(`/api/likes/notes/${noteId}/likes/`, { headers }); // ✅ FIXED
-        const userLiked = res.data.some((like) => like.user === user?.username);
-        setLiked(userLiked);
+        applyState(await axiosInstance.get(`/api/likes/notes/${noteId}/me/`, { headers: authHeaders() }));
       } catch (err) {
         console.error('Error checking like status:', err.response?.data || err.message);
       }
@@ -29,26 +32,12 @@ const LikesButton = ({ noteId, initialLikesCount = 0, onLikeChange }) => {
   }, [noteId, user?.username]);
 
   const toggleLike = async () => {
-    const token = localStorage.getItem('authToken');
-    const headers = {
-      Authorization: `Token ${token}`,
-      'Content-Type': 'application/json',
-    };
-
+    const url = `/api/likes/notes/${noteId}/me/`;
     try {
-      if (liked) {
-        const res = await axiosInstance.get(`/api/likes/notes/${noteId}/likes/`, { headers }); // ✅ FIXED
-        const userLike = res.data.find((like) => like.user === user?.username);
-        if (userLike) {
-          await axiosInstance.delete(`/api/likes/${userLike.id}/`, { headers });
-          setLikesCount((prev) => Math.max(0, prev - 1));
-        }
-      } else {
-        await axiosInstance.post(`/api/likes/notes/${noteId}/likes/`, {}, { headers }); // ✅ FIXED
-        setLikesCount((prev) => prev + 1);
-      }
-
-      setLiked(!liked);
+      const res = liked
+        ? await axiosInstance.delete(url, { headers: authHeaders() })
+        : await axiosInstance.put(url, {}, { headers: authHeaders() });
+      applyState(res);
       if (onLikeChange) onLikeChange();
     } catch (err) {
       console.error('Error toggling like:', err.response?.data || err.message);
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Container, Row, Col, Card, Spinner, Alert } from 'react-bootstrap';
 import { Link } from 'react-router-dom';
-import { axiosInstance } from '../api/axiosDefaults';
+import { axiosInstance, getAllPages } from '../api/axiosDefaults';
 import { useAuth } from '../contexts/AuthContext';
 import NavBar from '../components/NavBar';
 import styles from '../styles/DashboardPage.module.css';
@@ -11,6 +11,7 @@ import dashboardBanner from '../assets/dash.png';
 const DashboardPage = () => {
   const { user } = useAuth();
   const [tasks, setTasks] = useState([]);
+  const [taskStats, setTaskStats] = useState(null);
   const [notes, setNotes] = useState([]);
   const [feedNotes, setFeedNotes] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -20,12 +21,18 @@ const DashboardPage = () => {
     const fetchDashboardData = async () => {
       try {
         const token = localStorage.getItem('authToken');
-        const [tasksRes, notesRes, feedRes] = await Promise.all([
-          axiosInstance.get('/api/tasks/', { headers: { Authorization: `Token ${token}` } }),
-          axiosInstance.get('/api/notes/', { headers: { Authorization: `Token ${token}` } }),
-          axiosInstance.get('/api/notes/feed/', { headers: { Authorization: `Token ${token}` } }),
+        // Only three tasks are shown; the counts come from /api/tasks/stats/.
+        const [tasksRes, statsRes, notesRes, feedRes] = await Promise.all([
+          axiosInstance.get('/api/tasks/', {
+            params: { page_size: 3 },
+            headers: { Authorization: `Token ${token}` },
+          }),
+          axiosInstance.get('/api/tasks/stats/', { headers: { Authorization: `Token ${token}` } }),
+          getAllPages('/api/notes/', { headers: { Authorization: `Token ${token}` } }),
+          getAllPages('/api/notes/feed/', { headers: { Authorization: `Token ${token}` } }),
         ]);
-        setTasks(tasksRes.data);
+        setTasks(tasksRes.data.results);
+        setTaskStats(statsRes.data);
         setNotes(notesRes.data);
         setFeedNotes(feedRes.data);
         setLoading(false);
@@ -83,6 +90,11 @@ const DashboardPage = () => {
               🗂 Recent Tasks
             </Link>
           </h3>
+          {taskStats?.total > 0 && (
+            <p className="text-muted" role="status">
+              {taskStats.open} open · {taskStats.overdue} overdue · {taskStats.by_status.done} done
+            </p>
+          )}
           <Row className="mb-3">
             {tasks.length === 0 ? (
               <Col>
@@ -106,7 +118,7 @@ const DashboardPage = () => {
               ))
             )}
           </Row>
-          {tasks.length > 3 && (
+          {taskStats?.total > 3 && (
             <div className="text-end mb-2">
               <Link to="/tasks" className="btn btn-sm btn-primary" aria-label="View more tasks">
                 View More Tasks
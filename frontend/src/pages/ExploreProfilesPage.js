@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { Container, Card, Button, Spinner, Row, Col } from 'react-bootstrap';
 import { Link } from 'react-router-dom';
-import { axiosInstance } from '../api/axiosDefaults';
+import { getAllPages } from '../api/axiosDefaults';
 import NavBar from '../components/NavBar';
 
 const CLOUDINARY_BASE_URL = process.env.REACT_APP_CLOUDINARY_BASE_URL || 'https://res.cloudinary.com/dotdnopux/image/upload/';
@@ -16,7 +16,7 @@ const ExploreProfilesPage = () => {
         const token = localStorage.getItem('authToken');
         const headers = { Authorization: `Token ${token}` };
 
-        const res = await axiosInstance.get('/api/profiles/', { headers });
+        const res = await getAllPages('/api/profiles/', { headers });
         setProfiles(res.data);
       } catch (error) {
         console.error('Explore fetch failed:', error.response?.data || error.message);
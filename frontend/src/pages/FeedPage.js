@@ -13,7 +13,7 @@ import {
   Button,
 } from 'react-bootstrap';
 import { Link } from 'react-router-dom';
-import { axiosInstance } from '../api/axiosDefaults';
+import { getAllPages } from '../api/axiosDefaults';
 import NavBar from '../components/NavBar';
 import { FaUsers, FaSearch } from 'react-icons/fa';
 import CommentsModal from '../components/CommentsModal';
@@ -34,7 +34,7 @@ const FeedPage = () => {
     const fetchFeedNotes = async () => {
       try {
         const token = localStorage.getItem('authToken');
-        const response = await axiosInstance.get('/api/notes/feed/', {
+        const response = await getAllPages('/api/notes/feed/', {
           headers: { Authorization: `Token ${token}` },
         });
         setFeedNotes(response.data);
@@ -62,7 +62,7 @@ const FeedPage = () => {
   const handleLikeChange = async () => {
     try {
         const token = localStorage.getItem('authToken');
-        const response = await axiosInstance.get('/api/notes/feed/', {
+        const response = await getAllPages('/api/notes/feed/', {
         headers: { Authorization: `Token ${token}` },
         });
         setFeedNotes(response.data);
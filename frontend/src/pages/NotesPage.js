@@ -2,7 +2,7 @@
 import React, { useEffect, useState } from 'react';
 import { Container, Row, Col, Form, Button, Card, Alert, Badge, Modal } from 'react-bootstrap';
 import { useNavigate } from 'react-router-dom';
-import { axiosInstance } from '../api/axiosDefaults';
+import { axiosInstance, getAllPages } from '../api/axiosDefaults';
 import NavBar from '../components/NavBar';
 import CreatableSelect from 'react-select/creatable';
 import CommentsModal from '../components/CommentsModal';
@@ -40,7 +40,7 @@ const NotesPage = () => {
       const headers = { Authorization: `Token ${token}` };
       try {
         const [notesRes, tagsRes] = await Promise.all([
-          axiosInstance.get('/api/notes/', { headers }),
+          getAllPages('/api/notes/', { headers }),
           axiosInstance.get('/api/tags/', { headers }),
         ]);
         setNotes(notesRes.data);
@@ -99,7 +99,7 @@ const NotesPage = () => {
 
       resetForm();
       const [notesRes, tagsRes] = await Promise.all([
-        axiosInstance.get('/api/notes/', { headers }),
+        getAllPages('/api/notes/', { headers }),
         axiosInstance.get('/api/tags/', { headers }),
       ]);
       setNotes(notesRes.data);
@@ -126,7 +126,7 @@ const NotesPage = () => {
     try {
       await axiosInstance.delete(`/api/notes/${id}/`, { headers });
       setSuccess('Note deleted.');
-      const res = await axiosInstance.get('/api/notes/', { headers });
+      const res = await getAllPages('/api/notes/', { headers });
       setNotes(res.data);
     } catch (err) {
       setError('Error deleting note.');
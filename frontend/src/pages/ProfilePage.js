@@ -78,11 +78,19 @@ const ProfilePage = () => {
     }
 
     try {
-      await axiosInstance.put('/api/profiles/me/', formData, { headers });
-      setToast({ type: 'success', message: 'Profile updated successfully!' });
+      const res = await axiosInstance.put('/api/profiles/me/', formData, { headers });
+      const pending = res.data.image_status === 'pending';
+      setToast({
+        type: 'success',
+        message: pending
+          ? 'Profile updated! Your new photo will appear shortly.'
+          : 'Profile updated successfully!',
+      });
       setShowEditModal(false);
-      const res = await axiosInstance.get('/api/profiles/me/', { headers });
       setProfile(res.data);
+      if (pending) {
+        waitForImage(headers);
+      }
     } catch (err) {
       console.error('❌ Failed to update profile:', err);
       setToast({ type: 'danger', message: 'Failed to update profile.' });
@@ -91,6 +99,22 @@ const ProfilePage = () => {
     }
   };
 
+  // New photos are processed in the background; check back until done.
+  const waitForImage = async (headers) => {
+    for (let attempt = 0; attempt < 15; attempt += 1) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      try {
+        const res = await axiosInstance.get('/api/profiles/me/', { headers });
+        if (res.data.image_status !== 'pending') {
+          setProfile(res.data);
+          return;
+        }
+      } catch (err) {
+        return;
+      }
+    }
+  };
+
   const handleFollowToggle = async () => {
     const token = localStorage.getItem('authToken');
     const headers = { Authorization: `Token ${token}` };
@@ -150,7 +174,7 @@ const ProfilePage = () => {
               <Image
                 src={
                   profile.image
-                    ? `${getFullImageUrl(profile.image)}?${new Date().getTime()}`
+                    ? getFullImageUrl(profile.image_thumbnails?.medium || profile.image)
                     : 'https://via.placeholder.com/150'
                 }
                 roundedCircle
@@ -159,6 +183,9 @@ const ProfilePage = () => {
                 alt="Profile"
                 className={styles.profileImage}
               />
+              {profile.image_status === 'pending' && (
+                <p className="text-muted small mt-2" role="status">Processing your new photo…</p>
+              )}
               <h4 className={`mt-3 ${styles.username}`}>@{profile.username}</h4>
               <p className={styles.bioText}>{profile.bio || 'No bio added.'}</p>
 
@@ -2,7 +2,7 @@ import React, { useEffect, useState } from 'react';
 import {
   Container, Row, Col, Card, Button, Form, Alert, Badge, Modal,
 } from 'react-bootstrap';
-import { axiosInstance } from '../api/axiosDefaults';
+import { axiosInstance, getAllPages } from '../api/axiosDefaults';
 import { useAuth } from '../contexts/AuthContext';
 import NavBar from '../components/NavBar';
 import styles from '../styles/TasksPage.module.css';
@@ -17,14 +17,17 @@ const TasksPage = () => {
   const [search, setSearch] = useState('');
   const [filterPriority, setFilterPriority] = useState('');
   const [filterStatus, setFilterStatus] = useState('');
+  const [filterDue, setFilterDue] = useState('');
   const [successMsg, setSuccessMsg] = useState('');
   const [errorMsg, setErrorMsg] = useState('');
 
   const fetchTasks = async () => {
     try {
       const token = localStorage.getItem('authToken');
-      const params = { search, priority: filterPriority, status: filterStatus };
-      const response = await axiosInstance.get('/api/tasks/', {
+      const params = { q: search, priority: filterPriority, status: filterStatus };
+      if (filterDue === 'overdue') params.overdue = true;
+      if (filterDue === 'soon') params.due_within_days = 7;
+      const response = await getAllPages('/api/tasks/', {
         headers: { Authorization: `Token ${token}` },
         params,
       });
@@ -36,7 +39,7 @@ const TasksPage = () => {
 
   useEffect(() => {
     fetchTasks();
-  }, [search, filterPriority, filterStatus]);
+  }, [search, filterPriority, filterStatus, filterDue]);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -82,8 +85,6 @@ const TasksPage = () => {
     setModalOpen(true);
   };
 
-  const isOverdue = (dueDate) => dueDate && new Date(dueDate) < new Date();
-
   return (
     <>
       <NavBar />
@@ -97,10 +98,10 @@ const TasksPage = () => {
 
         {/* Filters */}
         <Row className="mb-3">
-          <Col md={4}>
+          <Col md={3}>
             <Form.Control placeholder="Search tasks..." value={search} onChange={(e) => setSearch(e.target.value)} />
           </Col>
-          <Col md={3}>
+          <Col md={2}>
             <Form.Select value={filterPriority} onChange={(e) => setFilterPriority(e.target.value)}>
               <option value="">All Priorities</option>
               <option value="high">High</option>
@@ -108,7 +109,7 @@ const TasksPage = () => {
               <option value="low">Low</option>
             </Form.Select>
           </Col>
-          <Col md={3}>
+          <Col md={2}>
             <Form.Select value={filterStatus} onChange={(e) => setFilterStatus(e.target.value)}>
               <option value="">All Statuses</option>
               <option value="todo">To Do</option>
@@ -116,6 +117,13 @@ const TasksPage = () => {
               <option value="done">Done</option>
             </Form.Select>
           </Col>
+          <Col md={3}>
+            <Form.Select value={filterDue} onChange={(e) => setFilterDue(e.target.value)}>
+              <option value="">Any Due Date</option>
+              <option value="overdue">Overdue</option>
+              <option value="soon">Due in the Next 7 Days</option>
+            </Form.Select>
+          </Col>
           <Col md={2}>
             <Button onClick={() => setModalOpen(true)} className="w-100">+ New Task</Button>
           </Col>
@@ -132,7 +140,7 @@ const TasksPage = () => {
                   <Card.Body>
                     <Card.Title>
                       {task.title}
-                      {isOverdue(task.due_date) && <Badge bg="danger" className="ms-2">Overdue</Badge>}
+                      {task.is_overdue && <Badge bg="danger" className="ms-2">Overdue</Badge>}
                     </Card.Title>
                     <Card.Text>
                         <strong>Priority:</strong> {task.priority}<br />
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings, loaded automatically from the working directory.
+
+SERVER_INTERFACE picks how Django is served:
+
+- wsgi (default): taskhive.wsgi with gunicorn's sync workers
+- asgi: taskhive.asgi with uvicorn workers, so one worker keeps many
+  slow or idle connections open without tying up a process each
+
+The worker count comes from WEB_CONCURRENCY, which gunicorn reads itself.
+"""
+import os
+
+interface = os.environ.get('SERVER_INTERFACE', 'wsgi')
+
+if interface == 'asgi':
+    wsgi_app = 'taskhive.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif interface == 'wsgi':
+    wsgi_app = 'taskhive.wsgi:application'
+else:
+    raise RuntimeError(f"SERVER_INTERFACE must be 'wsgi' or 'asgi', not {interface!r}")
@@ -0,0 +1,61 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.queue import Worker, registry, requeue_failed
+
+# Seconds between sweeps for jobs abandoned by a worker that went away.
+RECOVER_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (see jobs/queue.py) until stopped. Claims up to "
+        "JOB_BATCH_SIZE ready jobs at a time and sleeps JOB_POLL_INTERVAL seconds "
+        "when none is ready. Any number of workers can run at once; SIGTERM and "
+        "SIGINT stop a worker after its current batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--name', action='append', choices=sorted(registry),
+                            help="Only run jobs with this name; repeat for several. Default: all.")
+        parser.add_argument('--batch-size', type=int, help="Jobs per claim (default: JOB_BATCH_SIZE).")
+        parser.add_argument('--burst', action='store_true', help="Exit once no job is ready.")
+        parser.add_argument('--requeue-failed', action='store_true',
+                            help="First give jobs that ran out of attempts another set of tries.")
+
+    def handle(self, *args, **options):
+        worker = Worker(names=options['name'], batch_size=options['batch_size'])
+        if options['requeue_failed']:
+            self.stdout.write(f"{requeue_failed(options['name'])} failed jobs requeued")
+
+        self.stopping = False
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            done = self.work(worker, options['burst'])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(f"{done} jobs run")
+
+    def work(self, worker, burst):
+        done, recovered_at = 0, None
+        while not self.stopping:
+            close_old_connections()
+            if recovered_at is None or time.monotonic() - recovered_at > RECOVER_INTERVAL:
+                if recovered := worker.recover():
+                    self.stdout.write(f"{recovered} abandoned jobs requeued")
+                recovered_at = time.monotonic()
+            claimed = worker.run_once()
+            done += claimed
+            if not claimed:
+                if burst:
+                    break
+                time.sleep(settings.JOB_POLL_INTERVAL)
+        return done
+
+    def stop(self, signum, frame):
+        self.stopping = True
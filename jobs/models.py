@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work for `manage.py run_worker`; see jobs/queue.py.
+    Finished jobs are deleted, so the table only holds waiting, running
+    and failed ones.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # While a job with the same name and key waits for its first try,
+    # enqueueing another is a no-op.
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Set when a worker claims the job and kept afterwards, so a job that
+    # was ever claimed no longer counts for deduplication.
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim WHERE status = 'queued' AND run_at <= now ORDER BY run_at
+            models.Index(fields=['run_at', 'id'], condition=models.Q(status='queued'), name='job_queued_idx'),
+            # Finding claims abandoned by a worker that died
+            models.Index(fields=['locked_at'], condition=models.Q(status='running'), name='job_running_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['name', 'dedupe_key'],
+                condition=models.Q(status='queued', locked_at__isnull=True),
+                name='job_untried_dedupe_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
@@ -0,0 +1,167 @@
+"""
+A job queue in the database, worked by `manage.py run_worker`.
+
+Request code calls enqueue(), which is one INSERT in the caller's
+transaction: the job exists if and only if the work that asked for it
+committed. Workers claim ready jobs in batches:
+
+- on PostgreSQL with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+  workers share the queue without waiting on each other's rows;
+- elsewhere (SQLite) by marking the picked rows as running with an
+  UPDATE that only matches rows still queued, so a row two workers both
+  picked is claimed by one of them.
+
+Handlers are registered with @job in each app's jobs.py. A handler
+registered with batch=True is called once with the payloads of every job
+of its kind in a claimed batch, so e.g. tokens for a burst of sign-ups
+are made with one INSERT. A failed job is retried after
+JOB_RETRY_DELAY * 2 ** (attempts - 1) seconds, capped at
+JOB_MAX_RETRY_DELAY; after max_attempts it is kept as failed and the
+handler's on_failure, if any, is called with its payload.
+"""
+import datetime
+import logging
+import os
+import socket
+import traceback
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Handler:
+    func: Callable
+    batch: bool
+    max_attempts: int
+    on_failure: Optional[Callable]
+
+
+registry = {}
+
+
+def job(name, *, batch=False, max_attempts=None, on_failure=None):
+    """
+    Register the decorated function as the handler of jobs called `name`.
+    It takes one payload dict, or a list of them with batch=True.
+    """
+    def register(func):
+        registry[name] = Handler(func, batch, max_attempts or settings.JOB_MAX_ATTEMPTS, on_failure)
+        return func
+    return register
+
+
+def enqueue(name, payload=None, *, dedupe_key=None, delay=None):
+    """
+    Queue a job. With a dedupe_key, nothing is queued while a job with
+    the same name and key is still waiting for its first try.
+    """
+    if name not in registry:
+        raise ValueError(f"No job handler is registered as {name!r}.")
+    new = Job(name=name, payload=payload or {}, dedupe_key=dedupe_key)
+    if delay:
+        new.run_at = timezone.now() + datetime.timedelta(seconds=delay)
+    if dedupe_key is None:
+        new.save()
+    else:
+        Job.objects.bulk_create([new], ignore_conflicts=True)
+
+
+def retry_delay(attempts):
+    return min(settings.JOB_RETRY_DELAY * 2 ** (attempts - 1), settings.JOB_MAX_RETRY_DELAY)
+
+
+class Worker:
+    """Claims and runs jobs; `names` limits it to some kinds of job."""
+
+    def __init__(self, names=None, batch_size=None):
+        self.names = names
+        self.batch_size = batch_size or settings.JOB_BATCH_SIZE
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'[:40]
+
+    def recover(self):
+        """Requeue jobs whose worker has held them longer than JOB_LOCK_TIMEOUT."""
+        stale = timezone.now() - datetime.timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+        return Job.objects.filter(status='running', locked_at__lt=stale).update(status='queued', locked_by='')
+
+    def claim(self):
+        now = timezone.now()
+        ready = Job.objects.filter(status='queued', run_at__lte=now).order_by('run_at', 'id')
+        if self.names:
+            ready = ready.filter(name__in=self.names)
+        claim_id = f'{self.worker_id}:{uuid.uuid4().hex[:16]}'
+        with transaction.atomic():
+            if connection.features.has_select_for_update_skip_locked:
+                ready = ready.select_for_update(skip_locked=True)
+            ids = list(ready.values_list('pk', flat=True)[:self.batch_size])
+            if not ids:
+                return []
+            Job.objects.filter(pk__in=ids, status='queued').update(
+                status='running', locked_by=claim_id, locked_at=now, attempts=F('attempts') + 1,
+            )
+        return list(Job.objects.filter(locked_by=claim_id, status='running').order_by('run_at', 'id'))
+
+    def run_once(self):
+        """Claim one batch and run it. Returns the number of jobs claimed."""
+        claimed = self.claim()
+        groups = {}
+        for claimed_job in claimed:
+            groups.setdefault(claimed_job.name, []).append(claimed_job)
+        for name, jobs in groups.items():
+            handler = registry.get(name)
+            if handler is None:
+                self.failed(jobs, None, f"No job handler is registered as {name!r}.")
+            elif handler.batch:
+                self.run(handler, jobs, lambda: handler.func([each.payload for each in jobs]))
+            else:
+                for each in jobs:
+                    self.run(handler, [each], lambda: handler.func(each.payload))
+        return len(claimed)
+
+    def run(self, handler, jobs, call):
+        try:
+            call()
+        except Exception:
+            logger.warning("Job %s failed", jobs[0].name, exc_info=True)
+            self.failed(jobs, handler, traceback.format_exc())
+        else:
+            Job.objects.filter(pk__in=[each.pk for each in jobs]).delete()
+
+    def failed(self, jobs, handler, error):
+        now = timezone.now()
+        max_attempts = handler.max_attempts if handler else 1
+        for each in jobs:
+            if each.attempts < max_attempts:
+                changes = {'status': 'queued', 'run_at': now + datetime.timedelta(seconds=retry_delay(each.attempts))}
+            else:
+                changes = {'status': 'failed'}
+            Job.objects.filter(pk=each.pk).update(locked_by='', last_error=error, **changes)
+            if changes['status'] == 'failed' and handler and handler.on_failure:
+                try:
+                    handler.on_failure(each.payload)
+                except Exception:
+                    logger.exception("on_failure of job %s #%s failed", each.name, each.pk)
+
+    def run_until_empty(self):
+        """Run batches until none is ready; for tests and --burst."""
+        total = 0
+        while count := self.run_once():
+            total += count
+        return total
+
+
+def requeue_failed(names=None):
+    """Give failed jobs a fresh set of attempts. Returns how many."""
+    failed = Job.objects.filter(status='failed')
+    if names:
+        failed = failed.filter(name__in=names)
+    return failed.update(status='queued', attempts=0, run_at=timezone.now(), last_error='')
@@ -0,0 +1,147 @@
+import datetime
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .models import Job
+from .queue import Worker, enqueue, job, registry, requeue_failed, retry_delay
+
+
+@override_settings(JOB_RETRY_DELAY=10, JOB_MAX_RETRY_DELAY=60)
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.failures = []
+        # Cleanups run last-in first-out: clear, then restore the real handlers.
+        self.addCleanup(registry.update, dict(registry))
+        self.addCleanup(registry.clear)
+
+        @job('test.single', max_attempts=2, on_failure=self.failures.append)
+        def single(payload):
+            if payload.get('fail'):
+                raise RuntimeError('boom')
+            self.calls.append(payload)
+
+        @job('test.batch', batch=True)
+        def batch(payloads):
+            self.calls.append(payloads)
+
+    def test_jobs_run_and_are_deleted(self):
+        enqueue('test.single', {'n': 1})
+        enqueue('test.single', {'n': 2})
+        self.assertEqual(Worker().run_until_empty(), 2)
+        self.assertEqual(self.calls, [{'n': 1}, {'n': 2}])
+        self.assertFalse(Job.objects.exists())
+
+    def test_batch_handlers_get_every_payload_at_once(self):
+        for n in range(3):
+            enqueue('test.batch', {'n': n})
+        Worker().run_once()
+        self.assertEqual(self.calls, [[{'n': 0}, {'n': 1}, {'n': 2}]])
+
+    def test_batch_size_limits_each_claim(self):
+        for n in range(5):
+            enqueue('test.batch', {'n': n})
+        worker = Worker(batch_size=2)
+        self.assertEqual([worker.run_once() for _ in range(4)], [2, 2, 1, 0])
+
+    def test_dedupe_key_drops_repeats_until_the_job_is_claimed(self):
+        enqueue('test.single', {'n': 1}, dedupe_key='a')
+        enqueue('test.single', {'n': 2}, dedupe_key='a')
+        enqueue('test.single', {'n': 3}, dedupe_key='b')
+        self.assertEqual(Job.objects.count(), 2)
+        Worker().claim()
+        enqueue('test.single', {'n': 4}, dedupe_key='a')
+        self.assertEqual(Job.objects.filter(status='queued').count(), 1)
+
+    def test_delayed_jobs_wait(self):
+        enqueue('test.single', {'n': 1}, delay=60)
+        self.assertEqual(Worker().run_once(), 0)
+        Job.objects.update(run_at=timezone.now())
+        self.assertEqual(Worker().run_once(), 1)
+
+    def test_failures_back_off_then_give_up(self):
+        enqueue('test.single', {'fail': True})
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            Worker().run_once()
+        failed = Job.objects.get()
+        self.assertEqual((failed.status, failed.attempts), ('queued', 1))
+        self.assertIn('boom', failed.last_error)
+        self.assertGreater(failed.run_at, timezone.now() + datetime.timedelta(seconds=9))
+        self.assertEqual(Worker().run_once(), 0)
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            Worker().run_once()
+        self.assertEqual(Job.objects.get().status, 'failed')
+        self.assertEqual(self.failures, [{'fail': True}])
+
+        self.assertEqual(requeue_failed(), 1)
+        self.assertEqual(Job.objects.get().attempts, 0)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        self.assertEqual([retry_delay(n) for n in range(1, 6)], [10, 20, 40, 60, 60])
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        enqueue('test.single', {'n': 1})
+        first, second = Worker(), Worker()
+        self.assertEqual(len(first.claim()), 1)
+        self.assertEqual(second.claim(), [])
+
+    def test_abandoned_jobs_are_recovered(self):
+        enqueue('test.single', {'n': 1})
+        Worker().claim()
+        worker = Worker()
+        self.assertEqual(worker.recover(), 0)
+        Job.objects.update(locked_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(worker.recover(), 1)
+        self.assertEqual(worker.run_once(), 1)
+        self.assertEqual(self.calls, [{'n': 1}])
+
+    def test_unknown_names(self):
+        with self.assertRaises(ValueError):
+            enqueue('test.missing')
+        Job.objects.create(name='test.gone')
+        Worker().run_once()
+        self.assertEqual(Job.objects.get().status, 'failed')
+
+    def test_run_worker_burst(self):
+        enqueue('test.single', {'n': 1})
+        enqueue('test.batch', {'n': 2})
+        out = io.StringIO()
+        call_command('run_worker', '--burst', '--name', 'test.batch', stdout=out)
+        self.assertIn('1 jobs run', out.getvalue())
+        self.assertEqual(list(Job.objects.values_list('name', flat=True)), ['test.single'])
+
+
+class RegistrationTokenTests(TestCase):
+
+    def register(self, username):
+        return APIClient().post('/api/accounts/register/', {
+            'username': username, 'email': f'{username}@example.com', 'password': 'pw-12345!',
+            'first_name': 'A', 'last_name': 'B',
+        }, format='json')
+
+    def test_tokens_are_made_by_the_worker_in_one_batch(self):
+        for username in ('ann', 'bob'):
+            self.assertEqual(self.register(username).status_code, 201)
+        self.assertFalse(Token.objects.exists())
+        self.assertEqual(Job.objects.filter(name='accounts.create_tokens').count(), 2)
+
+        with mock.patch.object(Token.objects, 'bulk_create', wraps=Token.objects.bulk_create) as bulk_create:
+            Worker().run_until_empty()
+        self.assertEqual(bulk_create.call_count, 1)
+        self.assertEqual(Token.objects.filter(user__username__in=['ann', 'bob']).count(), 2)
+
+    def test_login_before_the_worker_runs(self):
+        self.register('ann')
+        response = APIClient().post('/api/accounts/login/', {'username': 'ann', 'password': 'pw-12345!'})
+        self.assertEqual(response.status_code, 200)
+        Worker().run_until_empty()
+        self.assertEqual(Token.objects.get(user__username='ann').key, response.data['token'])
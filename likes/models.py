@@ -1,6 +1,48 @@
-from django.db import models
+from django.db import connection, models, transaction
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from notes.models import Note
+from taskhive import counters
+
+
+class LikeQuerySet(models.QuerySet):
+    """
+    Idempotent like/unlike in one statement each, so concurrent double-taps
+    cannot race between a check and a write. Both return whether a row
+    was written, and keep Note.like_count in step when one was.
+    """
+
+    def like(self, note_id, user):
+        """Like the note if the user can see it and has not liked it yet."""
+        like_table, note_table = self.model._meta.db_table, Note._meta.db_table
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with transaction.atomic(savepoint=False), connection.cursor() as cursor:
+            # SQLite needs the WHERE for ON CONFLICT to parse after a SELECT.
+            cursor.execute(
+                f"INSERT INTO {like_table} (note_id, user_id, created_at) "
+                f"SELECT id, %s, %s FROM {note_table} "
+                "WHERE id = %s AND (is_public OR owner_id = %s) "
+                "ON CONFLICT (note_id, user_id) DO NOTHING",
+                [user.pk, now, note_id, user.pk],
+            )
+            liked = cursor.rowcount == 1
+            if liked:
+                counters.adjust(Note.objects.filter(pk=note_id), like_count=1)
+        return liked
+
+    def unlike(self, note_id, user):
+        with transaction.atomic(savepoint=False), connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.model._meta.db_table} WHERE note_id = %s AND user_id = %s",
+                [note_id, user.pk],
+            )
+            unliked = cursor.rowcount == 1
+            if unliked:
+                counters.adjust(Note.objects.filter(pk=note_id), like_count=-1)
+        return unliked
+
 
 class Like(models.Model):
     """Model representing a like on a note by a user."""
@@ -8,8 +50,28 @@ class Like(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='likes')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = LikeQuerySet.as_manager()
+
     class Meta:
         unique_together = ('note', 'user')  # Prevent duplicate likes from the same user
+        indexes = [
+            # A note's likes, newest first
+            models.Index(fields=['note', 'created_at', 'id'], name='like_note_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} likes {self.note.title}"
\ No newline at end of file
+        return f"{self.user.username} likes {self.note.title}"
+
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if created:
+                counters.adjust(Note.objects.filter(pk=self.note_id), like_count=1)
+
+
+# Deletes run in a transaction that also covers their post_delete signals.
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    counters.adjust(Note.objects.filter(pk=instance.note_id), like_count=-1)
+
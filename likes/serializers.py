@@ -1,12 +1,19 @@
 from rest_framework import serializers
+from profiles.serializers import image_url
 from .models import Like
 
 
 class LikeSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
-    note = serializers.ReadOnlyField(source='note.id')  # ✅ Add this line
+    user_image = serializers.SerializerMethodField()
+    note = serializers.ReadOnlyField(source='note_id')
 
     class Meta:
         model = Like
         fields = '__all__'
-        read_only_fields = ['user', 'note', 'created_at']  # ✅ note added here
\ No newline at end of file
+        read_only_fields = ['user', 'note', 'created_at']  # ✅ note added here
+
+    def get_user_image(self, obj):
+        # Small avatar; the views select_related the user's profile.
+        profile = getattr(obj.user, 'profile', None)
+        return image_url(profile, 'small', self.context.get('request')) if profile else None
@@ -1,3 +1,77 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from notes.models import Note
+from profiles.models import Profile
+from taskhive.testing import QueryBudgetAssertions
+from .models import Like
+
+
+class MyLikeTests(QueryBudgetAssertions, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader')
+        self.author = User.objects.create_user(username='author')
+        self.note = Note.objects.create(owner=self.author, title='Note', content='x', is_public=True)
+        self.url = f'/api/likes/notes/{self.note.pk}/me/'
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_like_is_idempotent(self):
+        for _ in range(2):
+            response = self.client.put(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'like_count': 1, 'liked': True})
+        like = Like.objects.get()
+        self.assertEqual((like.user, like.note), (self.user, self.note))
+        self.assertIsNotNone(like.created_at.tzinfo)
+
+    def test_unlike_is_idempotent(self):
+        Like.objects.create(note=self.note, user=self.user)
+        Like.objects.create(note=self.note, user=self.author)
+        for _ in range(2):
+            response = self.client.delete(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'like_count': 1, 'liked': False})
+
+    def test_get_reports_state(self):
+        self.assertEqual(self.client.get(self.url).data, {'like_count': 0, 'liked': False})
+        self.client.put(self.url)
+        self.assertEqual(self.client.get(self.url).data, {'like_count': 1, 'liked': True})
+
+    def test_private_notes_of_others_cannot_be_liked(self):
+        self.note.is_public = False
+        self.note.save()
+        self.assertEqual(self.client.put(self.url).status_code, 404)
+        self.assertFalse(Like.objects.exists())
+
+    def test_own_private_note_can_be_liked(self):
+        note = Note.objects.create(owner=self.user, title='Mine', content='x')
+        response = self.client.put(f'/api/likes/notes/{note.pk}/me/')
+        self.assertEqual(response.data, {'like_count': 1, 'liked': True})
+
+    def test_unknown_note(self):
+        self.assertEqual(self.client.put('/api/likes/notes/999999/me/').status_code, 404)
+
+    def test_toggles_stay_within_budget(self):
+        self.assertWithinQueryBudget(self.url, method='put')
+        self.assertWithinQueryBudget(self.url, method='delete')
+
+    def test_liking_twice_through_the_list_endpoint_is_a_validation_error(self):
+        url = f'/api/likes/notes/{self.note.pk}/likes/'
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.assertEqual(self.client.post(url).status_code, 400)
+
+    def test_list_joins_the_likers(self):
+        url = f'/api/likes/notes/{self.note.pk}/likes/'
+        for i in range(5):
+            fan = User.objects.create_user(username=f'fan{i}')
+            Profile.objects.filter(user=fan).update(image_variants={'small': f'/media/fan{i}-small.jpg'})
+            Like.objects.create(note=self.note, user=fan)
+        response = self.assertWithinQueryBudget(url)
+        newest = response.data['results'][0]
+        self.assertEqual(
+            (newest['user'], newest['user_image'], newest['note']),
+            ('fan4', 'http://testserver/media/fan4-small.jpg', self.note.pk),
+        )
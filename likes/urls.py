@@ -1,9 +1,10 @@
 # likes/urls.py
 
 from django.urls import path
-from .views import LikeListCreateView, LikeDetailView
+from .views import LikeListCreateView, LikeDetailView, MyLikeView
 
 urlpatterns = [
     path('notes/<int:note_id>/likes/', LikeListCreateView.as_view(), name='like-list-create'),  # POST/GET
+    path('notes/<int:note_id>/me/', MyLikeView.as_view(), name='my-like'),  # GET/PUT/DELETE
     path('<int:pk>/', LikeDetailView.as_view(), name='like-detail'),  # DELETE/GET
 ]
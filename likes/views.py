@@ -1,35 +1,75 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import Like
 from .serializers import LikeSerializer
 from .permissions import IsLikeOwnerOrReadOnly
 from notes.models import Note
+from taskhive.pagination import KeysetPagination
 
 
 class LikeListCreateView(generics.ListCreateAPIView):
     """
-    List all likes for a note or create a new like.
+    List all likes for a note or create a new like, newest first and
+    cursor-paginated along like_note_created_idx. Each liker's username and
+    avatar are joined into the same query.
     Endpoint: /api/notes/<note_id>/likes/
     """
     serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    query_budget = {'GET': 2}  # auth, likes with users
 
     def get_queryset(self):
         note_id = self.kwargs['note_id']
-        return Like.objects.filter(note_id=note_id)
+        return Like.objects.filter(note_id=note_id).select_related('user__profile')
 
     def perform_create(self, serializer):
-        note_id = self.kwargs['note_id']
-        user = self.request.user
-        print("Incoming Like Request:", self.request.data)
-        print("User:", self.request.user.username)
-        print("Note ID:", self.kwargs.get("note_id"))
-        print("Incoming Like Request:", self.request.data)
-        if Like.objects.filter(note_id=note_id, user=user).exists():
+        note = get_object_or_404(Note, pk=self.kwargs['note_id'])
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user, note=note)
+        except IntegrityError:
             raise ValidationError("You have already liked this note.")
-        note = Note.objects.get(pk=note_id) 
-        serializer.save(user=user, note=note)
-    
+
+
+class MyLikeView(APIView):
+    """
+    The current user's like on a note; PUT and DELETE are idempotent.
+    GET: whether you like the note. PUT: like it. DELETE: unlike it.
+    All return {"like_count": ..., "liked": ...} so no follow-up GET is needed.
+    Endpoint: /api/likes/notes/<note_id>/me/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 4  # auth, write, counter, state
+
+    def get(self, request, note_id):
+        return self.state(request, note_id)
+
+    def put(self, request, note_id):
+        Like.objects.like(note_id, request.user)
+        return self.state(request, note_id)
+
+    def delete(self, request, note_id):
+        Like.objects.unlike(note_id, request.user)
+        return self.state(request, note_id)
+
+    def state(self, request, note_id):
+        state = (
+            Note.objects.visible_to(request.user)
+            .filter(pk=note_id)
+            .annotate(liked=Exists(Like.objects.filter(note=OuterRef('pk'), user=request.user)))
+            .values('like_count', 'liked')
+            .first()
+        )
+        if state is None:
+            raise NotFound("Note not found.")
+        return Response(state)
+
 
 class LikeDetailView(generics.RetrieveDestroyAPIView):
     """
@@ -37,6 +77,6 @@ class LikeDetailView(generics.RetrieveDestroyAPIView):
     Only the user who liked it can delete it.
     Endpoint: /api/likes/<pk>/
     """
-    queryset = Like.objects.all()
+    queryset = Like.objects.select_related('user__profile')
     serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticated, IsLikeOwnerOrReadOnly]
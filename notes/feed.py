@@ -0,0 +1,127 @@
+"""
+Fan-out-on-write for the notes feed.
+
+A user's feed holds the public notes of everyone they follow or are
+followed by. Instead of working that out on every request, a FeedItem
+row is written for each recipient when a note is published, and rows are
+backfilled or removed when a follow is added or dropped.
+
+Accounts with more than FEED_FANOUT_LIMIT followers are not fanned out to
+their followers; FeedNotesView merges their notes in at read time so a
+single post never writes millions of rows.
+"""
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from follows.models import Follow
+from profiles.models import Profile
+from .models import FeedItem, Note
+
+
+def is_high_fanout(user_id):
+    """True when the user's notes are merged into feeds on read."""
+    return Profile.objects.filter(
+        user_id=user_id, followers_count__gt=settings.FEED_FANOUT_LIMIT
+    ).exists()
+
+
+def high_fanout_following_ids(user):
+    """Ids of high-fanout accounts that ``user`` follows."""
+    return Follow.objects.filter(
+        follower=user, following__profile__followers_count__gt=settings.FEED_FANOUT_LIMIT
+    ).values_list('following_id', flat=True)
+
+
+def feed_for(user):
+    """Public notes in ``user``'s feed, newest first."""
+    merged_ids = list(high_fanout_following_ids(user))
+    if not merged_ids:
+        notes = Note.objects.filter(feed_items__recipient=user)
+    else:
+        delivered = FeedItem.objects.filter(recipient=user).values('note_id')
+        notes = Note.objects.filter(
+            Q(id__in=delivered) | Q(owner_id__in=merged_ids, is_public=True)
+        )
+    return notes.order_by('-created_at', '-id')
+
+
+def _deliver(recipient_ids, notes):
+    items = [
+        FeedItem(recipient_id=recipient_id, note_id=note_id, created_at=created_at)
+        for recipient_id in recipient_ids
+        for note_id, created_at in notes
+    ]
+    FeedItem.objects.bulk_create(items, batch_size=500, ignore_conflicts=True)
+
+
+def fan_out_note(note):
+    """Deliver a public note to everyone related to its owner."""
+    fan_out_notes(note.owner_id, [note])
+
+
+def fan_out_notes(owner_id, notes):
+    """Deliver public notes of one owner, e.g. after a bulk_create."""
+    recipients = set(
+        Follow.objects.filter(follower_id=owner_id).values_list('following_id', flat=True)
+    )
+    if not is_high_fanout(owner_id):
+        recipients.update(
+            Follow.objects.filter(following_id=owner_id).values_list('follower_id', flat=True)
+        )
+    recipients.discard(None)
+    _deliver(recipients, [(note.id, note.created_at) for note in notes])
+
+
+def backfill(recipient_id, owner_id):
+    """Copy the owner's most recent public notes into the recipient's feed."""
+    notes = (
+        Note.objects.filter(owner_id=owner_id, is_public=True)
+        .order_by('-created_at')
+        .values_list('id', 'created_at')[:settings.FEED_BACKFILL_LIMIT]
+    )
+    _deliver([recipient_id], notes)
+
+
+def rebuild_all():
+    """Recreate every feed from scratch. Used by the rebuild_feeds command."""
+    FeedItem.objects.all().delete()
+    for note in Note.objects.filter(is_public=True).only('id', 'owner_id', 'created_at').iterator():
+        fan_out_note(note)
+
+
+@receiver(post_save, sender=Note)
+def note_saved(sender, instance, created, **kwargs):
+    if not instance.is_public:
+        if not created:
+            FeedItem.objects.filter(note=instance).delete()
+        return
+    # Only fan out on publish; edits to an already delivered note are no-ops.
+    if created or not FeedItem.objects.filter(note=instance).exists():
+        fan_out_note(instance)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if not created or instance.following_id is None:
+        return
+    follower_id, following_id = instance.follower_id, instance.following_id
+    # The followed user now sees the follower's notes and vice versa.
+    backfill(following_id, follower_id)
+    if not is_high_fanout(following_id):
+        backfill(follower_id, following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    follower_id, following_id = instance.follower_id, instance.following_id
+    if following_id is None:
+        return
+    # Users stay related while the follow still exists in the other direction.
+    if Follow.objects.filter(follower_id=following_id, following_id=follower_id).exists():
+        return
+    FeedItem.objects.filter(
+        Q(recipient_id=follower_id, note__owner_id=following_id)
+        | Q(recipient_id=following_id, note__owner_id=follower_id)
+    ).delete()
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from notes.feed import rebuild_all
+from notes.models import FeedItem
+
+
+class Command(BaseCommand):
+    help = "Rebuild every user's materialized notes feed from follows and public notes."
+
+    def handle(self, *args, **options):
+        rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt feeds: {FeedItem.objects.count()} items."))
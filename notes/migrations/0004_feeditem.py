@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_feeds(apps, schema_editor):
+    Note = apps.get_model('notes', 'Note')
+    Follow = apps.get_model('follows', 'Follow')
+    FeedItem = apps.get_model('notes', 'FeedItem')
+    for note in Note.objects.filter(is_public=True).iterator():
+        recipients = set(Follow.objects.filter(follower_id=note.owner_id).values_list('following_id', flat=True))
+        recipients.update(Follow.objects.filter(following_id=note.owner_id).values_list('follower_id', flat=True))
+        recipients.discard(None)
+        FeedItem.objects.bulk_create(
+            [FeedItem(recipient_id=r, note_id=note.id, created_at=note.created_at) for r in recipients],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_is_public'),
+        ('follows', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('note', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_items', to='notes.note')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_items', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['recipient', '-created_at'], name='feed_recipient_created_idx')],
+                'unique_together': {('recipient', 'note')},
+            },
+        ),
+        migrations.RunPython(populate_feeds, migrations.RunPython.noop),
+    ]
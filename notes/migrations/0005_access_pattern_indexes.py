@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0004_feeditem'),
+        ('tags', '0003_alter_tag_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='note_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['is_public', '-created_at', '-id'], name='note_public_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['owner', '-created_at'], name='note_public_owner_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:34
+
+from django.db import migrations, models
+
+from taskhive.counters import recount
+
+
+def count_likes_and_comments(apps, schema_editor):
+    Note = apps.get_model('notes', 'Note')
+    Note.objects.update(
+        like_count=recount(apps.get_model('likes', 'Like'), 'note'),
+        comment_count=recount(apps.get_model('comments', 'Comment'), 'note'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0005_access_pattern_indexes'),
+        ('likes', '0001_initial'),
+        ('comments', '0002_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_likes_and_comments, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,31 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from tags.models import Tag  # Import Tag model
+from taskhive.counters import CounterFieldsModel
 
 
-class Note(models.Model):
+class NoteQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        The user's own notes plus everyone's public ones.
+
+        `is_public__in=[True]` rather than `is_public=True`: Django renders
+        the latter as a bare `WHERE is_public`, which SQLite cannot match
+        against an index inside an OR, so the whole table would be scanned.
+        As an equality each branch seeks its own index.
+        """
+        return self.filter(Q(owner=user) | Q(is_public__in=[True]))
+
+    def for_listing(self):
+        """
+        Load everything NoteSerializer reads in a fixed number of queries:
+        the owner is joined and tags are prefetched in one batch.
+        """
+        return self.select_related('owner').prefetch_related('tags')
+
+
+class Note(CounterFieldsModel):
     """Note model stores study-related notes created by users."""
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notes')
     title = models.CharField(max_length=255)
@@ -12,6 +34,48 @@ class Note(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     tags = models.ManyToManyField(Tag, related_name='notes', blank=True)  # Tag relationship
     is_public = models.BooleanField(default=False)
+    # Maintained by Like and Comment saves and deletes; see taskhive/counters.py
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('like_count', 'comment_count')
+
+    objects = NoteQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Own notes, newest first (notes list, dashboard)
+            models.Index(fields=['owner', '-created_at', '-id'], name='note_owner_created_idx'),
+            # Public notes, newest first (notes list)
+            models.Index(fields=['is_public', '-created_at', '-id'], name='note_public_created_idx'),
+            # Public notes by author (feed pulls from high-fanout authors);
+            # partial so private notes cost nothing
+            models.Index(
+                fields=['owner', '-created_at'],
+                condition=models.Q(is_public=True),
+                name='note_public_owner_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class FeedItem(models.Model):
+    """
+    A note delivered to one user's materialized feed. Rows are written when
+    a public note is published and when follows change (see notes/feed.py),
+    so reading a feed is a range scan on (recipient, created_at).
+    """
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feed_items')
+    note = models.ForeignKey(Note, on_delete=models.CASCADE, related_name='feed_items')
+    created_at = models.DateTimeField()  # Copied from the note so the feed sorts on this table alone
+
+    class Meta:
+        unique_together = ('recipient', 'note')
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='feed_recipient_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.note} for {self.recipient}"
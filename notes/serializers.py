@@ -9,15 +9,26 @@ class NoteSerializer(serializers.ModelSerializer):
         slug_field='name',
         queryset=Tag.objects.all()
     )
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Note
         fields = '__all__'
 
-    def get_like_count(self, obj):
-        return obj.likes.count()
 
-    def get_comment_count(self, obj):
-        return obj.comments.count()
\ No newline at end of file
+class NoteImportSerializer(serializers.ModelSerializer):
+    """
+    One imported note. Tags are plain names, resolved and created in bulk
+    by the importer instead of looked up per row.
+    """
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=Tag._meta.get_field('name').max_length),
+        required=False,
+        default=list,
+    )
+
+    class Meta:
+        model = Note
+        fields = ['title', 'content', 'is_public', 'tags']
+
@@ -1,3 +1,225 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from comments.models import Comment
+from follows.models import Follow
+from likes.models import Like
+from tags.models import Tag
+from taskhive.testing import QueryBudgetAssertions, QueryPlanAssertions
+from .models import FeedItem, Note
+
+
+class NoteListQueryCountTests(QueryBudgetAssertions, TestCase):
+    """The notes list and feed must not issue per-note queries."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader')
+        self.author = User.objects.create_user(username='author')
+        self.fan = User.objects.create_user(username='fan')
+        Follow.objects.create(follower=self.user, following=self.author)
+        self.tag = Tag.objects.create(owner=self.author, name='study')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_notes(self, count):
+        for i in range(count):
+            note = Note.objects.create(
+                owner=self.author, title=f'Note {i}', content='...', is_public=True
+            )
+            note.tags.add(self.tag)
+            Like.objects.create(note=note, user=self.fan)
+            Comment.objects.create(note=note, commenter=self.fan, content='Nice')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        self.add_notes(2)
+        few, _ = self.count_queries('/api/notes/')
+        self.add_notes(8)
+        many, response = self.count_queries('/api/notes/')
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_feed_query_count_is_constant(self):
+        self.add_notes(2)
+        few, _ = self.count_queries('/api/notes/feed/')
+        self.add_notes(8)
+        many, _ = self.count_queries('/api/notes/feed/')
+        self.assertEqual(few, many)
+
+    def test_list_and_feed_stay_within_budget(self):
+        self.add_notes(5)
+        self.assertWithinQueryBudget('/api/notes/')
+        self.assertWithinQueryBudget('/api/notes/?q=note')
+        self.assertWithinQueryBudget('/api/notes/feed/')
+
+    def test_annotated_counts_match(self):
+        self.add_notes(1)
+        _, response = self.count_queries('/api/notes/')
+        note = response.data['results'][0]
+        self.assertEqual(note['like_count'], 1)
+        self.assertEqual(note['comment_count'], 1)
+        self.assertEqual(note['tags'], ['study'])
+
+
+class NoteCounterTests(TestCase):
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author')
+        self.fan = User.objects.create_user(username='fan')
+        self.note = Note.objects.create(owner=self.author, title='Note', content='x', is_public=True)
+
+    def counts(self):
+        self.note.refresh_from_db()
+        return self.note.like_count, self.note.comment_count
+
+    def test_creates_and_deletes_adjust_counts(self):
+        like = Like.objects.create(note=self.note, user=self.fan)
+        Comment.objects.create(note=self.note, commenter=self.fan, content='One')
+        Comment.objects.create(note=self.note, commenter=self.author, content='Two')
+        self.assertEqual(self.counts(), (1, 2))
+
+        like.delete()
+        Comment.objects.filter(commenter=self.fan).delete()
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_editing_counted_rows_does_not_count_again(self):
+        comment = Comment.objects.create(note=self.note, commenter=self.fan, content='One')
+        comment.content = 'Edited'
+        comment.save()
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_saving_a_stale_note_keeps_counts(self):
+        stale = Note.objects.get(pk=self.note.pk)
+        Like.objects.create(note=self.note, user=self.fan)
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertEqual(self.note.title, 'Renamed')
+
+    def test_single_statement_like_and_unlike(self):
+        self.assertTrue(Like.objects.like(self.note.pk, self.fan))
+        self.assertFalse(Like.objects.like(self.note.pk, self.fan))
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertTrue(Like.objects.unlike(self.note.pk, self.fan))
+        self.assertFalse(Like.objects.unlike(self.note.pk, self.fan))
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_counts_never_go_negative(self):
+        like = Like.objects.create(note=self.note, user=self.fan)
+        Note.objects.filter(pk=self.note.pk).update(like_count=0)
+        like.delete()
+        self.assertEqual(self.counts(), (0, 0))
+
+
+class MaterializedFeedTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader')
+        self.author = User.objects.create_user(username='author')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def feed_titles(self):
+        response = self.client.get('/api/notes/feed/')
+        return [note['title'] for note in response.data['results']]
+
+    def test_published_note_reaches_followers(self):
+        Follow.objects.create(follower=self.user, following=self.author)
+        Note.objects.create(owner=self.author, title='Public', content='...', is_public=True)
+        Note.objects.create(owner=self.author, title='Private', content='...')
+        self.assertEqual(self.feed_titles(), ['Public'])
+
+    def test_follow_backfills_and_unfollow_trims(self):
+        Note.objects.create(owner=self.author, title='Earlier', content='...', is_public=True)
+        follow = Follow.objects.create(follower=self.user, following=self.author)
+        self.assertEqual(self.feed_titles(), ['Earlier'])
+        follow.delete()
+        self.assertEqual(self.feed_titles(), [])
+
+    def test_followers_notes_reach_the_followed_user(self):
+        Follow.objects.create(follower=self.author, following=self.user)
+        Note.objects.create(owner=self.author, title='From a follower', content='...', is_public=True)
+        self.assertEqual(self.feed_titles(), ['From a follower'])
+
+    def test_unpublishing_removes_note_from_feeds(self):
+        Follow.objects.create(follower=self.user, following=self.author)
+        note = Note.objects.create(owner=self.author, title='Public', content='...', is_public=True)
+        note.is_public = False
+        note.save()
+        self.assertEqual(self.feed_titles(), [])
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_high_fanout_notes_are_merged_on_read(self):
+        Follow.objects.create(follower=self.user, following=self.author)
+        Note.objects.create(owner=self.author, title='Popular', content='...', is_public=True)
+        self.assertFalse(FeedItem.objects.filter(recipient=self.user).exists())
+        self.assertEqual(self.feed_titles(), ['Popular'])
+
+
+class NoteQueryPlanTests(QueryPlanAssertions, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader')
+        author = User.objects.create_user(username='author')
+        Follow.objects.create(follower=self.user, following=author)
+        self.note = Note.objects.create(owner=self.user, title='Mine', content='x')
+        Note.objects.create(owner=author, title='Theirs', content='y', is_public=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        self.assertNoFullScans('/api/notes/')
+
+    def test_later_page(self):
+        first = self.client.get('/api/notes/?page_size=1').data
+        self.assertNoFullScans(first['next'])
+
+    def test_feed(self):
+        self.assertNoFullScans('/api/notes/feed/')
+
+    def test_detail(self):
+        self.assertNoFullScans(f'/api/notes/{self.note.pk}/')
+
+
+class NoteConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader')
+        self.fan = User.objects.create_user(username='fan')
+        Follow.objects.create(follower=self.fan, following=self.user)
+        self.note = Note.objects.create(owner=self.user, title='Mine', content='x', is_public=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_notes_are_not_modified(self):
+        for url in ('/api/notes/', f'/api/notes/{self.note.pk}/', '/api/notes/?q=mine'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304, url)
+
+    def test_likes_and_comments_change_the_etag(self):
+        urls = ('/api/notes/', f'/api/notes/{self.note.pk}/')
+        for make in (
+            lambda: Like.objects.create(note=self.note, user=self.fan),
+            lambda: Comment.objects.create(note=self.note, commenter=self.fan, content='Nice'),
+        ):
+            etags = [self.client.get(url)['ETag'] for url in urls]
+            make()
+            for url, etag in zip(urls, etags):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200, url)
+
+    def test_feed(self):
+        fan = APIClient()
+        fan.force_authenticate(self.fan)
+        response = fan.get('/api/notes/feed/')
+        self.assertEqual([note['title'] for note in response.data['results']], ['Mine'])
+        self.assertEqual(fan.get('/api/notes/feed/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        Note.objects.create(owner=self.user, title='Newer', content='y', is_public=True)
+        self.assertEqual(fan.get('/api/notes/feed/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
@@ -1,58 +1,71 @@
-from rest_framework import generics, permissions, filters
+from functools import cached_property
+
+from rest_framework import generics, permissions
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Note
 from .serializers import NoteSerializer
 from .permissions import IsOwnerOrReadOnly
-from django.db.models import Q
 
 # views_feed.py or in views.py
-from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import Note
-from follows.models import Follow
-from .serializers import NoteSerializer
+from .feed import feed_for
+from taskhive.conditional import ConditionalGetMixin
+from taskhive.pagination import KeysetPagination
+from search.filters import FullTextSearchFilter
 
 
-class FeedNotesView(APIView):
+class ConditionalNoteMixin(ConditionalGetMixin):
     """
-    Get public notes from users the current user follows or is followed by.
+    Likes and comments change a note's counter columns without touching
+    updated_at. The validators read the page's real rows, which a 200
+    then serializes without querying them again.
     """
-    permission_classes = [IsAuthenticated]
+    validator_fields = ('like_count', 'comment_count')
 
-    def get(self, request):
-        user = request.user
 
-        following_ids = Follow.objects.filter(follower=user).values_list('following_id', flat=True)
-        follower_ids = Follow.objects.filter(following=user).values_list('follower_id', flat=True)
-        related_user_ids = set(following_ids).union(set(follower_ids))
+class FeedNotesView(ConditionalNoteMixin, generics.ListAPIView):
+    """
+    Get public notes from users the current user follows or is followed by.
+    Reads the materialized feed built in notes/feed.py.
+    """
+    serializer_class = NoteSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = []
+    query_budget = {'GET': 4}  # auth, high-fanout follows, notes, tags
+    throttle_scope = 'feed'
 
-        public_notes = Note.objects.filter(owner__id__in=related_user_ids, is_public=True).order_by('-created_at')
+    @cached_property
+    def feed(self):
+        return feed_for(self.request.user)
 
-        serializer = NoteSerializer(public_notes, many=True, context={'request': request})
-        return Response(serializer.data)
+    def get_queryset(self):
+        return self.feed.for_listing()
 
 
-class NoteListCreateView(generics.ListCreateAPIView):
-    """List all notes or create a new note. Filter and search by title and tag."""
+class NoteListCreateView(ConditionalNoteMixin, generics.ListCreateAPIView):
+    """List all notes or create a new note. Filter by tag, full-text search with ?q=."""
     serializer_class = NoteSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
-    search_fields = ['title']
+    pagination_class = KeysetPagination
+    filter_backends = [FullTextSearchFilter, DjangoFilterBackend]
+    search_index = 'note'
+    search_include_public = True
     filterset_fields = ['tags']
+    query_budget = {'GET': 3}  # auth, notes, tags
 
     def get_queryset(self):
         user = self.request.user
-        return Note.objects.filter(Q(owner=user) | Q(is_public=True)).distinct()
+        return Note.objects.visible_to(user).for_listing()
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class NoteDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NoteDetailView(ConditionalNoteMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a note. Only the owner can modify it."""
     serializer_class = NoteSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
 
     def get_queryset(self):
-        return Note.objects.filter(owner=self.request.user)
\ No newline at end of file
+        return Note.objects.filter(owner=self.request.user).for_listing()
@@ -1,7 +1,6 @@
 from django.contrib import admin
 
-# Register your models here.
+from taskhive.media import CloudinaryModelAdmin
 from .models import Profile
 
-# Register your models here.
-admin.site.register(Profile)
\ No newline at end of file
+admin.site.register(Profile, CloudinaryModelAdmin)
@@ -0,0 +1,141 @@
+"""
+Background pipeline for profile images.
+
+An uploaded image is written to local spool storage, the profile is
+marked pending and a profiles.push_image job is queued, so the request
+returns without waiting for the image store (Cloudinary in production).
+The worker pushes the spooled file: the store saves the original and the
+thumbnail sizes in PROFILE_IMAGE_SIZES once, and the profile records
+their URLs in image_variants.
+
+The spool has to be readable by the worker, i.e. on the same machine or
+a shared volume. A failed push is retried by the job queue up to
+PROFILE_IMAGE_UPLOAD_ATTEMPTS times; after that the profile is marked
+failed and the spooled file kept.
+
+The store is chosen with PROFILE_IMAGE_STORE; FileSystemImageStore keeps
+everything under MEDIA_ROOT and stands in for Cloudinary in development
+and tests.
+"""
+import io
+import logging
+import os
+import uuid
+
+import cloudinary.uploader
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.queue import enqueue
+from taskhive.media import configure_cloudinary
+
+logger = logging.getLogger(__name__)
+
+
+def spool_storage():
+    return FileSystemStorage(location=settings.PROFILE_IMAGE_SPOOL_ROOT)
+
+
+def get_store():
+    return import_string(settings.PROFILE_IMAGE_STORE)()
+
+
+class FileSystemImageStore:
+    """Originals and Pillow-made thumbnails under MEDIA_ROOT/profile-images/."""
+
+    def __init__(self):
+        self.storage = FileSystemStorage(
+            location=os.path.join(settings.MEDIA_ROOT, 'profile-images'),
+            base_url=f'{settings.MEDIA_URL}profile-images/',
+        )
+
+    def save(self, name, content):
+        # Pillow is only needed by the worker; web processes skip its import.
+        from PIL import Image, ImageOps
+
+        stem, ext = os.path.splitext(name)
+        variants = {'original': self.storage.url(self.storage.save(name, content))}
+        content.seek(0)
+        with Image.open(content) as image:
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            for variant, size in settings.PROFILE_IMAGE_SIZES.items():
+                buffer = io.BytesIO()
+                ImageOps.fit(image, (size, size)).save(buffer, 'JPEG', quality=85)
+                saved = self.storage.save(f'{stem}-{variant}.jpg', ContentFile(buffer.getvalue()))
+                variants[variant] = self.storage.url(saved)
+        return variants
+
+
+class CloudinaryImageStore:
+    """
+    One upload per image; the thumbnails are eager transformations, so
+    Cloudinary makes them once at upload instead of on first view.
+    """
+
+    def save(self, name, content):
+        configure_cloudinary()
+        sizes = list(settings.PROFILE_IMAGE_SIZES.items())
+        result = cloudinary.uploader.upload(
+            content,
+            public_id=f'profiles/{os.path.splitext(name)[0]}',
+            resource_type='image',
+            eager=[{'width': size, 'height': size, 'crop': 'fill', 'gravity': 'face'} for _, size in sizes],
+        )
+        variants = {'original': result['secure_url']}
+        for (variant, _), eager in zip(sizes, result.get('eager', [])):
+            variants[variant] = eager['secure_url']
+        return variants
+
+
+def accept(profile, upload):
+    """
+    Spool `upload` for `profile`, mark it pending and queue the push. Call
+    in a transaction, so the job and the pending profile commit together.
+    """
+    spool = spool_storage()
+    ext = os.path.splitext(upload.name)[1].lower()
+    name = spool.save(f'{profile.pk}-{uuid.uuid4().hex}{ext}', upload)
+    replaced = profile.image_spool
+    profile.image_spool = name
+    profile.image_status = 'pending'
+    # Profile.save() leaves these fields out unless asked for them.
+    profile.save(update_fields=['image_spool', 'image_status', 'updated_at'])
+    enqueue('profiles.push_image', {'profile_id': profile.pk, 'spool_name': name})
+    if replaced:
+        transaction.on_commit(lambda: spool.delete(replaced))
+
+
+def push(profile_id, spool_name):
+    """
+    Save a spooled image to the store and point the profile at it. Does
+    nothing to a profile that has since had another image uploaded.
+    Errors from the store propagate, for the job queue to retry.
+    """
+    from .models import Profile
+
+    spool = spool_storage()
+    try:
+        with spool.open(spool_name, 'rb') as content:
+            variants = get_store().save(os.path.basename(spool_name), content)
+    except FileNotFoundError:
+        # Replaced by a newer upload, or already pushed.
+        logger.info("Spooled profile image %s is gone", spool_name)
+        return
+    Profile.objects.filter(pk=profile_id, image_spool=spool_name).update(
+        image_status='ready', image_variants=variants, image_spool='', updated_at=timezone.now(),
+    )
+    spool.delete(spool_name)
+
+
+def push_failed(profile_id, spool_name):
+    """Out of attempts. The spooled file is kept, for `run_worker --requeue-failed`."""
+    from .models import Profile
+
+    # updated_at moves the profile's ETag, so revalidating clients see the failure.
+    Profile.objects.filter(pk=profile_id, image_spool=spool_name).update(
+        image_status='failed', updated_at=timezone.now(),
+    )
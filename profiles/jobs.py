@@ -0,0 +1,13 @@
+from django.conf import settings
+
+from jobs.queue import job
+from . import images
+
+
+def _push_failed(payload):
+    images.push_failed(payload['profile_id'], payload['spool_name'])
+
+
+@job('profiles.push_image', max_attempts=settings.PROFILE_IMAGE_UPLOAD_ATTEMPTS, on_failure=_push_failed)
+def push_image(payload):
+    images.push(payload['profile_id'], payload['spool_name'])
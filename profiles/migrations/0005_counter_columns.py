@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:34
+
+from django.db import migrations, models
+
+from taskhive.counters import recount
+
+
+def count_follows(apps, schema_editor):
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = apps.get_model('follows', 'Follow')
+    Profile.objects.update(
+        followers_count=recount(Follow, 'following', outer_ref='user'),
+        following_count=recount(Follow, 'follower', outer_ref='user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_access_pattern_indexes'),
+        ('follows', '0002_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+    ]
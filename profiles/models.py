@@ -1,20 +1,73 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Value
 from django.contrib.auth.models import User
 from cloudinary.models import CloudinaryField
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from follows.models import Follow
+from taskhive.counters import CounterFieldsModel
+from taskhive.media import configure_cloudinary
 
 
-class Profile(models.Model):
+class ProfileQuerySet(models.QuerySet):
+    def for_listing(self, viewer):
+        """
+        Load everything ProfileSerializer reads in one query: the user is
+        joined and is_following comes from an EXISTS on the viewer's follows.
+        """
+        if viewer.is_authenticated:
+            is_following = Exists(Follow.objects.filter(following=OuterRef('user'), follower=viewer))
+        else:
+            is_following = Value(False)
+        return self.select_related('user').annotate(is_following=is_following)
+
+
+class Profile(CounterFieldsModel):
+    IMAGE_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True)
+    # Images uploaded before profiles/images.py; new ones go to image_variants.
     image = CloudinaryField('image', blank=True, null=True)
+    # State of the last upload, the spooled file waiting to be pushed, and
+    # the pushed image's URLs by size ('original' plus PROFILE_IMAGE_SIZES).
+    image_status = models.CharField(max_length=10, choices=IMAGE_STATUS_CHOICES, blank=True, editable=False)
+    image_spool = models.CharField(max_length=255, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)  # Automatically set on create
     updated_at = models.DateTimeField(auto_now=True)      # Automatically updated on save
+    # Maintained by Follow saves and deletes; see taskhive/counters.py
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ('followers_count', 'following_count')
+    # Written by profiles/images.py only; a profile loaded before the
+    # worker pushed its image must not put the old upload back.
+    excluded_fields = ('image_status', 'image_spool', 'image_variants')
+
+    objects = ProfileQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Profile list pages, newest first
+            models.Index(fields=['-created_at', '-id'], name='profile_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s profile"
 
+    def image_url(self, variant='original'):
+        """URL of the current image at one of the sizes, falling back to the original."""
+        url = self.image_variants.get(variant) or self.image_variants.get('original')
+        if url is None and self.image:
+            configure_cloudinary()
+            url = self.image.url
+        return url
+
 
 # Signal to create a profile when a new user is created
 @receiver(post_save, sender=User)
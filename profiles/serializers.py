@@ -1,30 +1,78 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
+from . import images
 from .models import Profile
 from django.contrib.auth.models import User
 
 
+def image_url(profile, variant, request=None):
+    """Absolute URL of the profile's image at `variant` size, or None."""
+    url = profile.image_url(variant)
+    if url and request is not None:
+        url = request.build_absolute_uri(url)
+    return url
+
+
+class ProfileImageField(serializers.ImageField):
+    """
+    Takes an image upload; reads back as the absolute URL of the profile's
+    current image at `variant` size.
+    """
+
+    def __init__(self, variant='original', **kwargs):
+        self.variant = variant
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, profile):
+        return image_url(profile, self.variant, self.context.get('request'))
+
+    def to_internal_value(self, data):
+        upload = super().to_internal_value(data)
+        limit = settings.PROFILE_IMAGE_MAX_BYTES
+        if upload.size > limit:
+            raise serializers.ValidationError(f"Images must be at most {limit // (1024 * 1024)} MB.")
+        return upload
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
+    image = ProfileImageField(required=False)
+    image_thumbnails = serializers.SerializerMethodField()
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
     is_following = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
         fields = [
-            'id', 'username', 'bio', 'image',
+            'id', 'username', 'bio', 'image', 'image_status', 'image_thumbnails',
             'created_at', 'updated_at',
             'followers_count', 'following_count','is_following',  # ✅ add this
         ]
 
-    def get_followers_count(self, obj):
-        return obj.user.followers.count()
-
-    def get_following_count(self, obj):
-        return obj.user.following.count()
-    
+    # Annotated by Profile.objects.for_listing(); queried for profiles
+    # loaded some other way.
     def get_is_following(self, obj):
+        if hasattr(obj, 'is_following'):
+            return obj.is_following
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.user.followers.filter(follower=request.user).exists()
         return False
+
+    def get_image_thumbnails(self, obj):
+        request = self.context.get('request')
+        return {variant: image_url(obj, variant, request) for variant in settings.PROFILE_IMAGE_SIZES}
+
+    def update(self, instance, validated_data):
+        # Spooled here and pushed to the image store by the job worker; the
+        # job and the pending profile are committed together.
+        upload = validated_data.pop('image', None)
+        with transaction.atomic():
+            if upload is not None:
+                images.accept(instance, upload)
+            return super().update(instance, validated_data)
@@ -1,3 +1,274 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import cloudinary
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from follows.models import Follow
+from jobs.queue import Worker, requeue_failed
+from . import images
+from .models import Profile
+from .serializers import ProfileSerializer
+from taskhive.media import configure_cloudinary
+from taskhive.testing import QueryBudgetAssertions, QueryPlanAssertions
+
+
+class ProfileQueryCountTests(QueryBudgetAssertions, TestCase):
+    """Profile endpoints must not query per profile for counts or is_following."""
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def add_users(self, count):
+        for _ in range(count):
+            user = User.objects.create_user(username=f'user{User.objects.count()}')
+            Follow.objects.create(follower=self.viewer, following=user)
+            Follow.objects.create(follower=user, following=self.viewer)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        self.add_users(2)
+        few, _ = self.count_queries('/api/profiles/')
+        self.add_users(8)
+        many, response = self.count_queries('/api/profiles/')
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 1)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_list_stays_within_budget(self):
+        self.add_users(5)
+        self.assertWithinQueryBudget('/api/profiles/')
+
+    def test_counts_and_is_following(self):
+        self.add_users(1)
+        other = User.objects.create_user(username='stranger')
+        Follow.objects.create(follower=other, following=self.viewer)
+        _, response = self.count_queries('/api/profiles/me/')
+        self.assertEqual(response.data['followers_count'], 2)
+        self.assertEqual(response.data['following_count'], 1)
+
+        _, response = self.count_queries('/api/profiles/username/user1/')
+        self.assertEqual(response.data['followers_count'], 1)
+        self.assertEqual(response.data['following_count'], 1)
+        self.assertTrue(response.data['is_following'])
+
+        _, response = self.count_queries('/api/profiles/username/stranger/')
+        self.assertFalse(response.data['is_following'])
+
+    def test_detail_views_use_one_query(self):
+        self.add_users(3)
+        profile_id = self.viewer.profile.id
+        for url in ('/api/profiles/me/', f'/api/profiles/{profile_id}/', '/api/profiles/username/viewer/'):
+            queries, _ = self.count_queries(url)
+            self.assertEqual(queries, 1, url)
+
+    def test_unchanged_profile_is_not_modified(self):
+        self.add_users(1)
+        for url in ('/api/profiles/me/', '/api/profiles/', '/api/profiles/username/user1/'):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_follows_change_the_etag(self):
+        self.add_users(1)
+        etag = self.client.get('/api/profiles/me/')['ETag']
+        Follow.objects.create(follower=User.objects.create_user(username='new fan'), following=self.viewer)
+        response = self.client.get('/api/profiles/me/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['followers_count'], 2)
+
+    def test_follow_counters(self):
+        other = User.objects.create_user(username='other')
+        follow = Follow.objects.create(follower=self.viewer, following=other)
+        self.assertEqual(self.counts(self.viewer), (0, 1))
+        self.assertEqual(self.counts(other), (1, 0))
+        follow.delete()
+        self.assertEqual(self.counts(self.viewer), (0, 0))
+        self.assertEqual(self.counts(other), (0, 0))
+
+    def test_deleting_a_user_updates_the_people_they_followed(self):
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(follower=other, following=self.viewer)
+        other.delete()
+        self.assertEqual(self.counts(self.viewer), (0, 0))
+
+    def test_profile_update_keeps_counts(self):
+        self.add_users(2)
+        self.client.put('/api/profiles/me/', {'bio': 'Hello'}, format='multipart')
+        self.assertEqual(self.counts(self.viewer), (2, 2))
+
+    def counts(self, user):
+        profile = Profile.objects.get(user=user)
+        return profile.followers_count, profile.following_count
+
+    def test_update_own_profile(self):
+        response = self.client.put('/api/profiles/me/', {'bio': 'Hello'}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['bio'], 'Hello')
+
+
+class ProfileQueryPlanTests(QueryPlanAssertions, TestCase):
+
+    def setUp(self):
+        viewer = User.objects.create_user(username='viewer')
+        for name in ('ada', 'bob'):
+            Follow.objects.create(follower=viewer, following=User.objects.create_user(username=name))
+        self.client = APIClient()
+        self.client.force_authenticate(viewer)
+
+    def test_list(self):
+        self.assertNoFullScans('/api/profiles/')
+
+    def test_own_profile(self):
+        self.assertNoFullScans('/api/profiles/me/')
+
+    def test_by_username(self):
+        self.assertNoFullScans('/api/profiles/username/ada/')
+
+
+def image_upload(name='me.png', size=(300, 200)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ProfileImageTests(TestCase):
+    """Uploads are spooled, acknowledged as pending and pushed by the job worker."""
+
+    def setUp(self):
+        media, spool = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        self.addCleanup(shutil.rmtree, spool)
+        self.enterContext(override_settings(
+            MEDIA_ROOT=media,
+            PROFILE_IMAGE_SPOOL_ROOT=spool,
+            PROFILE_IMAGE_STORE='profiles.images.FileSystemImageStore',
+            JOB_RETRY_DELAY=0,
+        ))
+        self.media, self.spool = media, spool
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, **kwargs):
+        return self.client.put('/api/profiles/me/', {'image': image_upload(**kwargs)}, format='multipart')
+
+    def test_upload_is_pending_until_pushed(self):
+        response = self.upload()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['image_status'], 'pending')
+        self.assertIsNone(response.data['image'])
+        profile = Profile.objects.get(user=self.user)
+        self.assertTrue(os.path.exists(os.path.join(self.spool, profile.image_spool)))
+
+        self.assertEqual(Worker().run_until_empty(), 1)
+        response = self.client.get('/api/profiles/me/')
+        self.assertEqual(response.data['image_status'], 'ready')
+        self.assertTrue(response.data['image'].startswith('http://testserver/media/profile-images/'))
+        self.assertEqual(set(response.data['image_thumbnails']), {'small', 'medium'})
+        self.assertEqual(os.listdir(self.spool), [])
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.image_spool, '')
+        for variant, side in (('small', 64), ('medium', 256)):
+            path = profile.image_variants[variant].replace('/media/', '', 1)
+            with Image.open(os.path.join(self.media, path)) as thumbnail:
+                self.assertEqual(thumbnail.size, (side, side))
+
+    def test_failed_pushes_are_retried_then_kept(self):
+        self.upload()
+        pending = self.client.get('/api/profiles/me/')
+        self.assertEqual(pending.data['image_status'], 'pending')
+        with mock.patch.object(images.FileSystemImageStore, 'save', side_effect=OSError('store down')) as save:
+            with self.assertLogs('jobs.queue', 'WARNING'):
+                Worker().run_until_empty()
+        self.assertEqual(save.call_count, 4)
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.image_status, 'failed')
+        self.assertTrue(profile.image_spool)
+        response = self.client.get('/api/profiles/me/', HTTP_IF_NONE_MATCH=pending['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['image_status'], 'failed')
+
+        requeue_failed()
+        Worker().run_until_empty()
+        profile.refresh_from_db()
+        self.assertEqual(profile.image_status, 'ready')
+        self.assertIn('medium', profile.image_variants)
+
+    def test_a_newer_upload_replaces_a_waiting_one(self):
+        self.upload(name='first.png')
+        first_spool = Profile.objects.get(user=self.user).image_spool
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upload(name='second.png')
+        self.assertFalse(os.path.exists(os.path.join(self.spool, first_spool)))
+        Worker().run_until_empty()
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.image_status, 'ready')
+        self.assertEqual(len(os.listdir(os.path.join(self.media, 'profile-images'))), 3)
+
+    def test_profile_edits_leave_the_image_pipeline_alone(self):
+        self.upload()
+        # Loaded while the image was pending, saved after it was pushed.
+        stale = Profile.objects.get(user=self.user)
+        Worker().run_until_empty()
+        serializer = ProfileSerializer(stale, data={'bio': 'Hello'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual((profile.bio, profile.image_status, profile.image_spool), ('Hello', 'ready', ''))
+        self.assertIn('medium', profile.image_variants)
+
+    @override_settings(CLOUDINARY={'cloud_name': 'lazy-cloud', 'api_key': 'key', 'api_secret': 'secret'})
+    def test_cloudinary_is_configured_when_a_legacy_image_is_first_read(self):
+        configure_cloudinary.cache_clear()
+        self.addCleanup(configure_cloudinary.cache_clear)
+        Profile.objects.filter(user=self.user).update(image='image/upload/v1/legacy.jpg')
+        with mock.patch('cloudinary.config', wraps=cloudinary.config) as config:
+            profile = Profile.objects.get(user=self.user)
+            self.assertEqual(config.call_count, 0)
+            self.assertIn('/lazy-cloud/', profile.image_url('small'))
+            profile.image_url('small')
+        # Building URLs reads the config with config(); only the first use sets it.
+        settings_calls = [call for call in config.call_args_list if call.kwargs]
+        self.assertEqual(settings_calls, [mock.call(cloud_name='lazy-cloud', api_key='key', api_secret='secret')])
+
+    def test_rejects_files_that_are_not_images(self):
+        upload = SimpleUploadedFile('notes.png', b'not an image', content_type='image/png')
+        response = self.client.put('/api/profiles/me/', {'image': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('image', response.data)
+        self.assertEqual(os.listdir(self.spool), [])
+
+    @override_settings(PROFILE_IMAGE_MAX_BYTES=100)
+    def test_rejects_large_images(self):
+        response = self.upload()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('image', response.data)
+
+    def test_follow_lists_show_the_small_thumbnail(self):
+        self.upload()
+        Worker().run_until_empty()
+        fan = User.objects.create_user(username='fan')
+        Follow.objects.create(follower=fan, following=self.user)
+        self.client.force_authenticate(fan)
+        response = self.client.get('/api/follows/fan/following/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['results'][0]['image'].endswith('-small.jpg'))
@@ -1,35 +1,45 @@
 from django.db.models import Count
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 
 from .models import Profile
 from .serializers import ProfileSerializer
 from .permissions import IsOwnerOrReadOnly
-from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
+from taskhive.conditional import ConditionalGetMixin
+from taskhive.pagination import KeysetPagination
 
 
-class ProfileListView(generics.ListAPIView):
+class ConditionalProfileMixin(ConditionalGetMixin):
+    """Follows and username changes alter a profile without touching updated_at."""
+    validator_fields = ('followers_count', 'following_count', 'is_following')
+
+    def get_validator_extras(self, rows):
+        return tuple(profile.user.username for profile in rows)
+
+
+class ProfileListView(ConditionalProfileMixin, generics.ListAPIView):
     """
     List all profiles. Only authenticated users can see.
+    Cursor-paginated on created_at, or on the ?ordering= field.
     """
     queryset = Profile.objects.all().order_by('-created_at')
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
     filter_backends = [filters.OrderingFilter, DjangoFilterBackend]
     ordering_fields = ['created_at', 'updated_at']
+    query_budget = {'GET': 2}  # auth, profiles with counts
 
     def get_queryset(self):
-        return Profile.objects.exclude(user=self.request.user)
+        return Profile.objects.exclude(user=self.request.user).for_listing(self.request.user)
     
     def get_serializer_context(self):
         return {'request': self.request}
 
 
-class ProfileDetailView(generics.RetrieveUpdateAPIView):
+class ProfileDetailView(ConditionalProfileMixin, generics.RetrieveUpdateAPIView):
     """
     GET: View a specific profile by ID.
     PUT: Update the profile (only if you are the owner).
@@ -40,39 +50,45 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
     parser_classes = [MultiPartParser, FormParser]
     lookup_field = 'id'  # e.g., /api/profiles/3/
 
+    def get_queryset(self):
+        return Profile.objects.for_listing(self.request.user)
+
     def get_serializer_context(self):
         return {'request': self.request}  # ✅ Add this
 
 
-class MyProfileView(APIView):
+class MyProfileView(ConditionalProfileMixin, generics.RetrieveUpdateAPIView):
     """
     GET: View your own profile.
     PUT: Update your own profile (bio, image).
     """
+    serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
-    def get(self, request):
-        profile = request.user.profile
-        serializer = ProfileSerializer(profile, context={'request': request})
-        return Response(serializer.data)
+    def get_queryset(self):
+        return Profile.objects.for_listing(self.request.user).filter(user=self.request.user)
+
+    def get_object(self):
+        if self.validated_rows:
+            return self.validated_rows[0]
+        return self.get_queryset().get()
 
-    def put(self, request):
-        profile = request.user.profile
-        serializer = ProfileSerializer(profile, data=request.data, partial=True, context={'request': request})  # ✅ fixed
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=400)
+    def get_validator_rows(self):
+        return list(self.get_queryset()), False, ()
 
+    def put(self, request, *args, **kwargs):
+        return self.partial_update(request, *args, **kwargs)
 
-class ProfileByUsernameView(generics.RetrieveAPIView):
+
+class ProfileByUsernameView(ConditionalProfileMixin, generics.RetrieveAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [permissions.AllowAny]
+    lookup_field = 'user__username'
+    lookup_url_kwarg = 'username'
 
-    def get_object(self):
-        username = self.kwargs['username']
-        return get_object_or_404(Profile, user__username=username)
+    def get_queryset(self):
+        return Profile.objects.for_listing(self.request.user)
 
     def get_serializer_context(self):
         return {'request': self.request}
@@ -0,0 +1,34 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .index import INDEXES, tokenize
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over title and body with ?q=.
+
+    The view names its index with `search_index` and sets
+    `search_include_public` when other users' public rows are visible.
+    The index is joined into the view's queryset, so its visibility rules
+    and other filters still apply, and every match comes back, best first.
+    """
+    search_param = 'q'
+
+    def is_searching(self, request):
+        return bool(tokenize(request.query_params.get(self.search_param)))
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.is_searching(request):
+            return queryset
+        return INDEXES[view.search_index].filter(
+            queryset,
+            request.query_params[self.search_param],
+            owner_id=request.user.pk,
+            include_public=getattr(view, 'search_include_public', False),
+        ).order_by('-search_rank', '-id')
+
+    def get_keyset_ordering(self, request, view):
+        """Tell KeysetPagination to page on relevance while searching."""
+        if self.is_searching(request):
+            return ('-search_rank', '-id')
+        return None
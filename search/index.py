@@ -0,0 +1,167 @@
+"""
+Full-text index for notes and tasks.
+
+Each indexed model has its own table keyed by the object's id:
+
+- SQLite (local/dev): an FTS5 virtual table using the rowid as the object
+  id, ranked with bm25().
+- PostgreSQL: a regular table with a tsvector column behind a GIN index,
+  ranked with ts_rank_cd().
+
+The tables are created by this app's migration, kept in sync by the
+signal handlers in search/signals.py and rebuilt in bulk with
+`manage.py rebuild_search_index`.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from notes.models import Note
+from tasks.models import Task
+
+TERM_RE = re.compile(r'\w+')
+
+
+def tokenize(query):
+    return TERM_RE.findall(query or '')
+
+
+class SQLiteBackend:
+    """FTS5 virtual table; the rowid is the indexed object's id."""
+
+    def upsert(self, cursor, table, rows):
+        cursor.executemany(f"DELETE FROM {table} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {table} (rowid, owner_id, is_public, title, body) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+    def delete(self, cursor, table, pk):
+        cursor.execute(f"DELETE FROM {table} WHERE rowid = %s", [pk])
+
+    def join(self, table, id_column, terms, owner_id, include_public):
+        # Every term is quoted (so user input cannot inject FTS syntax) and
+        # prefix-matched, mirroring the old title__icontains behaviour.
+        # bm25() only works in the query that runs the MATCH, hence a join
+        # rather than a subquery per row.
+        match = ' '.join(f'"{term}"*' for term in terms)
+        visibility = f"{table}.owner_id = %s"
+        if include_public:
+            visibility = f"({visibility} OR {table}.is_public = 1)"
+        rank = (f"-bm25({table}, 10.0, 1.0)", [])
+        where = [f"{table} MATCH %s", f"{table}.rowid = {id_column}", visibility]
+        return rank, where, [match, owner_id]
+
+
+class PostgresBackend:
+    """tsvector column with a GIN index; titles weigh more than bodies."""
+
+    def upsert(self, cursor, table, rows):
+        cursor.executemany(
+            f"INSERT INTO {table} (object_id, owner_id, is_public, document) "
+            "VALUES (%s, %s, %s, setweight(to_tsvector('english', %s), 'A') "
+            "|| setweight(to_tsvector('english', %s), 'B')) "
+            "ON CONFLICT (object_id) DO UPDATE SET owner_id = EXCLUDED.owner_id, "
+            "is_public = EXCLUDED.is_public, document = EXCLUDED.document",
+            rows,
+        )
+
+    def delete(self, cursor, table, pk):
+        cursor.execute(f"DELETE FROM {table} WHERE object_id = %s", [pk])
+
+    def join(self, table, id_column, terms, owner_id, include_public):
+        query = ' & '.join(f'{term}:*' for term in terms)
+        visibility = f"{table}.owner_id = %s"
+        if include_public:
+            visibility = f"({visibility} OR {table}.is_public)"
+        rank = (f"ts_rank_cd({table}.document, to_tsquery('english', %s))", [query])
+        where = [
+            f"{table}.document @@ to_tsquery('english', %s)", f"{table}.object_id = {id_column}", visibility,
+        ]
+        return rank, where, [query, owner_id]
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    return SQLiteBackend()
+
+
+class Index:
+    def __init__(self, name, model, title_field, body_field):
+        self.name = name
+        self.model = model
+        self.title_field = title_field
+        self.body_field = body_field
+        self.table = f'search_{name}'
+
+    def _row(self, obj):
+        return (
+            obj.pk, obj.owner_id, obj.is_public,
+            getattr(obj, self.title_field), getattr(obj, self.body_field),
+        )
+
+    def update(self, obj):
+        self.update_many([obj])
+
+    def update_many(self, objs):
+        """Reindex objects written without signals, e.g. by bulk_create."""
+        rows = [self._row(obj) for obj in objs]
+        if rows:
+            with connection.cursor() as cursor:
+                get_backend().upsert(cursor, self.table, rows)
+
+    def remove(self, pk):
+        with connection.cursor() as cursor:
+            get_backend().delete(cursor, self.table, pk)
+
+    def filter(self, queryset, query, owner_id, include_public=False):
+        """
+        Narrow `queryset` to the rows matching `query`, joining this table
+        in the same SQL, and annotate them with `search_rank` (higher is
+        better). Filters, ordering and pagination applied afterwards run
+        in the database over every match.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return queryset.none()
+        quote = connection.ops.quote_name
+        id_column = f"{quote(self.model._meta.db_table)}.{quote(self.model._meta.pk.column)}"
+        (rank, rank_params), where, params = get_backend().join(
+            self.table, id_column, terms, owner_id, include_public,
+        )
+        # extra(): the index tables have no models to join through.
+        return queryset.extra(tables=[self.table], where=where, params=params).annotate(
+            search_rank=RawSQL(rank, rank_params, output_field=FloatField()),
+        )
+
+    @transaction.atomic
+    def rebuild(self, batch_size=2000):
+        """Reindex every row, streaming the table in batches. Returns the row count."""
+        backend = get_backend()
+        rows = self.model.objects.values_list(
+            'pk', 'owner_id', 'is_public', self.title_field, self.body_field
+        ).iterator(chunk_size=batch_size)
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    backend.upsert(cursor, self.table, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                backend.upsert(cursor, self.table, batch)
+                total += len(batch)
+        return total
+
+
+INDEXES = {
+    'note': Index('note', Note, 'title', 'content'),
+    'task': Index('task', Task, 'title', 'description'),
+}
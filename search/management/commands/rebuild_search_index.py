@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import INDEXES
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for notes and tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('indexes', nargs='*', help=f"Indexes to rebuild: {', '.join(sorted(INDEXES))} (default: all).")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        names = options['indexes'] or sorted(INDEXES)
+        unknown = set(names) - set(INDEXES)
+        if unknown:
+            raise CommandError(f"Unknown index: {', '.join(sorted(unknown))}")
+        for name in names:
+            total = INDEXES[name].rebuild(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {total} {name} rows."))
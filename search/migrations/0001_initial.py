@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# (index table, source table, title column, body column)
+INDEXES = [
+    ('search_note', 'notes_note', 'title', 'content'),
+    ('search_task', 'tasks_task', 'title', 'description'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, source, title, body in INDEXES:
+        if vendor == 'postgresql':
+            schema_editor.execute(
+                f"CREATE TABLE {table} ("
+                "object_id bigint PRIMARY KEY, owner_id bigint NOT NULL, "
+                "is_public boolean NOT NULL, document tsvector NOT NULL)"
+            )
+            schema_editor.execute(f"CREATE INDEX {table}_document_idx ON {table} USING GIN (document)")
+            schema_editor.execute(
+                f"INSERT INTO {table} (object_id, owner_id, is_public, document) "
+                f"SELECT id, owner_id, is_public, "
+                f"setweight(to_tsvector('english', {title}), 'A') "
+                f"|| setweight(to_tsvector('english', {body}), 'B') FROM {source}"
+            )
+        else:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table} USING fts5("
+                "title, body, owner_id UNINDEXED, is_public UNINDEXED, "
+                "tokenize = 'porter unicode61')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table} (rowid, owner_id, is_public, title, body) "
+                f"SELECT id, owner_id, is_public, {title}, {body} FROM {source}"
+            )
+
+
+def drop_indexes(apps, schema_editor):
+    for table, *_ in INDEXES:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0004_feeditem'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
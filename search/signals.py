@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from notes.models import Note
+from tasks.models import Task
+from .index import INDEXES
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_save, sender=Task)
+def index_saved(sender, instance, **kwargs):
+    INDEXES[sender._meta.model_name].update(instance)
+
+
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Task)
+def unindex_deleted(sender, instance, **kwargs):
+    INDEXES[sender._meta.model_name].remove(instance.pk)
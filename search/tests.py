@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from notes.models import Note
+from tasks.models import Task
+
+
+class FullTextSearchTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader')
+        self.other = User.objects.create_user(username='other')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.data['results']]
+
+    def test_notes_match_content_and_rank_titles_higher(self):
+        Note.objects.create(owner=self.user, title='Groceries', content='Buy photosynthesis book')
+        Note.objects.create(owner=self.user, title='Photosynthesis', content='Light reactions')
+        Note.objects.create(owner=self.user, title='Unrelated', content='Nothing here')
+        self.assertEqual(self.search('/api/notes/?q=photosynth'), ['Photosynthesis', 'Groceries'])
+
+    def test_notes_respect_visibility(self):
+        Note.objects.create(owner=self.other, title='Shared biology', content='...', is_public=True)
+        Note.objects.create(owner=self.other, title='Private biology', content='...')
+        self.assertEqual(self.search('/api/notes/?q=biology'), ['Shared biology'])
+
+    def test_tasks_only_match_own_rows(self):
+        Task.objects.create(owner=self.user, title='Revise', description='chemistry chapter')
+        Task.objects.create(owner=self.other, title='Revise', description='chemistry too', is_public=True)
+        self.assertEqual(self.search('/api/tasks/?q=chemistry'), ['Revise'])
+
+    def test_index_follows_updates_and_deletes(self):
+        task = Task.objects.create(owner=self.user, title='Draft essay')
+        task.title = 'Final essay'
+        task.save()
+        self.assertEqual(self.search('/api/tasks/?q=draft'), [])
+        self.assertEqual(self.search('/api/tasks/?q=final'), ['Final essay'])
+        task.delete()
+        self.assertEqual(self.search('/api/tasks/?q=final'), [])
+
+    def test_search_results_paginate(self):
+        for i in range(5):
+            Task.objects.create(owner=self.user, title=f'Reading {i}')
+        titles, url = [], '/api/tasks/?q=reading&page_size=2'
+        while url:
+            response = self.client.get(url)
+            titles.extend(row['title'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(sorted(titles), [f'Reading {i}' for i in range(5)])
+
+    def test_filters_and_pages_see_every_match(self):
+        # The done tasks rank lowest, behind matches the status filter drops.
+        Task.objects.bulk_create(
+            [Task(owner=self.user, title=f'Reading {i}') for i in range(6)]
+            + [Task(owner=self.user, title=f'Done {i}', description='reading', status='done') for i in range(3)]
+        )
+        call_command('rebuild_search_index', stdout=StringIO())
+        titles, url = [], '/api/tasks/?q=reading&status=done&page_size=2'
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            titles.extend(row['title'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(titles, ['Done 2', 'Done 1', 'Done 0'])
+
+    def test_revalidating_a_search(self):
+        Task.objects.create(owner=self.user, title='Reading')
+        etag = self.client.get('/api/tasks/?q=reading')['ETag']
+        self.assertEqual(self.client.get('/api/tasks/?q=reading', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Task.objects.create(owner=self.user, title='More reading')
+        response = self.client.get('/api/tasks/?q=reading', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_query_syntax_is_not_interpreted(self):
+        Task.objects.create(owner=self.user, title='Quotes')
+        self.assertEqual(self.search('/api/tasks/?q="quotes"-*'), ['Quotes'])
+
+    def test_rebuild_command(self):
+        Task.objects.bulk_create([Task(owner=self.user, title='Imported')])
+        self.assertEqual(self.search('/api/tasks/?q=imported'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('/api/tasks/?q=imported'), ['Imported'])
@@ -0,0 +1,83 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class UserPayloadCache:
+    """
+    Cache of per-user response payloads with cheap invalidation.
+
+    Every user has a generation number stored in the cache and baked into
+    the payload keys; invalidate() bumps it, so all of that user's cached
+    payloads are abandoned at once without knowing their keys. Generations
+    start from the clock, so one that is evicted and recreated never
+    revives an old payload.
+
+    Hits and misses are counted in the cache so they are shared by every
+    worker when the cache is.
+    """
+
+    def __init__(self, namespace, timeout):
+        self.namespace = namespace
+        self.timeout = timeout
+
+    def _generation_key(self, user_id):
+        return f'{self.namespace}:gen:{user_id}'
+
+    def _generation(self, user_id):
+        key = self._generation_key(user_id)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), None)
+            generation = cache.get(key)
+        return generation
+
+    def get_or_build(self, user_id, bucket, build):
+        """
+        Return (payload, hit). `bucket` is folded into the key for values
+        that go stale on their own, e.g. today's date for overdue flags.
+        """
+        key = f'{self.namespace}:{user_id}:{self._generation(user_id)}:{bucket}'
+        payload = cache.get(key)
+        if payload is not None:
+            self._count('hits')
+            return payload, True
+        payload = build()
+        cache.set(key, payload, self.timeout)
+        self._count('misses')
+        return payload, False
+
+    def invalidate(self, user_id):
+        key = self._generation_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+    def invalidate_on_commit(self, user_id):
+        """
+        Invalidate once the current transaction commits (at once outside
+        one). Bumping the generation earlier would let a concurrent read
+        cache pre-commit data under the new generation.
+        """
+        transaction.on_commit(lambda: self.invalidate(user_id))
+
+    def _count(self, name):
+        key = f'{self.namespace}:stats:{name}'
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, 1, None)
+
+    def stats(self):
+        counts = cache.get_many([f'{self.namespace}:stats:hits', f'{self.namespace}:stats:misses'])
+        hits = counts.get(f'{self.namespace}:stats:hits', 0)
+        misses = counts.get(f'{self.namespace}:stats:misses', 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 3) if total else None,
+        }
@@ -0,0 +1,63 @@
+"""
+Run a request's independent queries at the same time.
+
+Django's async ORM (aget(), `async for`) cannot do this: every async
+query is handed to the same sync_to_async(thread_sensitive=True) thread,
+so asyncio.gather() over them still runs one query after another on one
+connection. run_concurrently() instead runs each callable on a pooled
+thread with its own database connection, which works the same from sync
+views under WSGI and ASGI workers.
+
+Every pool thread keeps its own persistent connection (CONN_MAX_AGE), so
+a process can hold up to CONCURRENT_QUERY_THREADS extra connections.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.CONCURRENT_QUERY_THREADS, thread_name_prefix='queries')
+    return _executor
+
+
+def _call(func, wrappers):
+    # Re-install the caller's execute wrappers (e.g. QueryRecorder) so
+    # instrumentation still sees the queries run on this thread.
+    try:
+        with ExitStack() as stack:
+            for alias, alias_wrappers in wrappers.items():
+                for wrapper in alias_wrappers:
+                    stack.enter_context(connections[alias].execute_wrapper(wrapper))
+            return func()
+    finally:
+        close_old_connections()
+
+
+def run_concurrently(*funcs):
+    """
+    Call each zero-argument callable and return their results in order.
+    The first runs on the calling thread and the rest on the pool.
+
+    Runs them one after another when CONCURRENT_QUERIES is off and
+    inside a transaction, whose uncommitted rows other connections cannot
+    see (this includes TestCase).
+    """
+    initialized = connections.all(initialized_only=True)
+    if (
+        not settings.CONCURRENT_QUERIES
+        or len(funcs) < 2
+        or any(connection.in_atomic_block for connection in initialized)
+    ):
+        return [func() for func in funcs]
+
+    wrappers = {connection.alias: list(connection.execute_wrappers) for connection in initialized}
+    futures = [_get_executor().submit(_call, func, wrappers) for func in funcs[1:]]
+    first = funcs[0]()
+    return [first, *(future.result() for future in futures)]
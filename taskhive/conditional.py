@@ -0,0 +1,113 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified for GET, answering 304 Not Modified without
+    loading the full representation or serializing it.
+
+    The validators are computed from "validator rows": the same rows the
+    response would contain, loaded without the joins and annotations the
+    serializer needs. For a detail view that is the object; for a paginated
+    collection it is the requested page, so the validators also change
+    when rows are added to or deleted from the page. The ETag hashes:
+
+    - the requesting user and the full path, including the query string
+      and the cursor;
+    - the id and updated_at of every row, plus the row attributes named in
+      `validator_fields` for serialized data that changes without touching
+      updated_at (e.g. counts annotated from other tables);
+    - for collections, whether there are next and previous pages;
+    - get_validator_extras(rows), e.g. dates that make flags go stale.
+
+    Last-Modified is the newest updated_at. Collections send it, but only
+    the ETag is checked for them, because deleting a row does not move the
+    newest timestamp. Responses are marked `private, no-cache`, so browsers
+    revalidate instead of reusing them blindly.
+
+    Views that do not override get_validator_queryset() load their real
+    rows for the validators, so a 200 reuses those rows instead of querying
+    again.
+    """
+    validated_rows = None
+
+    validator_fields = ()
+
+    def get_validator_queryset(self):
+        """
+        Rows backing the response. Override to drop joins and prefetches the
+        validators do not need, and to annotate `validator_fields`.
+        """
+        return self.get_queryset()
+
+    def get_validator_extras(self, rows):
+        return ()
+
+    def get_validator_rows(self):
+        """
+        Return (rows, is_collection, page_state). Views that find their
+        object some other way than a URL lookup override this.
+        """
+        queryset = self.filter_queryset(self.get_validator_queryset())
+
+        lookup_url_kwarg = getattr(self, 'lookup_url_kwarg', None) or getattr(self, 'lookup_field', None)
+        if lookup_url_kwarg in self.kwargs:
+            return list(queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})), False, ()
+
+        paginator = getattr(self, 'paginator', None)
+        if paginator is None:
+            return list(queryset), True, ()
+        rows = paginator.paginate_queryset(queryset, self.request, view=self)
+        return rows, True, (paginator.get_next_link(), paginator.get_previous_link())
+
+    def get_validators(self):
+        """Return (etag, last_modified or None, is_collection)."""
+        rows, is_collection, page_state = self.get_validator_rows()
+        last_modified = max((row.updated_at for row in rows), default=None)
+        parts = (
+            self.request.user.pk,
+            self.request.get_full_path(),
+            [
+                (row.pk, row.updated_at.isoformat(), *(getattr(row, field) for field in self.validator_fields))
+                for row in rows
+            ],
+            page_state,
+            self.get_validator_extras(rows),
+        )
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        if type(self).get_validator_queryset is ConditionalGetMixin.get_validator_queryset:
+            self.validated_rows = rows
+        # HTTP dates have whole seconds
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return quote_etag(digest), timestamp, is_collection
+
+    def paginate_queryset(self, queryset):
+        if self.validated_rows is not None:
+            return self.validated_rows  # The paginator still holds this page's state
+        return super().paginate_queryset(queryset)
+
+    def get_object(self):
+        if self.validated_rows:
+            obj = self.validated_rows[0]
+            self.check_object_permissions(self.request, obj)
+            return obj
+        return super().get_object()
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified, is_collection = self.get_validators()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=None if is_collection else last_modified,
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization', 'Cookie'])
+        return response
@@ -0,0 +1,60 @@
+"""
+Denormalized counter columns, e.g. Note.like_count.
+
+Counters are adjusted with `UPDATE ... SET n = n + 1` in the same
+transaction as the row they count is created or deleted, so concurrent
+writers never lose an increment. Anything that bypasses that path
+(bulk_create, raw SQL, a crash between statements on a backend without
+transactions) can leave them drifting; the reconcile_counters command
+recounts them.
+"""
+from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def adjust(queryset, **deltas):
+    """Add each delta to the named counter on every row of the queryset."""
+    # Clamped at zero so a counter that already drifted low cannot break
+    # the column's non-negative check on delete.
+    return queryset.update(**{
+        field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items()
+    })
+
+
+def recount(related_model, related_field, outer_ref='pk'):
+    """Correlated COUNT(*) of `related_model` rows whose `related_field` is the outer row."""
+    counts = (
+        related_model.objects.filter(**{related_field: OuterRef(outer_ref)})
+        .order_by()
+        .values(related_field)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+class CounterFieldsModel(models.Model):
+    """
+    Model with counter columns listed in `counter_fields`. Saving an
+    existing instance never writes them back: the values loaded with it
+    may be stale by the time it is saved, and writing them would undo
+    increments made in between. Columns in `excluded_fields` are left
+    out the same way: some other writer owns them and saves them itself,
+    with update_fields or an UPDATE.
+    """
+    counter_fields = ()
+    excluded_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None and not self._state.adding:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.name not in self.excluded_fields
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
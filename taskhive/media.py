@@ -0,0 +1,27 @@
+"""
+Cloudinary set-up, deferred from settings to the first use of media.
+
+Processes that never touch an image (most manage.py commands, workers
+running other jobs) never configure Cloudinary, and a missing credential
+only fails the first upload or legacy image URL instead of every boot.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib import admin
+
+
+@lru_cache(maxsize=None)
+def configure_cloudinary():
+    """Apply the CLOUDINARY settings; runs once per process."""
+    import cloudinary
+
+    cloudinary.config(**settings.CLOUDINARY)
+
+
+class CloudinaryModelAdmin(admin.ModelAdmin):
+    """Admin for models with a CloudinaryField, whose widget signs uploads."""
+
+    def get_form(self, request, obj=None, **kwargs):
+        configure_cloudinary()
+        return super().get_form(request, obj, **kwargs)
@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('taskhive.queries')
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    Normalise a parametrised statement so repeats of the same query with
+    different values (the N+1 signature) share one fingerprint.
+    """
+    return IN_LIST_RE.sub('IN (...)', WHITESPACE_RE.sub(' ', sql).strip())
+
+
+def duplicates(statements):
+    """{fingerprint: count} for statements that ran more than once."""
+    counts = Counter(fingerprint(sql) for sql in statements)
+    return {sql: count for sql, count in counts.most_common() if count > 1}
+
+
+def short_hash(sql):
+    return hashlib.md5(sql.encode()).hexdigest()[:8]
+
+
+def query_budget(limit):
+    """
+    Declare the most queries a view may run per request, either as a number
+    or as {method: number} for views whose writes legitimately cost more
+    than their reads. Works on function views and view classes; class-based
+    views can also just set a `query_budget` attribute. Enforced by
+    QueryBudgetAssertions in tests and logged by
+    QueryInstrumentationMiddleware at runtime.
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def get_query_budget(view_func, method):
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        budget = getattr(getattr(view_func, 'view_class', None), 'query_budget', None)
+    if isinstance(budget, dict):
+        budget = budget.get(method)
+    return budget
+
+
+class QueryRecorder:
+    """execute_wrapper that times every statement run on a connection."""
+
+    def __init__(self):
+        self.statements = []
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.statements.append(sql)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count and time the SQL each request runs and report it in response
+    headers:
+
+    - Server-Timing: `db` (time in SQL) and `app` (whole request), which
+      browser dev tools chart per request
+    - X-DB-Queries: number of statements
+    - X-DB-Duplicate-Queries: `<hash>x<count>` for statements repeated with
+      different parameters, worst first; the full SQL goes to the
+      `taskhive.queries` logger
+
+    Always on with DEBUG; otherwise a QUERY_INSTRUMENTATION_SAMPLE_RATE
+    fraction of requests is measured. Requests over their view's
+    query_budget are logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def sample(self):
+        if settings.DEBUG:
+            return True
+        rate = settings.QUERY_INSTRUMENTATION_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if not self.sample():
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        count = len(recorder.statements)
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{count} queries", '
+            f'app;dur={total * 1000:.1f}'
+        )
+        response['X-DB-Queries'] = str(count)
+
+        repeated = duplicates(recorder.statements)
+        if repeated:
+            response['X-DB-Duplicate-Queries'] = ', '.join(
+                f'{short_hash(sql)}x{times}' for sql, times in list(repeated.items())[:5]
+            )
+            for sql, times in repeated.items():
+                logger.debug('%s %s ran %d times: %s', request.path, short_hash(sql), times, sql)
+
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and count > budget:
+            logger.warning('%s ran %d queries, over its budget of %d', request.path, count, budget)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
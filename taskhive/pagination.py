@@ -0,0 +1,157 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a (key, id) pair, newest first by default.
+
+    Each page is fetched with a WHERE on the last row seen instead of an
+    OFFSET, so page 500 costs the same as page 1 and rows inserted while a
+    client is paging never shift items between pages. Cursors are opaque
+    base64 strings; clients follow the `next`/`previous` links.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def get_page_size(self, request):
+        page_size = settings.API_PAGE_SIZE
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        if requested > 0:
+            return min(requested, settings.API_MAX_PAGE_SIZE)
+        return page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Use the ordering a filter backend asks for (relevance while
+        searching) or the view's OrderingFilter choice when it has one, with
+        `id` as the tie-breaker so every position is unique.
+        """
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_keyset_ordering'):
+                ordering = backend().get_keyset_ordering(request, view)
+                if ordering:
+                    return ordering
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    key = ordering[0]
+                    return (key, '-id' if key.startswith('-') else 'id')
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.key_field = self._get_key_field(queryset)
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self._flip(self.ordering) if reverse else self.ordering
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        key = self.ordering[0].lstrip('-')
+        value = getattr(obj, key)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+        payload = json.dumps({'v': [value, obj.pk], 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Return ((key value, id), reverse) or (None, False) for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value, pk = payload['v']
+            value = self.key_field.to_python(value)
+            return (value, int(pk)), bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_key_field(self, queryset):
+        key = self.ordering[0].lstrip('-')
+        if key in queryset.query.annotations:
+            return queryset.query.annotations[key].output_field
+        return queryset.model._meta.get_field(key)
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+    @staticmethod
+    def _after(ordering, position):
+        """Rows that come after `position` in the given ordering."""
+        key, tie_breaker = ordering
+        value, pk = position
+        lookup = 'lt' if key.startswith('-') else 'gt'
+        key, tie_breaker = key.lstrip('-'), tie_breaker.lstrip('-')
+        return Q(**{f'{key}__{lookup}': value}) | Q(**{key: value, f'{tie_breaker}__{lookup}': pk})
+
+
+class OldestFirstPagination(KeysetPagination):
+    """Keyset pagination for threads that read from the oldest item forward."""
+    ordering = ('created_at', 'id')
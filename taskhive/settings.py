@@ -1,6 +1,4 @@
 from pathlib import Path
-from decouple import config
-import cloudinary
 import dj_database_url
 import os
 from dotenv import load_dotenv
@@ -19,6 +17,15 @@ ALLOWED_HOSTS = [
     os.environ.get('HEROKU_APP_HOST', ''),  # e.g., taskhive12-a2ed93813c61.herokuapp.com
 ]
 
+# SETTINGS PROFILE
+# 'full' serves the React app and its dj-rest-auth login and registration.
+# 'api' is for processes that only serve /api/ or run jobs: it leaves out
+# allauth and dj-rest-auth (accounts.views has its own login and
+# registration), their middleware and URLs, for a faster boot.
+SETTINGS_PROFILE = os.environ.get('SETTINGS_PROFILE', 'full')
+if SETTINGS_PROFILE not in ('full', 'api'):
+    raise ValueError(f"SETTINGS_PROFILE must be 'full' or 'api', not {SETTINGS_PROFILE!r}")
+
 # APPLICATIONS
 INSTALLED_APPS = [
     # Django
@@ -40,7 +47,6 @@ INSTALLED_APPS = [
     'allauth.account',
     'allauth.socialaccount',
     'cloudinary',
-    'cloudinary_storage',
     'django_filters',
 
     # Custom apps
@@ -52,6 +58,20 @@ INSTALLED_APPS = [
     'follows',
     'profiles',
     'tags',
+    'search',
+    'jobs',
+]
+
+# Apps and middleware the 'api' profile leaves out.
+FULL_PROFILE_APPS = [
+    'dj_rest_auth',
+    'dj_rest_auth.registration',
+    'allauth',
+    'allauth.account',
+    'allauth.socialaccount',
+]
+FULL_PROFILE_MIDDLEWARE = [
+    'allauth.account.middleware.AccountMiddleware',
 ]
 
 SITE_ID = 1
@@ -59,15 +79,28 @@ SITE_ID = 1
 # REST FRAMEWORK
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
+    # Only views with a throttle_scope are limited; see THROTTLING below.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'taskhive.throttling.UserTokenBucketThrottle',
+        'taskhive.throttling.IPTokenBucketThrottle',
+    ],
+    # Proxies in front of the app whose X-Forwarded-For entries are trusted
+    # for client addresses: Heroku's router adds one.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 1 if 'DYNO' in os.environ else 0)),
 }
 
+# Default and maximum page sizes for taskhive.pagination.KeysetPagination.
+# Clients pick a size within that range with ?page_size=.
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 20))
+API_MAX_PAGE_SIZE = 100
+
 REST_AUTH_REGISTER_SERIALIZERS = {
     'REGISTER_SERIALIZER': 'accounts.serializers.CustomRegisterSerializer',
 }
@@ -77,6 +110,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'taskhive.middleware.QueryInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'allauth.account.middleware.AccountMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,6 +120,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if SETTINGS_PROFILE == 'api':
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in FULL_PROFILE_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in FULL_PROFILE_MIDDLEWARE]
+
 ROOT_URLCONF = 'taskhive.urls'
 
 # TEMPLATES (React build index.html)
@@ -105,6 +143,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'taskhive.wsgi.application'
+ASGI_APPLICATION = 'taskhive.asgi.application'
 
 # DATABASE
 DATABASES = {
@@ -114,6 +153,35 @@ DATABASES = {
     )
 }
 
+# Covering indexes (Index(include=...)) only matter on PostgreSQL; SQLite,
+# the development and test database, builds them without the extra
+# columns and would otherwise warn on every command.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+# CACHE
+# Local memory by default. Set REDIS_URL when running several workers so
+# invalidations (e.g. of cached auth tokens) reach every process.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a token -> user lookup stays cached by CachedTokenAuthentication.
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_CACHE_TIMEOUT', 60))
+
+# Seconds a cached dashboard payload lives; bounds how stale like and
+# comment counts on it can get.
+DASHBOARD_CACHE_TIMEOUT = 300
+
 # PASSWORD VALIDATION
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -138,14 +206,42 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # MEDIA FILES
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# Served by Django only when DEBUG, for the file system image store.
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# PROFILE IMAGES
+# Uploads are spooled here and pushed to PROFILE_IMAGE_STORE by the job
+# worker (see profiles/images.py). FileSystemImageStore keeps them under
+# MEDIA_ROOT instead of sending them to Cloudinary.
+PROFILE_IMAGE_STORE = os.environ.get('PROFILE_IMAGE_STORE', 'profiles.images.CloudinaryImageStore')
+PROFILE_IMAGE_SPOOL_ROOT = os.environ.get('PROFILE_IMAGE_SPOOL_ROOT', str(BASE_DIR / 'spool' / 'profile-images'))
+PROFILE_IMAGE_MAX_BYTES = 5 * 1024 * 1024
+# Square thumbnails made once per upload, by name and side in pixels.
+PROFILE_IMAGE_SIZES = {'small': 64, 'medium': 256}
+# Tries per upload before the profile is marked failed.
+PROFILE_IMAGE_UPLOAD_ATTEMPTS = 4
+
+# JOB QUEUE
+# Jobs claimed per round trip by `manage.py run_worker`, and seconds it
+# sleeps when none is ready.
+JOB_BATCH_SIZE = int(os.environ.get('JOB_BATCH_SIZE', 100))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+# Seconds after which a claimed job whose worker went away is run again.
+JOB_LOCK_TIMEOUT = 600
+# Default tries per job, and the backoff between them: JOB_RETRY_DELAY
+# seconds doubled after each failure, at most JOB_MAX_RETRY_DELAY.
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_DELAY = 5
+JOB_MAX_RETRY_DELAY = 3600
 
 # CLOUDINARY CONFIG
-cloudinary.config(
-    cloud_name=config('CLOUD_NAME'),
-    api_key=config('CLOUDINARY_API_KEY'),
-    api_secret=config('CLOUDINARY_API_SECRET')
-)
+# Applied on first use of an image (see taskhive/media.py), not at boot.
+CLOUDINARY = {
+    'cloud_name': os.environ.get('CLOUD_NAME'),
+    'api_key': os.environ.get('CLOUDINARY_API_KEY'),
+    'api_secret': os.environ.get('CLOUDINARY_API_SECRET'),
+}
 
 # CORS & CSRF SETTINGS
 CORS_ALLOWED_ORIGINS = [
@@ -170,5 +266,59 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 ACCOUNT_EMAIL_VERIFICATION = "none"
 ACCOUNT_EMAIL_REQUIRED = False
 
+# TASKS
+# Most creates + updates + deletes accepted by one /api/tasks/bulk/ request.
+TASK_BULK_MAX_ITEMS = 10000
+# Seconds a cached /api/tasks/stats/ payload lives, and the most days of
+# completions it can be asked for.
+TASK_STATS_CACHE_TIMEOUT = 300
+TASK_STATS_MAX_DAYS = 365
+
+# EXPORT AND IMPORT
+# Rows fetched per round trip while streaming /api/accounts/export/.
+EXPORT_CHUNK_SIZE = 2000
+# Rows validated and inserted per transaction by /api/accounts/import/
+# and the import_tasks command.
+IMPORT_BATCH_SIZE = 1000
+# Row errors kept in an import report; the total is always counted.
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+# FEED
+# Accounts with more followers than this are merged into feeds on read
+# instead of being fanned out on write.
+FEED_FANOUT_LIMIT = int(os.environ.get('FEED_FANOUT_LIMIT', 5000))
+# Number of recent public notes copied into a feed when a follow is added.
+FEED_BACKFILL_LIMIT = 200
+
+# QUERY INSTRUMENTATION
+# Fraction of requests whose SQL is counted and timed into the
+# Server-Timing / X-DB-Queries headers when DEBUG is off (DEBUG measures all).
+QUERY_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('QUERY_INSTRUMENTATION_SAMPLE_RATE', 0.01))
+
+# CONCURRENT QUERIES
+# Let views run independent queries on pooled threads, each with its own
+# database connection (see taskhive/concurrency.py). Off by default
+# because every thread holds a connection open.
+CONCURRENT_QUERIES = os.environ.get('CONCURRENT_QUERIES', '') == 'True'
+CONCURRENT_QUERY_THREADS = int(os.environ.get('CONCURRENT_QUERY_THREADS', 4))
+
+# THROTTLING
+# Token-bucket rates per throttle_scope and kind of client ('user' or
+# 'ip'); see taskhive/throttling.py. 'N/period' allows a burst of N, then
+# one request every period/N. The feed allows for the frontend paging
+# through all of it at once.
+THROTTLE_RATES = {
+    'feed': {'user': '120/min', 'ip': '600/min'},
+    'login': {'ip': '10/min'},
+    'register': {'ip': '20/hour'},
+}
+# Where buckets are kept: taskhive.throttling.LocalBucketStore per process,
+# or taskhive.throttling.DatabaseBucketStore shared by every process.
+THROTTLE_STORE = os.environ.get('THROTTLE_STORE', 'taskhive.throttling.LocalBucketStore')
+# Buckets a process keeps in memory before dropping the full ones, and new
+# database buckets between deletes of the full ones.
+THROTTLE_LOCAL_MAX_KEYS = 10000
+THROTTLE_PRUNE_EVERY = 500
+
 # AUTO FIELD
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,94 @@
+"""
+Test helpers shared by the apps' test suites.
+"""
+import re
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from .middleware import QueryRecorder, duplicates, get_query_budget
+
+# "SCAN notes_note" is a full table scan; "SCAN notes_note USING INDEX ..."
+# walks an index in order and "SEARCH ..." seeks into one.
+SQLITE_FULL_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+POSTGRES_FULL_SCAN_RE = re.compile(r'Seq Scan on (\w+)')
+
+
+def explain(sql, params=()):
+    """Return the query plan for `sql` as a list of lines."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Test tables are tiny, so the planner would rightly prefer a
+            # sequential scan; discourage it to see which indexes are usable.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(sql, params=()):
+    """Tables that the plan for `sql` reads in full."""
+    pattern = POSTGRES_FULL_SCAN_RE if connection.vendor == 'postgresql' else SQLITE_FULL_SCAN_RE
+    return [
+        match.group(1)
+        for line in explain(sql, params)
+        for match in [pattern.search(line.strip())]
+        if match
+    ]
+
+
+class QueryPlanAssertions:
+    """
+    TestCase mixin asserting that the queries behind an endpoint are served
+    from indexes rather than full table scans.
+    """
+
+    def assertNoFullScans(self, path, allow=()):
+        """
+        GET `path` with self.client and EXPLAIN every SELECT it ran. Tables
+        in `allow` may be scanned (e.g. ones that are read in full by design).
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        problems = []
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            scanned = [table for table in full_scans(sql) if table not in allow]
+            if scanned:
+                problems.append(f"{', '.join(scanned)}:\n  {sql}")
+        if problems:
+            self.fail(f"GET {path} scans whole tables:\n" + '\n'.join(problems))
+
+
+class QueryBudgetAssertions:
+    """
+    TestCase mixin checking an endpoint against the query_budget its view
+    declares (see taskhive.middleware.query_budget).
+    """
+
+    def assertWithinQueryBudget(self, path, method='get', data=None, **extra):
+        view = resolve(urlsplit(path).path).func
+        budget = get_query_budget(view, method.upper())
+        if budget is None:
+            self.fail(f"{path} resolves to a view without a {method.upper()} query_budget")
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = getattr(self.client, method)(path, data, **extra)
+        self.assertLess(response.status_code, 400, getattr(response, 'data', response.content))
+
+        count = len(recorder.statements)
+        if count > budget:
+            repeated = '\n'.join(f"  {times}x {sql}" for sql, times in duplicates(recorder.statements).items())
+            self.fail(
+                f"{method.upper()} {path} ran {count} queries, over its budget of {budget}."
+                + (f"\nRepeated statements:\n{repeated}" if repeated else '')
+            )
+        return response
@@ -0,0 +1,202 @@
+"""
+Token-bucket rate limits, as DRF throttles.
+
+A view opts in with a `throttle_scope`; THROTTLE_RATES gives each scope a
+rate per kind of client, 'user' (the authenticated user) and 'ip' (the
+client address, read through NUM_PROXIES). A rate of 'N/period' is a
+bucket of N tokens refilled at N per period: a client can make N
+requests at once and then one every period/N. Views can limit only some
+methods with `throttle_methods`.
+
+A bucket is kept as one number, the time at which it will be full again
+(the GCRA form of a token bucket): taking a token pushes that time out by
+period/N, and the bucket is empty once it is a whole period away. Where
+buckets live is set by THROTTLE_STORE:
+
+- LocalBucketStore keeps them in a dict in each process, so every worker
+  process limits clients on its own, as the local-memory cache would. No
+  I/O, so a check costs microseconds.
+- DatabaseBucketStore keeps them in accounts.ThrottleBucket, shared by
+  every worker and node. A token is taken with one conditional UPDATE, so
+  concurrent requests cannot both take the last one. Rejections are
+  remembered in the process until the bucket has a token again, so a
+  client that keeps hammering costs no queries until then.
+
+Throttles run after authentication and permissions but before the view,
+so a rejected request never reaches the view's own queries.
+"""
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+from accounts.models import ThrottleBucket
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Slack for float rounding, so the Nth of N requests is never refused.
+EPSILON = 1e-6
+
+
+class Rate:
+    """N requests per period seconds; `interval` is the refill time of one token."""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.interval = period / capacity
+
+    def wait(self, full_at, now):
+        """Seconds until a bucket full at `full_at` has a token, or 0."""
+        wait = max(full_at, now) + self.interval - now - self.period
+        return wait if wait > EPSILON else 0.0
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """'10/min' -> Rate(10, 60). The period is s, m, h or d, or a word starting with one."""
+    count, period = rate.split('/')
+    return Rate(int(count), PERIODS[period[0]])
+
+
+class LocalBucketStore:
+    """Buckets of this process, with a lock around each read-modify-write."""
+
+    def __init__(self):
+        self.full_at = {}
+        self.lock = threading.Lock()
+
+    def take(self, key, rate, now):
+        """Take a token from `key`'s bucket. Returns 0, or the seconds to wait."""
+        with self.lock:
+            full_at = self.full_at.get(key, now)
+            wait = rate.wait(full_at, now)
+            if wait:
+                return wait
+            if key not in self.full_at and len(self.full_at) >= settings.THROTTLE_LOCAL_MAX_KEYS:
+                self.prune(now)
+            self.full_at[key] = max(full_at, now) + rate.interval
+            return 0.0
+
+    def prune(self, now):
+        """Forget full buckets; they behave the same as missing ones."""
+        self.full_at = {key: full_at for key, full_at in self.full_at.items() if full_at > now}
+
+    def clear(self):
+        with self.lock:
+            self.full_at.clear()
+
+
+class DatabaseBucketStore:
+    """
+    Buckets in the ThrottleBucket table. Every THROTTLE_PRUNE_EVERY new
+    buckets, the full ones are deleted so the table does not grow with
+    every client ever seen.
+    """
+
+    def __init__(self):
+        self.denied = LocalBucketStore()
+        self.created = 0
+
+    def take(self, key, rate, now):
+        # A bucket's full_at only moves forward, so a rejection seen here
+        # stays valid until its wait is over whatever other nodes do.
+        full_at = self.denied.full_at.get(key)
+        if full_at is not None and (wait := rate.wait(full_at, now)):
+            return wait
+
+        taken = ThrottleBucket.objects.filter(key=key, full_at__lte=now + rate.period - rate.interval).update(
+            full_at=Greatest(F('full_at'), Value(now)) + rate.interval,
+        )
+        if taken:
+            return 0.0
+        full_at = ThrottleBucket.objects.filter(key=key).values_list('full_at', flat=True).first()
+        if full_at is None:
+            return self.create(key, rate, now)
+        with self.denied.lock:
+            self.denied.full_at[key] = full_at
+            if len(self.denied.full_at) >= settings.THROTTLE_LOCAL_MAX_KEYS:
+                self.denied.prune(now)
+        return rate.wait(full_at, now)
+
+    def create(self, key, rate, now):
+        try:
+            with transaction.atomic():
+                ThrottleBucket.objects.create(key=key, full_at=now + rate.interval)
+        except IntegrityError:
+            # Another request made the bucket first; take from it instead.
+            return self.take(key, rate, now)
+        self.created += 1
+        if self.created % settings.THROTTLE_PRUNE_EVERY == 0:
+            self.prune(now)
+        return 0.0
+
+    def prune(self, now):
+        return ThrottleBucket.objects.filter(full_at__lt=now).delete()[0]
+
+    def clear(self):
+        self.denied.clear()
+        ThrottleBucket.objects.all().delete()
+
+
+@lru_cache(maxsize=None)
+def _store(path):
+    return import_string(path)()
+
+
+def get_store():
+    """The THROTTLE_STORE instance of this process."""
+    return _store(settings.THROTTLE_STORE)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base for the per-user and per-IP throttles: takes a token from the
+    bucket of (view scope, kind, client) when THROTTLE_RATES has a rate
+    for them, and lets everything else through untouched.
+    """
+    kind = None
+
+    def get_client(self, request):
+        """Who `request` counts against, or None to let it through."""
+        return None
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        scope = getattr(view, 'throttle_scope', None)
+        if scope is None:
+            return True
+        methods = getattr(view, 'throttle_methods', None)
+        if methods is not None and request.method not in methods:
+            return True
+        rate = settings.THROTTLE_RATES.get(scope, {}).get(self.kind)
+        client = self.get_client(request)
+        if rate is None or client is None:
+            return True
+        self.wait_time = get_store().take(f'{scope}:{self.kind}:{client}', parse_rate(rate), time.time())
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Limits each authenticated user; anonymous requests are left to IPTokenBucketThrottle."""
+    kind = 'user'
+
+    def get_client(self, request):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Limits each client address."""
+    kind = 'ip'
+
+    def get_client(self, request):
+        return self.get_ident(request)
@@ -14,6 +14,8 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.views.generic import TemplateView
@@ -33,10 +35,20 @@ urlpatterns = [
     path('api/tags/', include('tags.urls')),
     path('api/', include('comments.urls')),
     path('api/likes/', include('likes.urls')),
-    path('dj-rest-auth/', include('dj_rest_auth.urls')),
-    path('dj-rest-auth/registration/', include('dj_rest_auth.registration.urls')),
 
+    # Profile images from the file system store; a no-op unless DEBUG
+    *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
+]
+
+# Login and registration for the React app; left out of the 'api' profile.
+if settings.SETTINGS_PROFILE == 'full':
+    urlpatterns += [
+        path('dj-rest-auth/', include('dj_rest_auth.urls')),
+        path('dj-rest-auth/registration/', include('dj_rest_auth.registration.urls')),
+    ]
+
+urlpatterns += [
     # Serve React frontend
     path('', index_view),
     re_path(r'^(?:.*)/?$', index_view),
-]
\ No newline at end of file
+]
\ No newline at end of file
@@ -0,0 +1,43 @@
+from django.utils import timezone
+from django_filters import rest_framework as filters
+
+from .models import Task
+
+# Upper bound for ?due_within_days=, which keeps the date arithmetic in range.
+MAX_DUE_WITHIN_DAYS = 3650
+
+
+def today_for(request):
+    """
+    The local date, computed once per request and shared by the filters,
+    the ETag and every serialized row, so they cannot disagree when a
+    request straddles midnight.
+    """
+    if not hasattr(request, '_today'):
+        request._today = timezone.localdate()
+    return request._today
+
+
+class TaskFilter(filters.FilterSet):
+    """
+    ?status= and ?priority= as before, plus due-date filters run in SQL:
+    - ?overdue=true|false: open tasks due before today, or everything else
+    - ?due_before=YYYY-MM-DD: due strictly before the date, any status
+    - ?due_within_days=N: open tasks due between today and N days from now
+    """
+    overdue = filters.BooleanFilter(method='filter_overdue')
+    due_before = filters.DateFilter(field_name='due_date', lookup_expr='lt')
+    due_within_days = filters.NumberFilter(
+        method='filter_due_within_days', min_value=0, max_value=MAX_DUE_WITHIN_DAYS, decimal_places=0,
+    )
+
+    class Meta:
+        model = Task
+        fields = ['priority', 'status']
+
+    def filter_overdue(self, queryset, name, value):
+        today = today_for(self.request)
+        return queryset.overdue(today) if value else queryset.not_overdue(today)
+
+    def filter_due_within_days(self, queryset, name, value):
+        return queryset.due_within(today_for(self.request), int(value))
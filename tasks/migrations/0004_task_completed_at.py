@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def stamp_done_tasks(apps, schema_editor):
+    # The best guess for tasks completed before the column existed is the
+    # last time they were edited.
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.filter(status='done').update(completed_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_open_due_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(stamp_done_tasks, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_owner_open_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'done'), _negated=True), fields=['owner', 'due_date'], include=('created_at',), name='task_owner_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['owner', 'completed_at'], name='task_owner_completed_idx'),
+        ),
+    ]
@@ -1,8 +1,31 @@
+import datetime
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
 
+class TaskQuerySet(models.QuerySet):
+    """
+    Due-date filters. `today` is passed in so one request uses one date
+    for every filter and row (see tasks.filters.today_for).
+    """
+
+    def open(self):
+        """Tasks that are not done; the ones task_owner_open_due_idx covers."""
+        return self.exclude(status='done')
+
+    def overdue(self, today):
+        return self.open().filter(due_date__lt=today)
+
+    def not_overdue(self, today):
+        return self.exclude(models.Q(due_date__lt=today) & ~models.Q(status='done'))
+
+    def due_within(self, today, days):
+        """Open tasks due from today up to and including `days` days from now."""
+        return self.open().filter(due_date__range=(today, today + datetime.timedelta(days=days)))
+
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('todo', 'To Do'),
@@ -25,12 +48,57 @@ class Task(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField(null=True, blank=True)
     is_public = models.BooleanField(default=False)
+    # When the task was last marked done; None while it is open.
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.track_completion()
+        if update_fields is not None and 'status' in update_fields:
+            update_fields = {*update_fields, 'completed_at'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    def track_completion(self, now=None):
+        """
+        Stamp completed_at when the task becomes done and clear it when it
+        is reopened. save() calls this; bulk writes call it themselves.
+        """
+        if self.status != 'done':
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = now or timezone.now()
 
-    def is_overdue(self):
-        return self.due_date and self.due_date < timezone.now().date()
+    def is_overdue(self, today=None):
+        """Due before today and not done yet; the same test as TaskQuerySet.overdue()."""
+        if not self.due_date or self.status == 'done':
+            return False
+        return self.due_date < (today or timezone.localdate())
 
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Task list pages: WHERE owner = ? ORDER BY created_at DESC, id DESC
+            models.Index(fields=['owner', '-created_at', '-id'], name='task_owner_created_idx'),
+            # Status/priority filters on the task list
+            models.Index(fields=['owner', 'status', 'priority'], name='task_owner_status_prio_idx'),
+            # Overdue and due-soon filters; partial because done tasks are
+            # never overdue and make up most rows over time. created_at is
+            # carried along (on PostgreSQL) for the open-task ages in
+            # /api/tasks/stats/, so that aggregate never reads the table.
+            models.Index(
+                fields=['owner', 'due_date'],
+                include=['created_at'],
+                condition=~models.Q(status='done'),
+                name='task_owner_open_due_idx',
+            ),
+            # Completions per day on /api/tasks/stats/
+            models.Index(
+                fields=['owner', 'completed_at'],
+                condition=models.Q(completed_at__isnull=False),
+                name='task_owner_completed_idx',
+            ),
+        ]
@@ -1,8 +1,77 @@
+from functools import cached_property
+
+from django.conf import settings
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
+from .filters import today_for
 from .models import Task
 from django.utils import timezone
 
 
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    Bulk writes for TaskSerializer(many=True): save() inserts with
+    bulk_create and applies updates in as few statements as possible.
+
+    For updates pass the tasks being edited as an {id: task} mapping;
+    every item in the data names its task with "id".
+    """
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            try:
+                task = self.instance.get(int(data.get('id')))
+            except (AttributeError, TypeError, ValueError):
+                task = None
+            if task is None:
+                raise serializers.ValidationError({'id': ['Task not found.']})
+            self.child.instance = task
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def create(self, validated_data):
+        now = timezone.now()
+        tasks = [Task(**attrs) for attrs in validated_data]
+        for task in tasks:
+            task.track_completion(now)
+        return Task.objects.bulk_create(tasks, batch_size=500)
+
+    def update(self, instance, validated_data):
+        now = timezone.now()
+        tasks, groups = [], {}
+        for item, attrs in zip(self.initial_data, validated_data):
+            task = instance[int(item['id'])]
+            for field, value in attrs.items():
+                setattr(task, field, value)
+            task.updated_at = now  # Neither update path applies auto_now
+            task.track_completion(now)
+            tasks.append(task)
+            groups.setdefault(tuple(sorted(attrs.items())), []).append(task)
+
+        # Syncs usually apply the same change to many tasks (e.g. status=done):
+        # each shared change is one UPDATE ... WHERE id IN (...). The rest go
+        # through bulk_update, whose CASE expressions grow with the batch size.
+        singles, fields = [], {'updated_at'}
+        for changes, group in groups.items():
+            if len(group) == 1:
+                singles.extend(group)
+                fields.update(field for field, _ in changes)
+            else:
+                changes = dict(changes)
+                if 'status' in changes:
+                    # Tasks that were already done keep their completion time.
+                    changes['completed_at'] = (
+                        Coalesce('completed_at', Value(now)) if changes['status'] == 'done' else None
+                    )
+                Task.objects.filter(pk__in=[task.pk for task in group]).update(updated_at=now, **changes)
+        if 'status' in fields:
+            fields.add('completed_at')
+        if singles:
+            Task.objects.bulk_update(singles, sorted(fields), batch_size=100)
+        return tasks
+
+
 class TaskSerializer(serializers.ModelSerializer):
     is_overdue = serializers.SerializerMethodField()
 
@@ -11,11 +80,29 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'status', 'priority',
             'created_at', 'updated_at', 'due_date', 'is_public',
-            'is_overdue'
+            'is_overdue', 'completed_at'
         ]
+        list_serializer_class = TaskListSerializer
 
     def get_is_overdue(self, obj):
-        if not obj.due_date:
-            return False
-        today = timezone.localtime(timezone.now()).date()
-        return obj.due_date < today
+        return obj.is_overdue(self.today)
+
+    @cached_property
+    def today(self):
+        # With many=True every row goes through the same child serializer,
+        # so this is worked out once per list, not once per task.
+        request = self.context.get('request')
+        return today_for(request) if request is not None else timezone.localdate()
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Shape of a /api/tasks/bulk/ request; items are validated by TaskSerializer."""
+    create = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    update = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, attrs):
+        limit = settings.TASK_BULK_MAX_ITEMS
+        if sum(len(items) for items in attrs.values()) > limit:
+            raise serializers.ValidationError(f"At most {limit} items per request.")
+        return attrs
@@ -0,0 +1,112 @@
+"""
+Aggregated task statistics for TaskStatsView.
+
+Every number is counted by the database, one query per group of
+dimensions, each answered from an index on the owner's tasks:
+- counts by status and by priority: one GROUP BY status, priority over
+  task_owner_status_prio_idx, summed both ways;
+- open tasks: the total, the overdue count and the age distribution in
+  one aggregate of filtered COUNTs over task_owner_open_due_idx;
+- completions per day: GROUP BY the local completion date over
+  task_owner_completed_idx.
+
+The payload is cached per user, day and number of days, and invalidated
+whenever one of the user's tasks is saved or deleted.
+"""
+import datetime
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from taskhive.cache import UserPayloadCache
+from taskhive.concurrency import run_concurrently
+from .models import Task
+
+task_stats_cache = UserPayloadCache('task-stats', settings.TASK_STATS_CACHE_TIMEOUT)
+
+# (label, upper bound of the age in days); ages are counted in whole
+# local days, so a task created today is 0 days old.
+AGE_BUCKETS = [
+    ('<1d', 1),
+    ('1-7d', 7),
+    ('7-30d', 30),
+    ('30-90d', 90),
+    ('90d+', None),
+]
+
+
+def _midnight(date):
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def counts_by_status_and_priority(tasks):
+    by_status = dict.fromkeys((choice for choice, _ in Task.STATUS_CHOICES), 0)
+    by_priority = dict.fromkeys((choice for choice, _ in Task.PRIORITY_CHOICES), 0)
+    rows = tasks.order_by().values_list('status', 'priority').annotate(total=Count('*'))
+    for task_status, priority, total in rows:
+        by_status[task_status] = by_status.get(task_status, 0) + total
+        by_priority[priority] = by_priority.get(priority, 0) + total
+    return by_status, by_priority
+
+
+def open_task_counts(tasks, today):
+    # "Younger than N days" for each bound, in one pass; the buckets are
+    # the differences between neighbouring bounds.
+    bounds = [days for _, days in AGE_BUCKETS if days is not None]
+    counts = tasks.open().aggregate(
+        total=Count('*'),
+        overdue=Count('pk', filter=Q(due_date__lt=today)),
+        **{
+            f'younger_{days}': Count('pk', filter=Q(created_at__gte=_midnight(today - datetime.timedelta(days=days - 1))))
+            for days in bounds
+        },
+    )
+    ages, previous = [], 0
+    for label, days in AGE_BUCKETS:
+        younger = counts['total'] if days is None else counts[f'younger_{days}']
+        ages.append({'age': label, 'count': younger - previous})
+        previous = younger
+    return counts['total'], counts['overdue'], ages
+
+
+def completions_per_day(tasks, today, days):
+    first = today - datetime.timedelta(days=days - 1)
+    rows = (
+        tasks.filter(completed_at__gte=_midnight(first))
+        .order_by()
+        .values_list(TruncDate('completed_at'))
+        .annotate(total=Count('*'))
+    )
+    totals = dict(rows)
+    return [
+        {'date': day.isoformat(), 'count': totals.get(day, 0)}
+        for day in (first + datetime.timedelta(days=offset) for offset in range(days))
+    ]
+
+
+def build_stats(user, today, days):
+    tasks = Task.objects.filter(owner=user)
+    (by_status, by_priority), (open_total, overdue, ages), completed = run_concurrently(
+        lambda: counts_by_status_and_priority(tasks),
+        lambda: open_task_counts(tasks, today),
+        lambda: completions_per_day(tasks, today, days),
+    )
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'open': open_total,
+        'overdue': overdue,
+        'open_by_age': ages,
+        'completed_per_day': completed,
+    }
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_owner_stats(sender, instance, **kwargs):
+    task_stats_cache.invalidate_on_commit(instance.owner_id)
@@ -1,3 +1,397 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from taskhive.testing import QueryBudgetAssertions, QueryPlanAssertions, explain, full_scans
+
+from .models import Task
+
+
+@override_settings(API_PAGE_SIZE=3)
+class TaskPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Identical timestamps make `id` the only thing separating rows.
+        tasks = Task.objects.bulk_create(Task(owner=self.user, title=f'Task {i}') for i in range(7))
+        Task.objects.filter(pk__in=[t.pk for t in tasks]).update(created_at=tasks[0].created_at)
+
+    def walk(self, url, link='next'):
+        titles = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            titles.extend(task['title'] for task in response.data['results'])
+            url = response.data[link]
+        return titles
+
+    def test_pages_cover_every_task_once_newest_first(self):
+        titles = self.walk('/api/tasks/')
+        self.assertEqual(titles, [f'Task {i}' for i in reversed(range(7))])
+
+    def test_previous_link_returns_to_the_prior_page(self):
+        first = self.client.get('/api/tasks/').data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+
+    def test_page_size_parameter(self):
+        response = self.client.get('/api/tasks/?page_size=5')
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/tasks/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+class TaskBulkTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.other = User.objects.create_user(username='other')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_update_and_delete_in_one_request(self):
+        keep = Task.objects.create(owner=self.user, title='Keep')
+        drop = Task.objects.create(owner=self.user, title='Drop')
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [{'title': 'New 1'}, {'title': 'New 2', 'priority': 'high'}],
+            'update': [{'id': keep.id, 'status': 'done'}],
+            'delete': [drop.id],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['title'] for t in response.data['created']], ['New 1', 'New 2'])
+        self.assertTrue(all(t['id'] for t in response.data['created']))
+        self.assertEqual(response.data['updated'][0]['status'], 'done')
+        self.assertEqual(
+            sorted(Task.objects.filter(owner=self.user).values_list('title', flat=True)),
+            ['Keep', 'New 1', 'New 2'],
+        )
+        keep.refresh_from_db()
+        self.assertEqual(keep.status, 'done')
+        self.assertGreater(keep.updated_at, keep.created_at)
+
+    def test_invalid_items_reject_the_whole_batch(self):
+        theirs = Task.objects.create(owner=self.other, title='Not yours')
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [{'title': 'Fine'}, {'priority': 'urgent'}],
+            'update': [{'id': theirs.id, 'title': 'Hijacked'}],
+            'delete': [theirs.id],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['create'][0], {})
+        self.assertIn('title', response.data['create'][1])
+        self.assertIn('id', response.data['update'][0])
+        self.assertIn('id', response.data['delete'][0])
+        self.assertFalse(Task.objects.filter(owner=self.user).exists())
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.title, 'Not yours')
+
+    def test_bulk_created_tasks_are_searchable(self):
+        self.client.post('/api/tasks/bulk/', {'create': [{'title': 'Synced thesis'}]}, format='json')
+        response = self.client.get('/api/tasks/?q=thesis')
+        self.assertEqual([t['title'] for t in response.data['results']], ['Synced thesis'])
+
+
+class TaskQueryPlanTests(QueryBudgetAssertions, QueryPlanAssertions, TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Task.objects.bulk_create(Task(owner=self.user, title=f'Task {i}') for i in range(3))
+
+    def test_list(self):
+        self.assertNoFullScans('/api/tasks/')
+
+    def test_list_filtered_by_status_and_priority(self):
+        self.assertNoFullScans('/api/tasks/?status=todo&priority=high')
+
+    def test_later_page(self):
+        first = self.client.get('/api/tasks/?page_size=1').data
+        self.assertNoFullScans(first['next'])
+
+    def test_detail(self):
+        self.assertNoFullScans(f'/api/tasks/{Task.objects.first().pk}/')
+
+    def test_due_date_filters_use_the_open_tasks_index(self):
+        for query in ('overdue=true', 'due_within_days=7'):
+            self.assertNoFullScans(f'/api/tasks/?{query}')
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(f'/api/tasks/?{query}')
+            plans = [
+                explain(q['sql']) for q in ctx.captured_queries
+                if '"due_date" <' in q['sql'] or '"due_date" BETWEEN' in q['sql']
+            ]
+            self.assertTrue(plans, query)
+            self.assertIn('task_owner_open_due_idx', str(plans), query)
+
+    def test_list_stays_within_budget(self):
+        self.assertWithinQueryBudget('/api/tasks/')
+        self.assertWithinQueryBudget('/api/tasks/?q=task&status=todo')
+
+    def test_stats(self):
+        self.assertNoFullScans('/api/tasks/stats/')
+        self.assertWithinQueryBudget('/api/tasks/stats/?days=7')
+
+    def test_harness_reports_unindexed_filters(self):
+        query = Task.objects.filter(title='Task 1').query
+        sql, params = query.sql_with_params()
+        self.assertEqual(full_scans(sql, params), ['tasks_task'])
+
+
+class TaskDueDateTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        today = timezone.localdate()
+        self.today = today
+        days = datetime.timedelta
+        for title, due_date, status in [
+            ('Late', today - days(1), 'todo'),
+            ('Late but done', today - days(3), 'done'),
+            ('Today', today, 'in_progress'),
+            ('Soon', today + days(5), 'todo'),
+            ('Later', today + days(10), 'todo'),
+            ('Whenever', None, 'todo'),
+        ]:
+            Task.objects.create(owner=self.user, title=title, due_date=due_date, status=status)
+
+    def titles(self, query):
+        response = self.client.get(f'/api/tasks/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return sorted(task['title'] for task in response.data['results'])
+
+    def test_overdue(self):
+        self.assertEqual(self.titles('overdue=true'), ['Late'])
+        self.assertEqual(
+            self.titles('overdue=false'), ['Late but done', 'Later', 'Soon', 'Today', 'Whenever']
+        )
+
+    def test_due_within_days(self):
+        self.assertEqual(self.titles('due_within_days=7'), ['Soon', 'Today'])
+        self.assertEqual(self.titles('due_within_days=0'), ['Today'])
+
+    def test_due_before(self):
+        self.assertEqual(self.titles(f'due_before={self.today.isoformat()}'), ['Late', 'Late but done'])
+
+    def test_invalid_values(self):
+        for query in ('due_within_days=-1', 'due_within_days=1.5', 'due_before=soon'):
+            self.assertEqual(self.client.get(f'/api/tasks/?{query}').status_code, 400, query)
+
+    def test_flag_matches_the_filter(self):
+        flagged = sorted(
+            task['title'] for task in self.client.get('/api/tasks/').data['results'] if task['is_overdue']
+        )
+        self.assertEqual(flagged, self.titles('overdue=true'))
+
+    def test_today_is_worked_out_once_per_request(self):
+        with mock.patch('tasks.filters.timezone.localdate', wraps=timezone.localdate) as localdate:
+            self.client.get('/api/tasks/?overdue=false')
+        self.assertEqual(localdate.call_count, 1)
+
+
+class TaskStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = timezone.localdate()
+
+    def add(self, title, status='todo', priority='medium', age_days=0, due_in=None, completed_days_ago=None):
+        task = Task.objects.create(
+            owner=self.user, title=title, status=status, priority=priority,
+            due_date=None if due_in is None else self.today + datetime.timedelta(days=due_in),
+        )
+        now = timezone.now()
+        Task.objects.filter(pk=task.pk).update(
+            created_at=now - datetime.timedelta(days=age_days),
+            completed_at=None if completed_days_ago is None else now - datetime.timedelta(days=completed_days_ago),
+        )
+        return task
+
+    def stats(self, query=''):
+        response = self.client.get(f'/api/tasks/stats/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_counts(self):
+        self.add('New', priority='high')
+        self.add('Late', due_in=-2, age_days=10)
+        self.add('Old', status='in_progress', priority='low', age_days=120)
+        self.add('Finished', status='done', due_in=-5, completed_days_ago=0)
+        self.add('Finished earlier', status='done', completed_days_ago=2)
+        self.add('Finished long ago', status='done', completed_days_ago=40)
+        Task.objects.create(owner=User.objects.create_user(username='other'), title='Not mine')
+
+        data = self.stats('?days=7').data
+        self.assertEqual(data['total'], 6)
+        self.assertEqual(data['by_status'], {'todo': 2, 'in_progress': 1, 'done': 3})
+        self.assertEqual(data['by_priority'], {'low': 1, 'medium': 4, 'high': 1})
+        self.assertEqual(data['open'], 3)
+        self.assertEqual(data['overdue'], 1)
+        self.assertEqual(
+            {bucket['age']: bucket['count'] for bucket in data['open_by_age']},
+            {'<1d': 1, '1-7d': 0, '7-30d': 1, '30-90d': 0, '90d+': 1},
+        )
+        completed = data['completed_per_day']
+        self.assertEqual(len(completed), 7)
+        self.assertEqual(completed[-1], {'date': self.today.isoformat(), 'count': 1})
+        self.assertEqual(sum(day['count'] for day in completed), 2)
+
+    def test_cached_until_a_task_changes(self):
+        task = self.add('Task')
+        self.assertEqual(self.stats()['X-Cache'], 'MISS')
+        self.assertEqual(self.stats()['X-Cache'], 'HIT')
+
+        task.status = 'done'
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+            # Not before the write commits, or a read could re-cache old data.
+            self.assertEqual(self.stats()['X-Cache'], 'HIT')
+        response = self.stats()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['completed_per_day'][-1]['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        response = self.stats()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['total'], 0)
+
+    def test_bulk_updates_invalidate_the_cache(self):
+        tasks = [self.add('One'), self.add('Two')]
+        self.stats()
+        self.client.post('/api/tasks/bulk/', {
+            'update': [{'id': task.id, 'status': 'done'} for task in tasks],
+        }, format='json')
+        response = self.stats()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['by_status']['done'], 2)
+        self.assertEqual(response.data['completed_per_day'][-1]['count'], 2)
+
+    def test_invalid_days(self):
+        for query in ('?days=0', '?days=-1', '?days=1.5', '?days=366'):
+            self.assertEqual(self.client.get(f'/api/tasks/stats/{query}').status_code, 400, query)
+
+
+class TaskCompletionTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+
+    def test_completed_at_follows_the_status(self):
+        task = Task.objects.create(owner=self.user, title='Task')
+        self.assertIsNone(task.completed_at)
+        task.status = 'done'
+        task.save(update_fields=['status'])
+        task.refresh_from_db()
+        completed_at = task.completed_at
+        self.assertIsNotNone(completed_at)
+        task.title = 'Renamed'
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.completed_at, completed_at)
+        task.status = 'todo'
+        task.save()
+        task.refresh_from_db()
+        self.assertIsNone(task.completed_at)
+
+    def test_bulk_status_change_keeps_earlier_completions(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        done = Task.objects.create(owner=self.user, title='Done', status='done')
+        todo = Task.objects.create(owner=self.user, title='Todo')
+        response = client.post('/api/tasks/bulk/', {
+            'create': [{'title': 'Created done', 'status': 'done'}],
+            'update': [{'id': done.id, 'status': 'done'}, {'id': todo.id, 'status': 'done'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(pk=done.pk).completed_at, done.completed_at)
+        self.assertIsNotNone(Task.objects.get(pk=todo.pk).completed_at)
+        self.assertIsNotNone(Task.objects.get(title='Created done').completed_at)
+
+
+class TaskConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(owner=self.user, title='First')
+        Task.objects.create(owner=self.user, title='Second')
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+
+    def test_unchanged_list_is_not_modified(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertEqual(self.revalidate('/api/tasks/', response['ETag']), 304)
+
+    def test_edits_creates_and_deletes_change_the_list_etag(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.client.patch(f'/api/tasks/{self.task.pk}/', {'title': 'Renamed'})
+        self.assertEqual(self.revalidate('/api/tasks/', etag), 200)
+
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.client.post('/api/tasks/', {'title': 'Third'})
+        self.assertEqual(self.revalidate('/api/tasks/', etag), 200)
+
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.client.delete(f'/api/tasks/{self.task.pk}/')
+        self.assertEqual(self.revalidate('/api/tasks/', etag), 200)
+
+    def test_bulk_updates_change_the_list_etag(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.client.post('/api/tasks/bulk/', {'update': [{'id': self.task.pk, 'status': 'done'}]}, format='json')
+        self.assertEqual(self.revalidate('/api/tasks/', etag), 200)
+
+    def test_pages_and_filters_have_their_own_etags(self):
+        etags = {
+            self.client.get(url)['ETag']
+            for url in ('/api/tasks/', '/api/tasks/?page_size=1', '/api/tasks/?status=done')
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_other_users_get_their_own_etag(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user(username='other'))
+        self.assertEqual(other.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_honours_if_modified_since(self):
+        url = f'/api/tasks/{self.task.pk}/'
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_deleted_task_is_not_found(self):
+        url = f'/api/tasks/{self.task.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.task.delete()
+        self.assertEqual(self.revalidate(url, etag), 404)
+
+    def test_overdue_flags_expire_at_midnight(self):
+        self.task.due_date = timezone.localdate()
+        self.task.save()
+        url = f'/api/tasks/{self.task.pk}/'
+        etag = self.client.get(url)['ETag']
+        tomorrow = timezone.now() + datetime.timedelta(days=1)
+        with mock.patch('django.utils.timezone.now', return_value=tomorrow):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_overdue'])
@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import TaskListCreateView, TaskDetailView
+from .views import TaskListCreateView, TaskDetailView, TaskBulkView, TaskStatsView
 
 urlpatterns = [
     path('', TaskListCreateView.as_view(), name='task-list-create'),
+    path('bulk/', TaskBulkView.as_view(), name='task-bulk'),
+    path('stats/', TaskStatsView.as_view(), name='task-stats'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
 ]
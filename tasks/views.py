@@ -1,20 +1,44 @@
-from rest_framework import generics, permissions, filters
+from django.conf import settings
+from django.db import transaction
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from .filters import TaskFilter, today_for
 from .models import Task
-from .serializers import TaskSerializer
+from .serializers import TaskBulkSerializer, TaskSerializer
+from .stats import build_stats, task_stats_cache
 from .permissions import IsOwner  # You’ll create this in permissions.py
+from taskhive.conditional import ConditionalGetMixin
+from taskhive.pagination import KeysetPagination
+from search.filters import FullTextSearchFilter
+from search.index import INDEXES
+from accounts.dashboard import dashboard_cache
 
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class ConditionalTaskMixin(ConditionalGetMixin):
+    def get_validator_extras(self, rows):
+        # is_overdue flips at midnight without the task changing.
+        if any(task.due_date for task in rows):
+            return (today_for(self.request).isoformat(),)
+        return ()
+
+
+class TaskListCreateView(ConditionalTaskMixin, generics.ListCreateAPIView):
     """
     List all tasks for the authenticated user and allow task creation.
-    Supports search by title and filter by status/priority.
+    Supports ranked full-text search (?q=), filters by status/priority and
+    the due-date filters in tasks/filters.py (?overdue=, ?due_before=,
+    ?due_within_days=). Results are cursor-paginated, newest first.
     """
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
-    search_fields = ['title']
-    filterset_fields = ['priority', 'status']
+    pagination_class = KeysetPagination
+    filter_backends = [FullTextSearchFilter, DjangoFilterBackend]
+    search_index = 'task'
+    filterset_class = TaskFilter
+    query_budget = {'GET': 2}  # auth, tasks
 
     def get_queryset(self):
         return Task.objects.filter(owner=self.request.user)
@@ -23,7 +47,7 @@ class TaskListCreateView(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(ConditionalTaskMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a task.
     Only the task owner can access their task.
@@ -33,3 +57,91 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         return Task.objects.filter(owner=self.request.user)
+
+
+class TaskBulkView(APIView):
+    """
+    Create, update and delete many tasks in one request.
+
+    POST /api/tasks/bulk/ with any of:
+        {"create": [{...task fields...}],
+         "update": [{"id": 1, ...changed fields...}],
+         "delete": [2, 3]}
+
+    Items are validated with TaskSerializer(many=True) and ownership of every
+    id is checked in one query. If any item is invalid nothing is written and
+    a 400 lists the errors per item; otherwise all changes are applied in one
+    transaction with bulk_create/bulk_update and the results come back per item.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        payload = TaskBulkSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        creates = payload.validated_data['create']
+        updates = payload.validated_data['update']
+        deletes = payload.validated_data['delete']
+
+        ids = set(deletes)
+        for item in updates:
+            try:
+                ids.add(int(item.get('id')))
+            except (TypeError, ValueError):
+                pass
+        owned = Task.objects.filter(owner=request.user, pk__in=ids).in_bulk()
+
+        context = self.get_serializer_context()
+        create_serializer = TaskSerializer(data=creates, many=True, context=context)
+        update_serializer = TaskSerializer(owned, data=updates, many=True, partial=True, context=context)
+        errors = {}
+        if not create_serializer.is_valid():
+            errors['create'] = create_serializer.errors
+        if not update_serializer.is_valid():
+            errors['update'] = update_serializer.errors
+        if any(pk not in owned for pk in deletes):
+            errors['delete'] = [{} if pk in owned else {'id': ['Task not found.']} for pk in deletes]
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            created = create_serializer.save(owner=request.user)
+            updated = update_serializer.save()
+            Task.objects.filter(owner=request.user, pk__in=deletes).delete()
+            # Bulk writes skip post_save, so reindex and invalidate here.
+            INDEXES['task'].update_many(created + updated)
+        dashboard_cache.invalidate(request.user.pk)
+        task_stats_cache.invalidate(request.user.pk)
+
+        return Response({
+            'created': create_serializer.data,
+            'updated': update_serializer.data,
+            'deleted': deletes,
+        })
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'view': self}
+
+
+class TaskStatsView(APIView):
+    """
+    Counts of the user's tasks for dashboard widgets: by status and
+    priority, open and overdue, open tasks by age, and completions per day
+    over the last ?days= days (default 30). Counted in SQL (see
+    tasks/stats.py) and cached until a task changes; X-Cache says whether
+    it was a hit.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'GET': 4}  # auth, status/priority, open tasks, completions
+
+    def get(self, request):
+        days = request.query_params.get('days', '30')
+        if not days.isdigit() or not 1 <= int(days) <= settings.TASK_STATS_MAX_DAYS:
+            raise ValidationError({'days': f"Must be a whole number from 1 to {settings.TASK_STATS_MAX_DAYS}."})
+        days = int(days)
+        today = today_for(request)
+        payload, hit = task_stats_cache.get_or_build(
+            request.user.pk, f'{today.isoformat()}:{days}', lambda: build_stats(request.user, today, days)
+        )
+        response = Response(payload)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response